@@ -87,6 +87,7 @@ class NuitkaBuild:
             "--include-package=case_script",   # 测试用例脚本
             "--include-package=business",      # 业务逻辑模块
             "--include-package=tools",         # 工具模块
+            "--include-package=runner",        # 测试执行引擎
             "--include-package=fluent_qss",    # Fluent QSS 主题
             "--include-package=openpyxl",      # Excel 处理库
             
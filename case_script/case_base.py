@@ -18,12 +18,16 @@
 import os
 import time
 import datetime
+import threading
+from contextlib import contextmanager
 from typing import Tuple
 
 from config import Config
-from PySide6.QtCore import QObject
 from tools.load_yaml import load_yaml_config
-from tools.log_tool import get_logger
+from tools.log_tool import get_logger, is_level_enabled
+from tools.log_tool.logger import Logger
+from runner.cancel import CancelToken
+from tools.can_tool.device_pool import DevicePool
 from tools.can_tool.zlgcan import (
     ZCAN,
     ZCAN_USBCANFD_200U,
@@ -34,14 +38,43 @@ from tools.can_tool.zlgcan import (
 )
 
 
-class CaseBase(QObject):
+class CaseBase(object):
     """
     测试用例基类
 
     所有测试用例都应该继承此类，并实现 run 方法。
     基类提供了环境初始化、报告生成、资源清理等通用功能。
+    基类不依赖 Qt，可在 GUI 与命令行执行器（headless_runner.py）中共用。
+
+    并行执行时，用例通过 resources 声明所需的独占资源，占用相同资源的用例不会同时执行：
+        resources = ("adb:emulator-5554",)  # 指定 ADB 设备
+        resources = ()                     # 纯软件用例，可与任意用例并发
+        resources = ("*",)                 # 独占执行
+
+    LIN 通道资源不手写，由 lin_device_index / lin_channel 生成（见 lin_resource）：
+        uses_lin = True                    # 使用设备 0 的 LIN 通道 0，自动占用 "lin:0:0"
+        lin_channel = 1                    # 覆盖 lin_* 配置即视为使用 LIN，占用 "lin:0:1"
     """
 
+    # 并行执行时所需的独占资源（LIN 通道除外）
+    resources = ()
+
+    # 是否使用 LIN 通道；覆盖了下面任一 lin_* 配置的子类同样视为使用
+    uses_lin = False
+
+    # 用例日志级别，低于该级别的 log_* 调用直接跳过（不格式化消息）；
+    # None 表示只受日志输出配置限制。可在测试套件 case_options 中通过 log_level 覆盖
+    log_level = None
+
+    # LIN 设备配置（子类可覆盖）
+    lin_device_type = ZCAN_USBCANFD_200U
+    lin_device_index = 0
+    lin_channel = 0
+    lin_mode = 1  # 1=Master, 0=Slave
+    lin_baud = 19200  # LIN 波特率
+
+    LIN_ATTRS = ("lin_device_type", "lin_device_index", "lin_channel", "lin_mode", "lin_baud")
+
     def __init__(self, test_data=None):
         """
         初始化测试用例基类
@@ -65,6 +98,16 @@ class CaseBase(QObject):
         self.zcan = None
         self.device_handle = INVALID_DEVICE_HANDLE
         self.lin_handle = None
+        self._lin_session = None  # 由设备池分配的通道（运行期间复用）
+        # 超时或停止时看门狗线程与用例线程可能同时清理，设备句柄在锁内取出后再释放
+        self._device_lock = threading.Lock()
+
+        # 取消令牌，由执行器在执行前替换为本次运行的令牌
+        self.cancel_token = CancelToken()
+
+        # 测试步骤记录（step 上下文），执行结束后由执行器导出到 Allure 结果
+        self.steps = []
+        self._step_stack = []
 
         # 从测试数据中提取配置信息
         self.project_name = (
@@ -85,26 +128,94 @@ class CaseBase(QObject):
 
         self.logger.info(f"初始化测试用例: {self.case_name}")
 
+    @classmethod
+    def get_resources(cls, test_data=None):
+        """
+        获取用例执行所需的资源（调度器在实例化前调用）
+
+        子类可重写此方法，根据测试数据动态决定占用的通道或设备；
+        LIN 通道资源由 lin_resource 生成，重写时无需再列出
+
+        Args:
+            test_data: 测试数据，与构造函数参数一致
+
+        Returns:
+            tuple: 资源标识元组
+
+        Raises:
+            ValueError: resources 中手写的 LIN 资源与 lin_* 配置不一致
+        """
+        lin_resource = cls.lin_resource()
+        resources = tuple(r for r in cls.resources if not str(r).startswith("lin:"))
+        return resources + (lin_resource,) if lin_resource else resources
+
+    @classmethod
+    def lin_resource(cls):
+        """
+        用例使用的 LIN 通道资源 "lin:<设备索引>:<通道>"，由 lin_device_index / lin_channel 生成
+
+        调度器按该资源加锁，env_init 按同一组配置从设备池获取通道，两者总是一致。
+        uses_lin 为 True、覆盖了 lin_* 配置或 resources 中写有 lin: 资源（旧写法）的用例视为使用 LIN。
+
+        Returns:
+            str: LIN 资源标识，不使用 LIN 时返回 None
+
+        Raises:
+            ValueError: resources 中手写的 LIN 资源与 lin_* 配置不一致
+        """
+        declared = [str(r) for r in cls.resources if str(r).startswith("lin:")]
+        subclasses = cls.__mro__[: cls.__mro__.index(CaseBase)]
+        overridden = any(attr in vars(klass) for klass in subclasses for attr in cls.LIN_ATTRS)
+        if not (cls.uses_lin or overridden or declared):
+            return None
+        resource = f"lin:{int(cls.lin_device_index)}:{int(cls.lin_channel)}"
+        for item in declared:
+            if item != resource:
+                raise ValueError(
+                    f"{cls.__name__} 声明的资源 {item} 与 LIN 配置不一致（应为 {resource}），"
+                    "请删除 resources 中的 LIN 资源"
+                )
+        return resource
+
+    def requires_lin(self):
+        """
+        是否需要 LIN 通道
+
+        使用 LIN 的用例（见 lin_resource），执行器在 run 之前调用 env_init，
+        运行期间从设备池获取已打开的通道，结束后由 tearDown 归还
+
+        Returns:
+            bool: 需要时返回 True
+        """
+        return self.lin_resource() is not None
+
     def env_init(self, config_path=None):
         """
         初始化测试环境
         初始化设备：CAN/LIN
 
+        执行器激活了设备池时，从设备池获取已打开、已启动的 LIN 通道（运行期间复用），
+        否则按原方式独立打开设备。
+
         Args:
             config_path: 配置文件路径（可选）
 
         Returns:
             bool: 初始化成功返回 True，失败返回 False
         """
+        pool = DevicePool.get_active()
+        if pool is not None:
+            return self._env_init_from_pool(pool)
+
         try:
             self.logger.info("开始初始化 CAN/LIN 设备...")
             
             # 创建 ZCAN 实例
             self.zcan = ZCAN()
             
-            # 打开设备 (USBCANFD-200U)
-            device_type = ZCAN_USBCANFD_200U
-            device_index = 0
+            # 打开设备 (默认 USBCANFD-200U)
+            device_type = self.lin_device_type
+            device_index = self.lin_device_index
             self.device_handle = self.zcan.OpenDevice(device_type, device_index, 0)
             
             if self.device_handle == INVALID_DEVICE_HANDLE:
@@ -114,10 +225,10 @@ class CaseBase(QObject):
             self.logger.info(f"CAN 设备打开成功，句柄: {self.device_handle}")
             
             # 初始化 LIN 通道 (Master 模式)
-            lin_channel = 0
+            lin_channel = self.lin_channel
             lin_config = ZCAN_LIN_INIT_CONFIG()
-            lin_config.linMode = 1      # 1=Master, 0=Slave
-            lin_config.linBaud = 19200  # LIN 波特率
+            lin_config.linMode = self.lin_mode      # 1=Master, 0=Slave
+            lin_config.linBaud = self.lin_baud  # LIN 波特率
             lin_config.chkSumMode = ENHANCE_CHKSUM  # 增强校验
             lin_config.maxLength = 8    # 最大数据长度
             
@@ -149,7 +260,31 @@ class CaseBase(QObject):
                 self.device_handle = INVALID_DEVICE_HANDLE
             return False
 
+    def _env_init_from_pool(self, pool):
+        """从设备池获取 LIN 通道"""
+        try:
+            session = pool.acquire_lin(
+                self.lin_device_type,
+                self.lin_device_index,
+                self.lin_channel,
+                lin_mode=self.lin_mode,
+                lin_baud=self.lin_baud,
+            )
+        except Exception as e:
+            self.logger.error(f"从设备池获取 LIN 通道失败: {str(e)}")
+            return False
 
+        if session is None:
+            self.logger.error("从设备池获取 LIN 通道失败")
+            return False
+
+        with self._device_lock:
+            self._lin_session = session
+            self.zcan = session.zcan
+            self.device_handle = session.device_handle
+            self.lin_handle = session.lin_handle
+        self.logger.info("已从设备池获取 LIN 通道")
+        return True
 
     def run(self) -> Tuple[bool, str]:
         """
@@ -218,17 +353,63 @@ class CaseBase(QObject):
             return False
         return True
 
-    def log_info(self, message):
-        """记录信息日志"""
-        self.logger.info(f"[{self.case_name}] {message}")
+    def is_log_enabled(self, level):
+        """
+        指定级别的日志是否会被输出
+
+        只为日志准备数据（如拼接报文内容）的代码可先调用此方法判断
+
+        Args:
+            level: 日志级别名称，如 "INFO"、"DEBUG"
+
+        Returns:
+            bool: 用例日志级别允许且有日志输出接受该级别时返回 True
+        """
+        if self.log_level is not None and Logger.level_no(level) < Logger.level_no(self.log_level):
+            return False
+        return is_level_enabled(level)
+
+    def _log(self, level, message, args, kwargs):
+        """
+        延迟格式化的日志记录
 
-    def log_error(self, message):
-        """记录错误日志"""
-        self.logger.error(f"[{self.case_name}] {message}")
+        message 可以是:
+            - 普通字符串
+            - 带 {} 占位符的格式串，参数通过 args / kwargs 传入
+            - 无参函数，返回日志内容
+        级别未启用时直接返回，不执行格式化或函数调用
+        """
+        if not self.is_log_enabled(level):
+            return
+        if callable(message):
+            message = message()
+        elif args or kwargs:
+            message = str(message).format(*args, **kwargs)
+        # depth=2: 日志中记录调用 log_* 的位置
+        self.logger.opt(depth=2).log(level, "[{}] {}", self.case_name, message)
+
+    def log_debug(self, message, *args, **kwargs):
+        """记录调试日志，用法同 log_info"""
+        self._log("DEBUG", message, args, kwargs)
+
+    def log_info(self, message, *args, **kwargs):
+        """
+        记录信息日志
 
-    def log_warning(self, message):
-        """记录警告日志"""
-        self.logger.warning(f"[{self.case_name}] {message}")
+        Example:
+            self.log_info("开始测试")
+            self.log_info("转速: {:3d}% | 原始值: 0x{:02X}", speed, raw)   # 未启用时不格式化
+            self.log_info(lambda: f"报文: {dump_frames(frames)}")       # 未启用时不调用
+        """
+        self._log("INFO", message, args, kwargs)
+
+    def log_error(self, message, *args, **kwargs):
+        """记录错误日志，用法同 log_info"""
+        self._log("ERROR", message, args, kwargs)
+
+    def log_warning(self, message, *args, **kwargs):
+        """记录警告日志，用法同 log_info"""
+        self._log("WARNING", message, args, kwargs)
 
     def set_result(self, result, message=""):
         """
@@ -246,6 +427,60 @@ class CaseBase(QObject):
         else:
             self.log_error(f"测试失败: {message}")
 
+    @property
+    def is_cancelled(self):
+        """是否已请求停止测试"""
+        return self.cancel_token.is_cancelled
+
+    def wait(self, seconds):
+        """
+        可被停止请求打断的等待，用例中应使用它代替 time.sleep
+
+        Args:
+            seconds: 等待秒数
+
+        Returns:
+            bool: True 表示已请求停止（等待被打断），用例应尽快结束
+        """
+        return self.cancel_token.wait(seconds)
+
+    @contextmanager
+    def step(self, name):
+        """
+        记录一个测试步骤，可嵌套；步骤内抛出异常时标记为失败（断言）或中断（其他异常）并继续抛出
+
+        Example:
+            with self.step("设置转速 50%"):
+                self.send_speed(50)
+                with self.step("读取反馈"):
+                    ...
+        """
+        record = {
+            "name": str(name),
+            "status": "passed",
+            "message": "",
+            "start": time.time(),
+            "stop": None,
+            "steps": [],
+        }
+        parent = self._step_stack[-1]["steps"] if self._step_stack else self.steps
+        parent.append(record)
+        self._step_stack.append(record)
+        self.log_info("步骤: {}", record["name"])
+        try:
+            yield record
+        except AssertionError as e:
+            record["status"] = "failed"
+            record["message"] = str(e)
+            raise
+        except Exception as e:
+            record["status"] = "broken"
+            record["message"] = str(e)
+            raise
+        finally:
+            record["stop"] = time.time()
+            self._step_stack.pop()
+
     def get_execution_time(self):
         """
         获取执行时间
@@ -265,25 +500,34 @@ class CaseBase(QObject):
             该函数在测试结束后调用，用于关闭连接和清理资源
         """
         try:
-            # 关闭 LIN 通道
-            if self.lin_handle is not None and self.zcan:
-                try:
-                    self.zcan.ResetLIN(self.lin_handle)
-                    self.logger.info("LIN 通道已关闭")
-                except Exception as e:
-                    self.logger.warning(f"关闭 LIN 通道时出错: {str(e)}")
-                finally:
-                    self.lin_handle = None
-            
-            # 关闭 CAN 设备
-            if self.device_handle != INVALID_DEVICE_HANDLE and self.zcan:
-                try:
-                    self.zcan.CloseDevice(self.device_handle)
-                    self.logger.info("CAN 设备已关闭")
-                except Exception as e:
-                    self.logger.warning(f"关闭 CAN 设备时出错: {str(e)}")
-                finally:
-                    self.device_handle = INVALID_DEVICE_HANDLE
+            # 取出并清空设备句柄，重复调用或并发调用时只有一方会释放
+            with self._device_lock:
+                session, self._lin_session = self._lin_session, None
+                lin_handle, self.lin_handle = self.lin_handle, None
+                device_handle, self.device_handle = self.device_handle, INVALID_DEVICE_HANDLE
+
+            if session is not None:
+                # 设备池分配的通道只复位状态并归还，设备在运行结束时统一关闭
+                pool = DevicePool.get_active()
+                if pool is not None:
+                    pool.release_lin(session)
+                    self.logger.info("LIN 通道已复位并归还设备池")
+            else:
+                # 关闭 LIN 通道
+                if lin_handle is not None and self.zcan:
+                    try:
+                        self.zcan.ResetLIN(lin_handle)
+                        self.logger.info("LIN 通道已关闭")
+                    except Exception as e:
+                        self.logger.warning(f"关闭 LIN 通道时出错: {str(e)}")
+
+                # 关闭 CAN 设备
+                if device_handle != INVALID_DEVICE_HANDLE and self.zcan:
+                    try:
+                        self.zcan.CloseDevice(device_handle)
+                        self.logger.info("CAN 设备已关闭")
+                    except Exception as e:
+                        self.logger.warning(f"关闭 CAN 设备时出错: {str(e)}")
 
             # 其他清理操作可以在这里添加
 
@@ -14,7 +14,6 @@
 ===========================================================================
 """
 
-import time
 import sys
 import os
 from typing import Tuple
@@ -40,6 +39,9 @@ class CheryLinSpeedTest(CaseBase):
         从 0% 到 100% 递增发送 LIN 转速指令，步进为 10%
         使用 LIN ID 0x2A 发送转速数据
     """
+
+    # 使用设备 0 的 LIN 通道 0（调度时占用 "lin:0:0"）
+    uses_lin = True
     
     def __init__(self, test_data=None):
         """初始化测试用例"""
@@ -88,6 +90,9 @@ class CheryLinSpeedTest(CaseBase):
             
             # 从 0% 到 100% 递增发送转速
             for speed_percent in range(0, 101, self.speed_step):
+                if self.is_cancelled:
+                    return False, "测试被用户停止"
+
                 # 计算原始值: 转速(%) / 0.4 = 原始值
                 raw_value = int(speed_percent / 0.4)
                 
@@ -104,8 +109,7 @@ class CheryLinSpeedTest(CaseBase):
                 ret_pub = self.zcan.SetLINPublish(self.lin_handle, pub_cfg, 1)
                 
                 if ret_pub != ZCAN_STATUS_OK:
-                    error_msg = f"设置 Publish 失败 - 转速: {speed_percent}%"
-                    self.log_error(error_msg)
+                    self.log_error("设置 Publish 失败 - 转速: {}%", speed_percent)
                     fail_count += 1
                     continue
                 
@@ -115,16 +119,17 @@ class CheryLinSpeedTest(CaseBase):
                 if ret_tx > 0:
                     success_count += 1
                     self.log_info(
-                        f"✓ 发送成功 - 转速: {speed_percent:3d}% | "
-                        f"原始值: 0x{raw_value:02X} ({raw_value})"
+                        "✓ 发送成功 - 转速: {0:3d}% | 原始值: 0x{1:02X} ({1})",
+                        speed_percent,
+                        raw_value,
                     )
                 else:
                     fail_count += 1
-                    error_msg = f"✗ 发送失败 - 转速: {speed_percent}% | 返回值: {ret_tx}"
-                    self.log_error(error_msg)
+                    self.log_error("✗ 发送失败 - 转速: {}% | 返回值: {}", speed_percent, ret_tx)
                 
-                # 延时
-                time.sleep(self.delay)
+                # 延时（停止测试时立即返回）
+                if self.wait(self.delay):
+                    return False, "测试被用户停止"
             
             # 测试结果统计
             total_count = success_count + fail_count
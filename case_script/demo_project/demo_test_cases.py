@@ -20,16 +20,16 @@ class SimpleTestCase(CaseBase):
         self.log_info("开始执行简单测试用例")
         
         try:
-            # 模拟测试逻辑
-            self.log_info("执行测试步骤 1: 初始化")
-            time.sleep(0.1)
+            # 模拟测试逻辑，每个步骤记录到测试结果（Allure 步骤）
+            with self.step("执行测试步骤 1: 初始化"):
+                time.sleep(0.1)
             
-            self.log_info("执行测试步骤 2: 验证")
-            result = True  # 模拟测试结果
+            with self.step("执行测试步骤 2: 验证"):
+                result = True  # 模拟测试结果
             
             if result:
-                self.log_info("执行测试步骤 3: 确认结果")
-                return True, "测试通过 - 所有步骤执行成功"
+                with self.step("执行测试步骤 3: 确认结果"):
+                    return True, "测试通过 - 所有步骤执行成功"
             else:
                 return False, "测试失败 - 验证步骤未通过"
                 
@@ -159,7 +159,9 @@ class LongRunningTest(CaseBase):
             
             for i in range(iterations):
                 self.log_info(f"迭代 {i+1}/{iterations}")
-                time.sleep(duration / iterations)
+                # 使用可打断的等待，停止测试时立即结束
+                if self.wait(duration / iterations):
+                    return False, f"稳定性测试被停止 - 已完成 {i} 次迭代"
             
             return True, f"稳定性测试通过 - 完成 {iterations} 次迭代"
             
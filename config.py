@@ -4,14 +4,31 @@ import logging
 
 class Config:
     LOGGER_LEVEL = logging.INFO  # 日志级别
+    UI_REFRESH_INTERVAL = 200  # 界面批量刷新用例结果的间隔（毫秒）
+    LOG_PANEL_MAX_LINES = 10000  # 界面日志面板保留的最大行数，更早的日志写入溢出文件
+    DEFAULT_CASE_TIMEOUT = 0  # 用例默认超时时间（秒），0 表示不限制，可在测试套件 YAML 中覆盖
+    CHECKPOINT_INTERVAL = 10  # 执行过程中保存断点的最小间隔（秒），每轮结束时总会保存
     ROOT_DIR = os.path.abspath(os.path.dirname(__file__))  # 项目根目录
     CASE_SCRIPT_DIR = os.path.join(ROOT_DIR, "case_script/RecordDev/")  # 用例脚本目录
     LOG_DIR = os.path.join(ROOT_DIR, "logs")  # 日志目录
     REPORT_DIR = os.path.join(ROOT_DIR, "reports")  # 测试报告目录
+    TEST_REPORT_DIR = os.path.join(ROOT_DIR, "test_reports")  # 测试执行报告(JSON)目录
+    JOURNAL_DIR = os.path.join(TEST_REPORT_DIR, "journal")  # 执行过程中逐条写入的结果日志目录
+    CHECKPOINT_DIR = os.path.join(TEST_REPORT_DIR, "checkpoint")  # 断点续测文件目录
+    JUNIT_DIR = os.path.join(TEST_REPORT_DIR, "junit")  # 执行过程中逐条写入的 JUnit XML 目录
+    JUNIT_EXPORT = True  # 执行时逐条写入 JUnit XML，供 CI 读取
+    HISTORY_DIR = os.path.join(ROOT_DIR, "test_history")  # 测试执行历史数据目录
+    DURATION_HISTORY_FILE = os.path.join(HISTORY_DIR, "case_durations.json")  # 用例耗时历史
+    CASE_SELECTION_FILE = os.path.join(HISTORY_DIR, "case_selections.json")  # 保存的用例选择
+    HISTORY_DB_FILE = os.path.join(HISTORY_DIR, "run_history.db")  # 执行历史数据库
+    CACHE_DIR = os.path.join(ROOT_DIR, "cache")  # 缓存目录（可随时删除）
+    MANIFEST_DIR = os.path.join(CACHE_DIR, "suite_manifest")  # 编译后的测试套件清单
     ALLURE_RESULTS_DIR = os.path.join(REPORT_DIR, "allure_results")  # allure结果目录
     ALLURE_REPORT_DIR = os.path.join(REPORT_DIR, "allure_report")  # allure报告报告
+    ALLURE_EXPORT = True  # 执行时逐条写入 Allure 结果文件到 ALLURE_RESULTS_DIR
 
     USER_CONFIG_DIR = os.path.join(ROOT_DIR, "user_config")  # 用户配置目录
+    PROJECT_CONFIG_DIR = os.path.join(USER_CONFIG_DIR, "project_config")  # 项目配置目录
     DEV_CONFIG_DIR = os.path.join(USER_CONFIG_DIR, "dev_config")  # 设备配置目录
     TEST_SUITE_DIR = os.path.join(USER_CONFIG_DIR, "test_suite")  # 测试套件目录
     TESTCASE_CONFIG_DIR = os.path.join(
@@ -3,6 +3,12 @@ Fluent Design 风格可停靠日志面板组件
 
 基于 QDockWidget 实现的可拖动、可停靠日志面板。
 
+高频日志场景（长时间稳定性测试）下的设计:
+    - append_log 只把日志放入队列，由定时器按固定间隔批量渲染，每批只通知视图一次
+    - 使用 QListView + 列表模型显示，只绘制可见行，与日志总量无关
+    - 面板中最多保留 max_lines 行（环形缓冲），更早的日志追加写入溢出文件，内存占用有上限
+    - 级别筛选与关键字搜索通过代理模型完成，只作用于保留的日志行
+
 使用示例:
     from fluent_qss import FluentDockLogPanel
     
@@ -16,18 +22,169 @@ Fluent Design 风格可停靠日志面板组件
     log_dock.append_log("错误信息", "ERROR")
 """
 
-from datetime import datetime
-from PySide6.QtCore import Qt, Signal
+import os
+import tempfile
+import time
+from collections import deque
+from PySide6.QtCore import (
+    Qt,
+    Signal,
+    QAbstractListModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    QTimer,
+)
+from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
     QDockWidget,
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
     QPushButton,
-    QTextEdit,
+    QListView,
     QLabel,
+    QLineEdit,
+    QComboBox,
+    QAbstractItemView,
 )
 
+# 级别颜色（Fluent Design 调色板）
+LEVEL_COLORS = {
+    "INFO": QColor("#0078D4"),     # Fluent 蓝色
+    "SUCCESS": QColor("#107C10"),  # Fluent 绿色
+    "WARN": QColor("#CA5010"),     # Fluent 橙色
+    "ERROR": QColor("#D13438"),    # Fluent 红色
+    "FAIL": QColor("#D13438"),     # Fluent 红色
+    "DEBUG": QColor("#6D6D6D"),    # 灰色
+}
+DEFAULT_COLOR = QColor("#323130")
+
+# 级别高低，用于“显示该级别及以上”的筛选
+LEVEL_RANKS = {"DEBUG": 0, "INFO": 1, "SUCCESS": 1, "WARN": 2, "ERROR": 3, "FAIL": 3}
+LEVEL_ALIASES = {"WARNING": "WARN"}
+
+# 级别筛选下拉框选项: (显示文本, 最低级别)
+LEVEL_FILTER_OPTIONS = [
+    ("全部级别", 0),
+    ("INFO 及以上", 1),
+    ("WARN 及以上", 2),
+    ("仅 ERROR", 3),
+]
+
+DEFAULT_MAX_LINES = 10000  # 面板中保留的最大日志行数
+DEFAULT_FLUSH_INTERVAL = 100  # 批量渲染间隔（毫秒）
+SEARCH_DEBOUNCE_INTERVAL = 200  # 搜索框输入停顿多少毫秒后开始筛选
+
+
+def _format_line(record) -> str:
+    """日志记录的纯文本形式"""
+    timestamp, level, message = record
+    return f"[{timestamp}] [{level}] {message}"
+
+
+class _LogListModel(QAbstractListModel):
+    """日志行模型，记录为 (时间, 级别, 消息) 元组，保存在有上限的双端队列中"""
+
+    def __init__(self, max_lines, parent=None):
+        super().__init__(parent)
+        self.max_lines = max(1, max_lines)
+        self._records = deque()
+        self._search_keys = deque()  # 与 _records 一一对应的小写文本，供搜索使用
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"[{record[0]}] {record[2]}"
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return LEVEL_COLORS.get(record[1], DEFAULT_COLOR)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return record[2]
+        return None
+
+    def level_rank(self, row):
+        return LEVEL_RANKS.get(self._records[row][1], 1)
+
+    def search_key(self, row):
+        return self._search_keys[row]
+
+    def append_records(self, records):
+        """
+        追加一批记录（最多通知视图一次删除与一次插入）
+
+        Returns:
+            list: 超出上限被移出的旧记录
+        """
+        evicted = []
+        if len(records) >= self.max_lines:
+            # 本批次本身达到上限：原有记录全部移出，本批次前面的部分直接溢出
+            self._remove_front(len(self._records), evicted)
+            cut = len(records) - self.max_lines
+            evicted.extend(records[:cut])
+            records = records[cut:]
+        else:
+            overflow = len(self._records) + len(records) - self.max_lines
+            self._remove_front(overflow, evicted)
+
+        if records:
+            first = len(self._records)
+            self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+            self._records.extend(records)
+            self._search_keys.extend(record[2].lower() for record in records)
+            self.endInsertRows()
+        return evicted
+
+    def _remove_front(self, count, evicted):
+        """移出最早的 count 条记录，追加到 evicted"""
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        for _ in range(count):
+            evicted.append(self._records.popleft())
+            self._search_keys.popleft()
+        self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._records.clear()
+        self._search_keys.clear()
+        self.endResetModel()
+
+    def records(self):
+        return list(self._records)
+
+
+class _LogFilterProxyModel(QSortFilterProxyModel):
+    """按最低级别与关键字筛选日志行"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._min_rank = 0
+        self._query = ""
+
+    def set_min_rank(self, rank):
+        if rank != self._min_rank:
+            self._min_rank = rank
+            self.invalidateFilter()
+
+    def set_query(self, text):
+        query = (text or "").strip().lower()
+        if query != self._query:
+            self._query = query
+            self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        if self._min_rank and model.level_rank(source_row) < self._min_rank:
+            return False
+        if self._query and self._query not in model.search_key(source_row):
+            return False
+        return True
+
 
 class FluentDockLogPanel(QDockWidget):
     """
@@ -36,9 +193,11 @@ class FluentDockLogPanel(QDockWidget):
     Features:
         - 可拖动停靠到主窗口的四个方向
         - 可浮动成独立窗口
-        - 支持多级别日志（INFO, WARN, ERROR, DEBUG）
+        - 支持多级别日志（INFO, SUCCESS, WARN, ERROR, FAIL, DEBUG）
         - 自动时间戳
         - 日志级别颜色标记
+        - 批量渲染，保留行数有上限，超出部分写入溢出文件
+        - 级别筛选与关键字搜索
         - 一键清空日志
     
     Signals:
@@ -46,7 +205,7 @@ class FluentDockLogPanel(QDockWidget):
     
     Example:
         # 在 QMainWindow 中使用
-        log_dock = FluentDockLogPanel(self)
+        log_dock = FluentDockLogPanel(self, max_lines=20000)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, log_dock)
         
         log_dock.append_log("程序启动", "INFO")
@@ -60,7 +219,10 @@ class FluentDockLogPanel(QDockWidget):
         self, 
         parent=None, 
         title: str = "📋 日志",
-        allowed_areas: Qt.DockWidgetArea = Qt.DockWidgetArea.AllDockWidgetAreas
+        allowed_areas: Qt.DockWidgetArea = Qt.DockWidgetArea.AllDockWidgetAreas,
+        max_lines: int = DEFAULT_MAX_LINES,
+        flush_interval: int = DEFAULT_FLUSH_INTERVAL,
+        spill_path: str = None,
     ):
         """
         初始化可停靠日志面板
@@ -69,6 +231,9 @@ class FluentDockLogPanel(QDockWidget):
             parent: 父窗口（通常是 QMainWindow）
             title: 面板标题
             allowed_areas: 允许停靠的区域
+            max_lines: 面板中保留的最大日志行数
+            flush_interval: 批量渲染间隔（毫秒）
+            spill_path: 溢出日志文件路径，None 时在首次溢出时于临时目录创建
         """
         super().__init__(title, parent)
         
@@ -81,6 +246,24 @@ class FluentDockLogPanel(QDockWidget):
             QDockWidget.DockWidgetFeature.DockWidgetFloatable |
             QDockWidget.DockWidgetFeature.DockWidgetClosable
         )
+
+        self._pending = deque()  # 等待渲染的日志
+        self._spill_path = spill_path
+        self._spilled_lines = 0
+
+        self._model = _LogListModel(max_lines, self)
+        self._proxy = _LogFilterProxyModel(self)
+        self._proxy.setSourceModel(self._model)
+
+        # 批量渲染定时器
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+
+        # 搜索防抖定时器
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_INTERVAL)
         
         self._setup_ui()
         
@@ -116,56 +299,148 @@ class FluentDockLogPanel(QDockWidget):
         
         layout.addLayout(toolbar)
         
-        # 日志文本区域
-        self._log_text = QTextEdit()
-        self._log_text.setObjectName("FluentDockLogPanelText")
-        self._log_text.setReadOnly(True)
-        self._log_text.setPlaceholderText("暂无日志...")
-        layout.addWidget(self._log_text)
+        # 筛选栏：级别 + 关键字
+        filter_bar = QHBoxLayout()
+
+        self._level_combo = QComboBox()
+        for text, rank in LEVEL_FILTER_OPTIONS:
+            self._level_combo.addItem(text, rank)
+        self._level_combo.currentIndexChanged.connect(
+            lambda index: self._proxy.set_min_rank(self._level_combo.itemData(index))
+        )
+        filter_bar.addWidget(self._level_combo)
+
+        self._search_box = QLineEdit()
+        self._search_box.setPlaceholderText("搜索日志...")
+        self._search_box.setClearButtonEnabled(True)
+        self._search_box.textChanged.connect(self._search_timer.start)
+        self._search_timer.timeout.connect(
+            lambda: self._proxy.set_query(self._search_box.text())
+        )
+        filter_bar.addWidget(self._search_box, 1)
+
+        layout.addLayout(filter_bar)
+
+        # 日志列表（只绘制可见行）
+        self._log_view = QListView()
+        self._log_view.setObjectName("FluentDockLogPanelText")
+        self._log_view.setModel(self._proxy)
+        self._log_view.setUniformItemSizes(True)
+        self._log_view.setWordWrap(False)
+        self._log_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._log_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self._log_view)
         
         # 设置默认尺寸（不设置过小的最小值，以便可以调整大小）
         self.setMinimumWidth(150)
         self.setMinimumHeight(100)
     
+    @property
+    def spill_path(self):
+        """溢出日志文件路径，尚未溢出时可能为 None"""
+        return self._spill_path
+
     def append_log(self, message: str, level: str = "INFO") -> None:
         """
-        添加日志条目
+        添加日志条目（放入队列，由定时器批量渲染）
         
         Args:
             message: 日志消息
-            level: 日志级别，可选值：INFO, WARN, ERROR, DEBUG
+            level: 日志级别，可选值：INFO, SUCCESS, WARN, ERROR, FAIL, DEBUG
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        # 根据级别设置颜色（Fluent Design 调色板）
-        color_map = {
-            "INFO": "#0078D4",    # Fluent 蓝色
-            "WARN": "#CA5010",    # Fluent 橙色
-            "ERROR": "#D13438",   # Fluent 红色
-            "DEBUG": "#6D6D6D",   # 灰色
-        }
-        color = color_map.get(level.upper(), "#323130")
-        
-        # 格式化日志条目
-        html = f'<span style="color: #888;">[{timestamp}]</span> '
-        html += f'<span style="color: {color};">{message}</span><br>'
-        
-        self._log_text.insertHtml(html)
-        
-        # 滚动到底部
-        scrollbar = self._log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        level = level.upper()
+        level = LEVEL_ALIASES.get(level, level)
+        # 时间戳在渲染时格式化，避免每条日志都调用 strftime
+        self._pending.append((time.time(), level, str(message)))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
         
         # 发射信号
         self.log_added.emit(message, level)
     
+    def flush(self) -> None:
+        """立即渲染队列中的日志"""
+        if not self._pending:
+            self._flush_timer.stop()
+            return
+        records = []
+        stamps = {}  # 同一秒内的日志共用格式化后的时间戳
+        while self._pending:
+            created, level, message = self._pending.popleft()
+            second = int(created)
+            timestamp = stamps.get(second)
+            if timestamp is None:
+                timestamp = stamps[second] = time.strftime("%H:%M:%S", time.localtime(second))
+            records.append((timestamp, level, message))
+
+        # 仅在用户停留在底部时自动滚动，向上翻看日志时不打断
+        scrollbar = self._log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+
+        evicted = self._model.append_records(records)
+        if evicted:
+            self._spill(evicted)
+
+        if at_bottom:
+            self._log_view.scrollToBottom()
+
+    def _spill(self, records) -> None:
+        """将移出面板的旧日志追加写入溢出文件"""
+        try:
+            if self._spill_path is None:
+                fd, self._spill_path = tempfile.mkstemp(prefix="log_panel_", suffix=".log")
+                os.close(fd)
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(self._spill_path)), exist_ok=True)
+            with open(self._spill_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(_format_line(record) for record in records))
+                f.write("\n")
+            self._spilled_lines += len(records)
+            self._level_label.setText(f"日志记录（更早的 {self._spilled_lines} 行已写入文件）")
+            self._level_label.setToolTip(self._spill_path)
+        except OSError:
+            # 溢出文件写入失败时丢弃旧日志，不影响界面
+            pass
+
     def clear_log(self) -> None:
-        """清空日志"""
-        self._log_text.clear()
+        """清空日志（包括溢出文件）"""
+        self._pending.clear()
+        self._model.clear()
+        if self._spill_path and os.path.exists(self._spill_path):
+            try:
+                os.remove(self._spill_path)
+            except OSError:
+                pass
+        self._spilled_lines = 0
+        self._level_label.setText("日志记录")
+        self._level_label.setToolTip("")
     
     def get_log_text(self) -> str:
-        """获取所有日志文本（纯文本格式）"""
-        return self._log_text.toPlainText()
+        """获取所有日志文本（纯文本格式，包括已写入溢出文件的部分）"""
+        self.flush()
+        lines = []
+        if self._spilled_lines and self._spill_path and os.path.exists(self._spill_path):
+            with open(self._spill_path, "r", encoding="utf-8") as f:
+                lines.extend(line.rstrip("\n") for line in f)
+        lines.extend(_format_line(record) for record in self._model.records())
+        return "\n".join(lines)
+
+    def set_level_filter(self, min_level: str) -> None:
+        """只显示指定级别及以上的日志，如 "WARN"；"DEBUG" 表示显示全部"""
+        rank = LEVEL_RANKS.get(LEVEL_ALIASES.get(min_level.upper(), min_level.upper()), 0)
+        index = self._level_combo.findData(rank)
+        if index >= 0:
+            self._level_combo.setCurrentIndex(index)
+        else:
+            self._proxy.set_min_rank(rank)
+
+    def set_search_text(self, text: str) -> None:
+        """按关键字筛选日志（不区分大小写）"""
+        self._search_box.blockSignals(True)
+        self._search_box.setText(text)
+        self._search_box.blockSignals(False)
+        self._search_timer.stop()
+        self._proxy.set_query(text)
     
     def set_allowed_areas(self, areas: Qt.DockWidgetArea) -> None:
         """设置允许停靠的区域"""
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+命令行（无界面）测试执行器
+
+不导入 PySide6，适用于夜间 CI 台架等无显示环境。读取与 GUI 相同的
+user_config/project_config 与测试套件 YAML，轮次、失败停止、轮次间延时语义与 GUI 一致，
+并生成相同结构的 JSON 测试报告。
+
+使用示例:
+    # 列出所有项目与测试套件
+    python headless_runner.py --list
+
+    # 执行整个测试套件 3 轮，失败时停止
+    python headless_runner.py -p demo_project -s 基础功能测试 -r 3 --stop-on-fail
+
+    # 只执行指定用例，并行 4 线程
+    python headless_runner.py -p demo_project -s 基础功能测试 -c 简单测试用例 数据验证测试 --parallel -w 4
+
+    # 执行中途崩溃或被中断后，从断点继续执行（测试设置与用例沿用断点中的记录）
+    python headless_runner.py -p demo_project -s 稳定性测试 --resume
+
+    # 不导出 Allure 结果（默认按 Config.ALLURE_EXPORT 写入 reports/allure_results）
+    python headless_runner.py -p demo_project -s 基础功能测试 --no-allure
+
+    # JUnit XML 写到 CI 指定的路径（默认按 Config.JUNIT_EXPORT 写入 test_reports/junit）
+    python headless_runner.py -p demo_project -s 基础功能测试 --junit build/junit.xml
+
+    # 执行中途崩溃后，从结果日志补出报告（同时重新生成 JUnit XML）
+    python headless_runner.py --from-journal test_reports/journal/执行日志_xxx.jsonl
+
+退出码:
+    0 全部通过; 1 存在失败或错误; 2 配置错误
+"""
+
+import argparse
+import signal
+import sys
+
+from tools.log_tool import RunLog, get_logger
+from runner import (
+    DEFAULT_TEST_SETTINGS,
+    DurationHistory,
+    EtaEstimator,
+    TestRunner,
+    build_case_plan,
+    case_log_names,
+    format_duration,
+)
+from runner.checkpoint import RunCheckpoint, checkpoint_path, load_checkpoint
+from runner.allure_export import open_allure_writer
+from runner.history_db import open_history_db
+from runner.journal import ResultJournal, new_journal_path
+from runner.junit_export import start_junit_export
+from runner.report import CaseResultTracker, write_report_from_journal
+from runner.suite_loader import load_project_config, load_project_suites
+from runner.suite_manifest import load_suite_manifest
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_CONFIG_ERROR = 2
+
+logger = get_logger("headless_runner")
+
+
+def log_by_level(message, level="INFO"):
+    """按 GUI 日志级别写入 loguru"""
+    level_upper = level.upper()
+    if level_upper == "SUCCESS":
+        logger.success(message)
+    elif level_upper == "ERROR":
+        logger.error(message)
+    elif level_upper in ("WARNING", "WARN"):
+        logger.warning(message)
+    elif level_upper == "DEBUG":
+        logger.debug(message)
+    elif level_upper == "FAIL":
+        logger.error(f"[FAIL] {message}")
+    else:  # INFO 或其他
+        logger.info(message)
+
+
+def list_projects():
+    """打印所有项目及其测试套件"""
+    project_config = load_project_config()
+    for project_cfg in project_config.get("projects", []) or []:
+        print(f"{project_cfg.get('name', '')}")
+        try:
+            suite_names = load_project_suites(project_cfg)
+        except FileNotFoundError:
+            print("    (测试套件配置文件不存在)")
+            continue
+        for suite_name in suite_names:
+            print(f"    {suite_name}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="自动化测试框架 - 命令行执行器")
+    parser.add_argument("--list", action="store_true", help="列出所有项目与测试套件")
+    parser.add_argument("-p", "--project", help="项目名称")
+    parser.add_argument("-s", "--suite", help="测试套件名称")
+    parser.add_argument("-c", "--cases", nargs="+", help="只执行指定的用例（默认执行整个套件）")
+    parser.add_argument("-r", "--rounds", type=int, default=DEFAULT_TEST_SETTINGS["rounds"], help="测试轮数")
+    parser.add_argument("--stop-on-fail", action="store_true", help="某轮出现失败时停止后续轮次")
+    parser.add_argument("--delay", type=int, default=DEFAULT_TEST_SETTINGS["delay"], help="轮次间延时（秒）")
+    parser.add_argument("--parallel", action="store_true", help="按资源声明并行执行用例")
+    parser.add_argument("-w", "--max-workers", type=int, default=DEFAULT_TEST_SETTINGS["max_workers"], help="最大并发数")
+    parser.add_argument("--report-dir", help="JSON 报告输出目录（默认 test_reports）")
+    parser.add_argument("--resume", action="store_true", help="从上次中断的断点继续执行")
+    parser.add_argument("--no-allure", action="store_true", help="不导出 Allure 结果文件")
+    parser.add_argument("--junit", metavar="PATH", help="JUnit XML 输出路径（默认 test_reports/junit 下与结果日志同名）")
+    parser.add_argument("--no-junit", action="store_true", help="不导出 JUnit XML")
+    parser.add_argument("--from-journal", metavar="JOURNAL", help="不执行测试，从结果日志生成报告")
+    return parser.parse_args(argv)
+
+
+def load_cases(project_name, suite_name, selected_names=None):
+    """
+    加载测试套件中的用例
+
+    Returns:
+        tuple: ([(用例名, 用例配置), ...], {用例名: 执行选项})，出错时用例列表为 None
+    """
+    try:
+        manifest = load_suite_manifest(project_name, suite_name)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return None, {}
+
+    for case_name, case_config in manifest.invalid_cases:
+        logger.warning(f"测试用例 '{case_name}' 配置格式错误: {case_config}")
+    test_cases = manifest.test_cases
+    case_options = manifest.case_options
+
+    if not selected_names:
+        return list(test_cases.items()), case_options
+
+    missing = [name for name in selected_names if name not in test_cases]
+    if missing:
+        logger.error(f"测试套件中找不到用例: {', '.join(missing)}")
+        return None, {}
+    return [(name, test_cases[name]) for name in selected_names], case_options
+
+
+def open_junit(journal_path, args):
+    """按命令行参数创建 JUnit 写入器，不导出时返回 None"""
+    if args.no_junit:
+        return None
+    junit_writer = start_junit_export(journal_path, args.junit)
+    if junit_writer is not None:
+        logger.info(f"JUnit 结果: {junit_writer.path}")
+    return junit_writer
+
+
+def report_from_journal(journal_path, args):
+    """从结果日志生成并保存报告"""
+    junit_writer = open_junit(journal_path, args)
+    if junit_writer is not None:
+        junit_writer.close()
+    report_dir = args.report_dir
+    try:
+        report_path, report_data = write_report_from_journal(journal_path, report_dir)
+    except (OSError, ValueError) as e:
+        logger.error(f"读取结果日志失败: {e}")
+        return EXIT_CONFIG_ERROR
+
+    logger.success(f"测试报告已保存: {report_path}")
+    stats = report_data["测试统计"]
+    return EXIT_OK if stats["失败数"] == 0 and stats["成功数"] == stats["总测试数"] else EXIT_FAILED
+
+
+def install_stop_handler(runner):
+    """
+    第一次 Ctrl+C 与 GUI 的停止按钮相同：请求停止，等待当前用例结束（超过宽限期由看门狗中断），
+    设备与结果日志正常收尾；第二次 Ctrl+C 恢复默认行为，立即抛出 KeyboardInterrupt
+
+    Returns:
+        原 SIGINT 处理函数，执行结束后恢复
+    """
+
+    def request_stop(signum, frame):
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        logger.warning("收到中断信号，正在停止测试（再次按 Ctrl+C 立即退出）...")
+        runner.stop()
+
+    return signal.signal(signal.SIGINT, request_stop)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.list:
+        list_projects()
+        return EXIT_OK
+
+    if args.from_journal:
+        return report_from_journal(args.from_journal, args)
+
+    if not args.project or not args.suite:
+        logger.error("请通过 --project 与 --suite 指定要执行的测试套件")
+        return EXIT_CONFIG_ERROR
+
+    resumed = None
+    if args.resume:
+        try:
+            resumed = load_checkpoint(args.project, args.suite)
+        except (OSError, ValueError) as e:
+            logger.error(str(e))
+            return EXIT_CONFIG_ERROR
+        if resumed.finished_all_rounds:
+            # 全部轮次已完成，只是结束前未来得及清理断点
+            resumed.remove()
+            logger.info("断点中的测试已全部完成，直接生成报告")
+            return report_from_journal(resumed.journal_path, args)
+
+    cases_to_run, case_options = load_cases(
+        args.project, args.suite, resumed.case_names if resumed else args.cases
+    )
+    if not cases_to_run:
+        logger.error("没有可执行的测试用例")
+        return EXIT_CONFIG_ERROR
+
+    # 预解析执行计划
+    case_plan, plan_errors = build_case_plan(cases_to_run, case_options)
+    if plan_errors:
+        for case_name, error_msg in plan_errors:
+            logger.error(f"用例 '{case_name}' 解析失败: {error_msg}")
+        return EXIT_CONFIG_ERROR
+
+    if resumed:
+        test_settings = dict(resumed.test_settings)
+    else:
+        test_settings = {
+            "rounds": max(1, args.rounds),
+            "stop_on_fail": args.stop_on_fail,
+            "delay": max(0, args.delay),
+            "parallel": args.parallel,
+            "max_workers": max(1, args.max_workers),
+        }
+    total_tests = len(case_plan) * test_settings["rounds"]
+    case_names = [entry.case_name for entry in case_plan]
+    tracker = CaseResultTracker(case_names, test_settings["rounds"])
+    if resumed:
+        tracker.load_state(resumed.tracker.to_state())
+
+    # 用例耗时历史：用于并行调度排序与剩余时间估算
+    duration_history = DurationHistory(args.project)
+    eta = EtaEstimator(
+        case_names,
+        test_settings["rounds"],
+        duration_history,
+        delay=test_settings["delay"],
+        concurrency=(
+            min(test_settings["max_workers"], len(case_plan)) if test_settings["parallel"] else 1
+        ),
+    )
+    if resumed:
+        for case_name, data in resumed.tracker.case_data.items():
+            eta.skip(case_name, data["test_count"])
+
+    def on_result(case_name, result, message, round_num):
+        tracker.update(case_name, result, message, round_num)
+        eta.complete(case_name)
+        progress = f"{tracker.completed}/{total_tests}"
+        remaining = eta.remaining_seconds()
+        if remaining is not None and tracker.completed < total_tests:
+            progress += f", 预计剩余 {format_duration(remaining)}"
+        log_level = "SUCCESS" if result == "Pass" else ("FAIL" if result == "Fail" else "ERROR")
+        log_by_level(
+            f"[轮次 {round_num}] 测试完成: {case_name} - 结果: {result} - 信息: {message} "
+            f"({progress})",
+            log_level,
+        )
+
+    # 结果日志：每个结果立即落盘，报告由日志生成；续测时追加到原日志中
+    if resumed:
+        checkpoint = resumed
+        journal = ResultJournal(checkpoint.journal_path)
+        journal.resume(checkpoint.results_count, checkpoint.current_round)
+        logger.info(
+            f"从断点继续执行测试套件 '{args.suite}'，已完成 {tracker.completed}/{total_tests}"
+        )
+    else:
+        journal = ResultJournal(new_journal_path(args.project, args.suite))
+        journal.start(args.project, args.suite, test_settings, case_names, total_tests)
+        checkpoint = RunCheckpoint(
+            checkpoint_path(args.project, args.suite),
+            args.project,
+            args.suite,
+            test_settings,
+            case_names,
+            total_tests,
+            journal.path,
+        )
+        checkpoint.save()
+
+    logger.info(
+        f"开始执行测试套件 '{args.suite}'，共 {len(case_plan)} 个用例，{test_settings['rounds']} 轮"
+    )
+    logger.info(f"结果日志: {journal.path}")
+    # 续测时先写入结果日志中已有的结果
+    junit_writer = open_junit(journal.path, args)
+    run_log = RunLog.create(f"{args.project}_{args.suite}", case_log_names(case_plan))
+    logger.info(f"执行日志目录: {run_log.run_dir}")
+    if eta.available:
+        logger.info(f"根据历史耗时，预计总耗时 {format_duration(eta.total_seconds())}")
+    runner = TestRunner(
+        case_plan,
+        test_settings,
+        on_result=on_result,
+        on_log=log_by_level,
+        on_round_finished=lambda round_num: logger.info(
+            f"第 {round_num}/{test_settings['rounds']} 轮测试完成"
+        ),
+        duration_history=duration_history,
+        journal=journal,
+        checkpoint=checkpoint,
+        run_log=run_log,
+        history_db=open_history_db(),
+        allure_writer=None if args.no_allure else open_allure_writer(
+            args.project, args.suite, test_settings
+        ),
+        junit_writer=junit_writer,
+    )
+    eta.start()
+    previous_handler = install_stop_handler(runner)
+    try:
+        runner.run()
+    except KeyboardInterrupt:
+        # 停止过程中再次 Ctrl+C：不再等待用例结束
+        logger.warning("测试执行被用户强制中断。")
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    # 从结果日志生成报告
+    report_path, _ = write_report_from_journal(journal.path, args.report_dir)
+    logger.success(f"测试报告已保存: {report_path}")
+
+    pass_rate = (tracker.passed / total_tests * 100) if total_tests > 0 else 0
+    logger.info(f"总计: {total_tests}, 成功: {tracker.passed}, 失败: {tracker.failed}, 成功率: {pass_rate:.1f}%")
+    return EXIT_OK if tracker.failed == 0 and tracker.passed == total_tests else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
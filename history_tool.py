@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+执行历史查询与导入工具
+
+测试执行结束后结果会自动写入执行历史数据库（test_history/run_history.db），
+本工具用于导入已有的 JSON 报告，以及在命令行查询历史统计。
+
+使用示例:
+    # 导入 test_reports 目录下的全部报告（已导入的报告会跳过）
+    python history_tool.py import test_reports
+
+    # 导入结果日志（如执行时未写入数据库）
+    python history_tool.py import-journal test_reports/journal/执行日志_xxx.jsonl
+
+    # 用例近 30 天的失败率
+    python history_tool.py fail-rate -p chery_lin 奇瑞水泵LIN转速递增测试 --days 30
+
+    # 本周平均耗时最长的 10 个用例
+    python history_tool.py slowest -p chery_lin --days 7
+
+    # 近 30 天失败次数最多的用例
+    python history_tool.py failing -p chery_lin
+
+    # 测试套件最近 20 次执行的成功率
+    python history_tool.py trend -p chery_lin -s chery_lin测试 -n 20
+
+退出码:
+    0 成功; 1 部分报告导入失败; 2 参数或数据库错误
+"""
+
+import argparse
+import sqlite3
+import sys
+
+from tools.log_tool import get_logger
+from runner.history_db import HistoryDB
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_ERROR = 2
+
+logger = get_logger("history_tool")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="自动化测试框架 - 执行历史查询与导入")
+    parser.add_argument("--db", help="历史数据库路径（默认 test_history/run_history.db）")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="导入 JSON 报告文件或目录")
+    import_parser.add_argument("paths", nargs="+", help="报告文件或目录")
+
+    journal_parser = commands.add_parser("import-journal", help="导入结果日志")
+    journal_parser.add_argument("paths", nargs="+", help="结果日志文件")
+
+    fail_parser = commands.add_parser("fail-rate", help="用例失败率")
+    fail_parser.add_argument("-p", "--project", required=True, help="项目名称")
+    fail_parser.add_argument("case", help="用例名称")
+    fail_parser.add_argument("--days", type=int, default=30, help="统计最近多少天（默认 30）")
+
+    slowest_parser = commands.add_parser("slowest", help="平均耗时最长的用例")
+    slowest_parser.add_argument("-p", "--project", help="项目名称（默认全部项目）")
+    slowest_parser.add_argument("--days", type=int, default=7, help="统计最近多少天（默认 7）")
+    slowest_parser.add_argument("-n", "--limit", type=int, default=10, help="显示条数")
+
+    failing_parser = commands.add_parser("failing", help="失败次数最多的用例")
+    failing_parser.add_argument("-p", "--project", required=True, help="项目名称")
+    failing_parser.add_argument("--days", type=int, default=30, help="统计最近多少天（默认 30）")
+    failing_parser.add_argument("-n", "--limit", type=int, default=10, help="显示条数")
+
+    trend_parser = commands.add_parser("trend", help="测试套件历次执行成功率")
+    trend_parser.add_argument("-p", "--project", required=True, help="项目名称")
+    trend_parser.add_argument("-s", "--suite", required=True, help="测试套件名称")
+    trend_parser.add_argument("-n", "--limit", type=int, default=30, help="最近多少次执行")
+    return parser.parse_args(argv)
+
+
+def import_reports(db, paths):
+    imported, skipped, errors = db.import_reports(paths)
+    for path, error in errors:
+        logger.error(f"导入失败: {path} ({error})")
+    logger.info(f"导入 {imported} 个报告，跳过已导入的 {skipped} 个，失败 {len(errors)} 个")
+    return EXIT_FAILED if errors else EXIT_OK
+
+
+def import_journals(db, paths):
+    failed = 0
+    for path in paths:
+        if db.record_journal(path) is None:
+            failed += 1
+    logger.info(f"导入 {len(paths) - failed} 个结果日志，失败 {failed} 个")
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        db = HistoryDB(args.db)
+        if args.command == "import":
+            return import_reports(db, args.paths)
+        if args.command == "import-journal":
+            return import_journals(db, args.paths)
+
+        if args.command == "fail-rate":
+            stats = db.case_fail_rate(args.project, args.case, args.days)
+            print(
+                f"{args.case}  最近 {args.days} 天: 执行 {stats['total']} 次，"
+                f"失败 {stats['failed']} 次，失败率 {stats['fail_rate']:.2%}"
+            )
+        elif args.command == "slowest":
+            for row in db.slowest_cases(args.project, args.days, args.limit):
+                print(
+                    f"{row['avg_duration']:>10.3f}s  最长 {row['max_duration']:.3f}s  "
+                    f"{row['runs']:>6} 次  {row['project']} / {row['case_name']}"
+                )
+        elif args.command == "failing":
+            for row in db.failing_cases(args.project, args.days, args.limit):
+                print(
+                    f"{row['failed']:>6}/{row['total']:<6} {row['fail_rate']:>7.2%}  {row['case_name']}"
+                )
+        elif args.command == "trend":
+            for row in db.suite_trend(args.project, args.suite, args.limit):
+                print(
+                    f"{row['started_at']}  {row['pass_rate']:>7.2%}  "
+                    f"成功 {row['passed']}  失败 {row['failed']}  ({row['status']})"
+                )
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"历史数据库操作失败: {e}")
+        return EXIT_ERROR
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,6 @@
 import sys
 import os
-import importlib
 import datetime
-import json
 from config import Config
 from PySide6.QtWidgets import (
     QApplication,
@@ -28,15 +26,53 @@ from PySide6.QtWidgets import (
     QCheckBox,
     QGroupBox,
     QAbstractItemView,
+    QComboBox,
 )
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QColor
+from PySide6.QtGui import QStandardItemModel, QColor
 from PySide6.QtCore import Qt, QObject, QThread, Signal, QTimer
-from tools.load_yaml import load_yaml_config
-from testCaseModel import TestCaseModel
-from fluent_qss import FluentTheme, FluentMessageBox, show_toast
+from testCaseModel import TestCaseModel, TestCaseFilterProxyModel
+from projectTreeModel import ProjectTreeModel
+from fluent_qss import FluentTheme, FluentMessageBox, FluentInputDialog, show_toast
 from fluent_qss.fluent_dock_log_panel import FluentDockLogPanel
-from tools.log_tool import setup_logger, get_logger
-
+from tools.log_tool import RunLog, setup_logger, get_logger
+from runner import (
+    TestRunner,
+    DEFAULT_TEST_SETTINGS,
+    DurationHistory,
+    EtaEstimator,
+    build_case_plan,
+    case_log_names,
+    format_duration,
+)
+from runner.checkpoint import RunCheckpoint, checkpoint_path, load_checkpoint
+from runner.journal import ResultJournal, new_journal_path
+from runner.report import (
+    build_report_data,
+    case_data_to_report_rows,
+    save_report,
+    write_report_from_journal,
+)
+from runner.allure_export import open_allure_writer
+from runner.history_db import open_history_db
+from runner.junit_export import start_junit_export
+from runner.result_buffer import ResultBuffer
+from runner.selections import SelectionStore
+from runner.suite_manifest import load_suite_manifest
+
+# 搜索框输入停顿多少毫秒后开始筛选
+SEARCH_DEBOUNCE_INTERVAL = 150
+
+# 用例筛选下拉框选项: (显示文本, TestCaseFilterProxyModel.set_filters 参数)
+CASE_FILTER_OPTIONS = [
+    ("全部用例", {}),
+    ("仅失败过", {"only_failed": True}),
+    ("最后结果: Pass", {"result": "Pass"}),
+    ("最后结果: Fail", {"result": "Fail"}),
+    ("最后结果: Error", {"result": "Error"}),
+    ("待测试", {"status": "待测试"}),
+    ("执行中", {"status": "执行中"}),
+    ("已完成", {"status": "已完成"}),
+]
 
 # 多轮测试设置对话框
 class MultiRoundTestDialog(QDialog):
@@ -44,7 +80,7 @@ class MultiRoundTestDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("多轮测试设置")
         self.setModal(True)
-        self.resize(300, 200)
+        self.resize(300, 260)
 
         layout = QFormLayout()
 
@@ -68,6 +104,21 @@ class MultiRoundTestDialog(QDialog):
         self.delay_spinbox.setSuffix(" 秒")
         layout.addRow("轮次间延时:", self.delay_spinbox)
 
+        # 并行执行选项
+        self.parallel_checkbox = QCheckBox()
+        self.parallel_checkbox.setChecked(False)
+        self.parallel_checkbox.setToolTip("资源互不冲突的用例将在线程池中并发执行")
+        layout.addRow("并行执行:", self.parallel_checkbox)
+
+        # 最大并发数
+        self.max_workers_spinbox = QSpinBox()
+        self.max_workers_spinbox.setMinimum(1)
+        self.max_workers_spinbox.setMaximum(32)
+        self.max_workers_spinbox.setValue(4)
+        self.max_workers_spinbox.setEnabled(False)
+        self.parallel_checkbox.toggled.connect(self.max_workers_spinbox.setEnabled)
+        layout.addRow("最大并发数:", self.max_workers_spinbox)
+
         # 按钮
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         buttons.accepted.connect(self.accept)
@@ -81,164 +132,66 @@ class MultiRoundTestDialog(QDialog):
             "rounds": self.rounds_spinbox.value(),
             "stop_on_fail": self.stop_on_fail_checkbox.isChecked(),
             "delay": self.delay_spinbox.value(),
+            "parallel": self.parallel_checkbox.isChecked(),
+            "max_workers": self.max_workers_spinbox.value(),
         }
 
 
 class TestWorker(QObject):
-    finished = Signal(str, str, str, int)  # case_name, result, message, round_num
+    """
+    测试执行线程适配器
+
+    将 runner.TestRunner 的回调转换为 Qt 信号，执行逻辑与命令行执行器共用。
+    用例结果不逐条发信号，而是写入 result_buffer，由界面定时批量取走，执行线程不等待界面。
+    """
+
     all_finished = Signal()
     log = Signal(str, str)
     round_finished = Signal(int)
 
-    def __init__(self, cases_to_run, test_settings=None):
+    def __init__(
+        self,
+        case_plan,
+        test_settings=None,
+        duration_history=None,
+        journal=None,
+        checkpoint=None,
+        run_log=None,
+        history_db=None,
+        allure_writer=None,
+        junit_writer=None,
+    ):
         super().__init__()
-        self.cases_to_run = cases_to_run
-        self.is_running = True
-        self.test_settings = test_settings or {
-            "rounds": 1,
-            "stop_on_fail": False,
-            "delay": 1,
-        }
+        # 用例结果缓冲区: [(case_name, result, message, round_num), ...]
+        self.result_buffer = ResultBuffer()
+        self.runner = TestRunner(
+            case_plan,  # 预先解析的执行计划 [PlanEntry, ...]
+            test_settings,
+            on_result=lambda *result: self.result_buffer.put(result),
+            on_log=self.log.emit,
+            on_round_finished=self.round_finished.emit,
+            duration_history=duration_history,
+            journal=journal,
+            checkpoint=checkpoint,
+            run_log=run_log,
+            history_db=history_db,
+            allure_writer=allure_writer,
+            junit_writer=junit_writer,
+        )
+
+    @property
+    def is_running(self):
+        return self.runner.is_running
 
     def run(self):
         try:
-            total_rounds = self.test_settings["rounds"]
-
-            for current_round in range(1, total_rounds + 1):
-                if not self.is_running:
-                    self.log.emit("测试执行被用户中断。", "WARNING")
-                    break
-
-                self.log.emit(f"开始第 {current_round}/{total_rounds} 轮测试", "INFO")
-
-                round_has_failure = False
-
-                for case_name, case_details in self.cases_to_run:
-                    if not self.is_running:
-                        self.log.emit("测试执行被用户中断。", "WARNING")
-                        break
-
-                    try:
-                        self.log.emit(
-                            f"[轮次 {current_round}] 正在执行: {case_name}...", "INFO"
-                        )
-
-                        # 根据您的配置格式解析
-                        # case_details 格式: [项目名, 模块文件, 类名, 其他参数...]
-                        if len(case_details) < 3:
-                            self.log.emit(f"测试用例 {case_name} 配置不完整", "ERROR")
-                            self.finished.emit(
-                                case_name, "Error", "配置不完整", current_round
-                            )
-                            round_has_failure = True
-                            continue
-
-                        project_name = case_details[0]  # 项目名，如 "zhongqi"
-                        module_file = case_details[
-                            1
-                        ]  # 模块文件，如 "zhongqi_Phone_case.py"
-                        class_name = case_details[2]  # 类名，如 "DialingKeyboard_UI"
-                        test_data = case_details[3:] if len(case_details) > 3 else {}
-
-                        # 构建模块导入路径
-                        module_name = module_file.replace(".py", "")
-
-                        # 构建导入路径
-                        module_import_path = f"case_script.{project_name}.{module_name}"
-
-                        self.log.emit(f"正在导入模块: {module_import_path}", "INFO")
-
-                        # 动态导入模块
-                        module = importlib.import_module(module_import_path)
-
-                        if not hasattr(module, class_name):
-                            error_msg = (
-                                f"模块 {module_import_path} 中未找到类 {class_name}"
-                            )
-                            self.log.emit(error_msg, "ERROR")
-                            self.finished.emit(
-                                case_name, "Error", error_msg, current_round
-                            )
-                            round_has_failure = True
-                            continue
-
-                        # 获取测试类
-                        test_class = getattr(module, class_name)
-
-                        # 创建测试实例，传入测试数据
-                        test_instance = test_class(test_data)
-
-                        # 执行测试
-                        if hasattr(test_instance, "run"):
-                            # 调用 run 方法
-                            result, message = test_instance.run()
-
-                            if result:
-                                self.finished.emit(
-                                    case_name, "Pass", message, current_round
-                                )
-                            else:
-                                self.finished.emit(
-                                    case_name, "Fail", message, current_round
-                                )
-                                round_has_failure = True
-                        else:
-                            # 如果没有 run 方法，直接调用实例
-                            test_instance()
-                            self.finished.emit(
-                                case_name, "Pass", "执行完成（无返回值）", current_round
-                            )
-
-                    except ImportError as e:
-                        error_msg = f"导入模块失败: {str(e)}"
-                        self.log.emit(error_msg, "ERROR")
-                        self.finished.emit(case_name, "Error", error_msg, current_round)
-                        round_has_failure = True
-
-                    except AttributeError as e:
-                        error_msg = f"类或方法不存在: {str(e)}"
-                        self.log.emit(error_msg, "ERROR")
-                        self.finished.emit(case_name, "Error", error_msg, current_round)
-                        round_has_failure = True
-
-                    except Exception as e:
-                        error_msg = f"执行测试用例时出错: {str(e)}"
-                        self.log.emit(error_msg, "ERROR")
-                        self.finished.emit(case_name, "Error", error_msg, current_round)
-                        round_has_failure = True
-
-                self.round_finished.emit(current_round)
-
-                # 如果设置了失败停止且本轮有失败，则停止
-                if self.test_settings["stop_on_fail"] and round_has_failure:
-                    self.log.emit(
-                        f"第 {current_round} 轮测试有失败，根据设置停止后续测试",
-                        "WARNING",
-                    )
-                    break
-
-                # 轮次间延时（除了最后一轮）
-                if current_round < total_rounds and self.is_running:
-                    delay = self.test_settings["delay"]
-                    if delay > 0:
-                        self.log.emit(f"等待 {delay} 秒后开始下一轮测试...", "INFO")
-                        import time
-
-                        time.sleep(delay)
-
-        except Exception as e:
-            error_msg = f"测试执行过程中发生未处理的异常: {str(e)}"
-            self.log.emit(error_msg, "ERROR")
-            import traceback
-
-            self.log.emit(f"异常详情: {traceback.format_exc()}", "ERROR")
-
+            self.runner.run()
         finally:
             # run方法结束时，发出 all_finished 信号
             self.all_finished.emit()
 
     def stop(self):
-        self.is_running = False
+        self.runner.stop()
 
 
 class MainWindow(QMainWindow):
@@ -248,9 +201,9 @@ class MainWindow(QMainWindow):
     代码结构:
     - 初始化方法: __init__, _init_data, _init_widgets, _init_ui, _init_connections
     - UI 构建方法: _create_toolbar, _create_grouped_layout, _setup_table_properties
-    - 项目加载方法: _load_project_tree, _load_test_suite, _parse_test_cases
-    - 测试执行方法: start_test, stop_test, restart_test
-    - 测试回调方法: _on_test_finished, _on_round_finished, _on_all_tests_finished
+    - 项目加载方法: _load_project_tree, _load_test_suite
+    - 测试执行方法: start_test, resume_test, stop_test, restart_test
+    - 测试回调方法: _flush_results, _on_round_finished, _on_all_tests_finished
     - UI 更新方法: _update_stats_ui, _update_button_states, log_message
     - 用例选择方法: select_all, select_none, select_inverse, filter_test_cases
     """
@@ -290,10 +243,13 @@ class MainWindow(QMainWindow):
         
         # 测试用例模型
         self.test_case_model = TestCaseModel()
+        # 筛选代理模型，表格显示的是筛选后的用例
+        self.test_case_proxy = TestCaseFilterProxyModel(self)
+        self.test_case_proxy.setSourceModel(self.test_case_model)
 
         # 项目配置
-        self.project_config = {}
         self.current_project_name = ""
+        self.selection_store = None  # 当前项目保存的用例选择
         self.current_test_suite = ""
         self.test_cases_config = {}
 
@@ -301,14 +257,30 @@ class MainWindow(QMainWindow):
         self.test_thread = None
         self.test_worker = None
         self.is_restarting = False
+        self.restart_pending = False
+
+        # 结果批量刷新定时器（执行线程写入缓冲区，界面按固定间隔批量处理）
+        self.result_flush_timer = QTimer(self)
+        self.result_flush_timer.setInterval(Config.UI_REFRESH_INTERVAL)
+
+        # 搜索防抖定时器（连续输入时只在停顿后筛选一次）
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_INTERVAL)
 
         # 统计计数器
         self.total_tests = 0
         self.passed_tests = 0
         self.failed_tests = 0
 
+        # 剩余时间估算（每次开始测试时根据用例耗时历史创建）
+        self.eta_estimator = None
+
+        # 最近一次执行的结果日志路径，报告由该日志生成
+        self.journal_path = ""
+
         # 多轮测试设置
-        self.test_settings = {"rounds": 1, "stop_on_fail": False, "delay": 1}
+        self.test_settings = dict(DEFAULT_TEST_SETTINGS)
         
         self.logger.debug("数据和状态变量初始化完成")
 
@@ -319,12 +291,14 @@ class MainWindow(QMainWindow):
         self.start_button = QPushButton("开始", self)
         self.stop_button = QPushButton("停止", self)
         self.restart_button = QPushButton("重启", self)
+        self.resume_button = QPushButton("断点续测", self)
         self.multi_round_button = QPushButton("多轮测试设置", self)
 
         # 设置按钮样式标识
         self.start_button.setObjectName("successButton")
         self.stop_button.setObjectName("dangerButton")
         self.restart_button.setObjectName("warningButton")
+        self.resume_button.setObjectName("warningButton")
         self.multi_round_button.setObjectName("primaryButton")
 
         # 统计信息标签
@@ -345,14 +319,20 @@ class MainWindow(QMainWindow):
         self.search_box = QLineEdit(self)
         self.search_box.setPlaceholderText("搜索测试用例...")
 
+        # 状态 / 结果筛选
+        self.case_filter_combo = QComboBox(self)
+        for text, filters in CASE_FILTER_OPTIONS:
+            self.case_filter_combo.addItem(text, filters)
+
         # 项目树视图
         self.tree_view = QTreeView(self)
         self.tree_view.setHeaderHidden(True)
-        self.tree_view.setModel(QStandardItemModel())
+        self.project_tree_model = ProjectTreeModel(self)
+        self.tree_view.setModel(self.project_tree_model)
 
         # 测试用例表格
         self.test_case_table = QTableView(self)
-        self.test_case_table.setModel(self.test_case_model)
+        self.test_case_table.setModel(self.test_case_proxy)
         self.test_case_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         # 设置最小高度，防止内容为空时表格收缩导致标题移动
         self.test_case_table.setMinimumHeight(300)
@@ -360,7 +340,14 @@ class MainWindow(QMainWindow):
         self.test_case_table.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
 
         # 日志面板 - 使用 FluentDockLogPanel
-        self.log_panel = FluentDockLogPanel(self, title="📋 执行日志")
+        self.log_panel = FluentDockLogPanel(
+            self,
+            title="📋 执行日志",
+            max_lines=Config.LOG_PANEL_MAX_LINES,
+            spill_path=os.path.join(
+                Config.LOG_DIR, f"界面日志_{datetime.datetime.now():%Y%m%d_%H%M%S}.log"
+            ),
+        )
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.log_panel)
 
         # 批量操作按钮
@@ -368,6 +355,13 @@ class MainWindow(QMainWindow):
         self.select_none_button = QPushButton("全不选", self)
         self.select_inverse_button = QPushButton("反选", self)
 
+        # 保存的用例选择
+        self.selection_combo = QComboBox(self)
+        self.selection_combo.setPlaceholderText("应用保存的选择")
+        self.selection_combo.setMinimumWidth(140)
+        self.save_selection_button = QPushButton("保存选择", self)
+        self.delete_selection_button = QPushButton("删除选择", self)
+
         # 状态栏
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
@@ -391,21 +385,34 @@ class MainWindow(QMainWindow):
         self.start_button.clicked.connect(self.start_test)
         self.stop_button.clicked.connect(self.stop_test)
         self.restart_button.clicked.connect(self.restart_test)
+        self.resume_button.clicked.connect(self.resume_test)
         self.multi_round_button.clicked.connect(self._show_multi_round_dialog)
 
         # 项目树
         self.tree_view.clicked.connect(self._on_tree_item_clicked)
+        self.project_tree_model.log.connect(self.log_message)
+        self.project_tree_model.project_loaded.connect(self._on_project_loaded)
 
         # 搜索筛选
-        self.search_box.textChanged.connect(self.filter_test_cases)
+        self.search_box.textChanged.connect(self.search_timer.start)
+        self.search_timer.timeout.connect(self._apply_search_text)
+        self.case_filter_combo.currentIndexChanged.connect(self._on_case_filter_changed)
 
         # 批量选择
         self.select_all_button.clicked.connect(self.select_all)
         self.select_none_button.clicked.connect(self.select_none)
         self.select_inverse_button.clicked.connect(self.select_inverse)
 
+        # 保存的用例选择
+        self.selection_combo.activated.connect(self._apply_saved_selection)
+        self.save_selection_button.clicked.connect(self.save_selection)
+        self.delete_selection_button.clicked.connect(self.delete_selection)
+
         # 模型更新
         self.test_case_model.case_updated.connect(self._on_case_updated)
+
+        # 结果批量刷新
+        self.result_flush_timer.timeout.connect(self._flush_results)
         
         self.logger.debug("信号连接初始化完成")
 
@@ -419,6 +426,7 @@ class MainWindow(QMainWindow):
         control_layout.addWidget(self.start_button)
         control_layout.addWidget(self.stop_button)
         control_layout.addWidget(self.restart_button)
+        control_layout.addWidget(self.resume_button)
         control_layout.addWidget(self.multi_round_button)
         control_layout.addStretch(1)
         control_group.setLayout(control_layout)
@@ -446,13 +454,19 @@ class MainWindow(QMainWindow):
 
         # 搜索和批量操作
         search_batch_layout = QVBoxLayout()
-        search_batch_layout.addWidget(self.search_box)
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.search_box, 1)
+        search_layout.addWidget(self.case_filter_combo)
+        search_batch_layout.addLayout(search_layout)
 
         batch_layout = QHBoxLayout()
         batch_layout.addWidget(self.select_all_button)
         batch_layout.addWidget(self.select_none_button)
         batch_layout.addWidget(self.select_inverse_button)
         batch_layout.addStretch(1)
+        batch_layout.addWidget(self.selection_combo)
+        batch_layout.addWidget(self.save_selection_button)
+        batch_layout.addWidget(self.delete_selection_button)
         search_batch_layout.addLayout(batch_layout)
 
         testcase_layout.addLayout(search_batch_layout)
@@ -500,6 +514,7 @@ class MainWindow(QMainWindow):
         toolbar.addAction("开始测试", self.start_test)
         toolbar.addAction("停止测试", self.stop_test)
         toolbar.addAction("重启测试", self.restart_test)
+        toolbar.addAction("断点续测", self.resume_test)
         toolbar.addAction("多轮设置", self._show_multi_round_dialog)
         toolbar.addSeparator()
         toolbar.addAction("💾 保存测试报告", self._save_test_report)
@@ -522,24 +537,16 @@ class MainWindow(QMainWindow):
     def _save_test_report(self):
         """保存测试报告"""
         try:
-            # 生成报告数据
-            report_data = self._generate_report_data()
-            
-            # 生成报告文件名
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            project_name = self.current_project_name or "未知项目"
-            suite_name = self.current_test_suite or "未知套件"
-            report_filename = f"测试报告_{project_name}_{suite_name}_{timestamp}.json"
-            
-            # 确保报告目录存在
-            report_dir = os.path.join(Config.ROOT_DIR, "test_reports")
-            os.makedirs(report_dir, exist_ok=True)
-            
-            report_path = os.path.join(report_dir, report_filename)
-            
-            # 保存为JSON格式
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, ensure_ascii=False, indent=2)
+            if self.journal_path and os.path.exists(self.journal_path):
+                # 由结果日志流式生成，包含逐轮结果
+                report_path, _ = write_report_from_journal(self.journal_path)
+            else:
+                report_path = save_report(
+                    self._generate_report_data(),
+                    self.current_project_name,
+                    self.current_test_suite,
+                )
+            report_filename = os.path.basename(report_path)
             
             self.log_message(f"测试报告已保存: {report_path}", "SUCCESS")
             self.logger.success(f"测试报告已保存: {report_path}")
@@ -553,55 +560,19 @@ class MainWindow(QMainWindow):
             self.logger.exception("保存测试报告时发生异常")
     
     def _generate_report_data(self):
-        """生成测试报告数据"""
-        # 收集所有测试用例的结果
-        test_cases = []
-        for row in range(self.test_case_model.rowCount()):
-            case_name_item = self.test_case_model.item(row, 1)
-            status_item = self.test_case_model.item(row, 2)
-            progress_item = self.test_case_model.item(row, 3)
-            exec_count_item = self.test_case_model.item(row, 4)
-            fail_count_item = self.test_case_model.item(row, 5)
-            result_item = self.test_case_model.item(row, 6)
-            message_item = self.test_case_model.item(row, 7)
-            
-            if case_name_item:
-                test_cases.append({
-                    "用例名称": case_name_item.text(),
-                    "状态": status_item.text() if status_item else "",
-                    "进度": progress_item.text() if progress_item else "",
-                    "执行次数": exec_count_item.text() if exec_count_item else "0",
-                    "失败次数": fail_count_item.text() if fail_count_item else "0",
-                    "最后结果": result_item.text() if result_item else "",
-                    "详细信息": message_item.text() if message_item else ""
-                })
-        
-        # 计算成功率
-        pass_rate = (
-            (self.passed_tests / self.total_tests * 100) if self.total_tests > 0 else 0
-        )
+        """尚未执行过测试时，按模型中的用例统计数据生成报告数据"""
+        test_cases = case_data_to_report_rows(self.test_case_model.test_case_data)
         
         # 组装报告数据
-        report_data = {
-            "报告信息": {
-                "生成时间": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "项目名称": self.current_project_name,
-                "测试套件": self.current_test_suite,
-                "测试轮次": self.test_settings["rounds"]
-            },
-            "测试统计": {
-                "总测试数": self.total_tests,
-                "成功数": self.passed_tests,
-                "失败数": self.failed_tests,
-                "成功率": f"{pass_rate:.2f}%"
-            },
-            "测试设置": {
-                "测试轮数": self.test_settings["rounds"],
-                "失败时停止": self.test_settings["stop_on_fail"],
-                "轮次间延时": f"{self.test_settings['delay']}秒"
-            },
-            "测试用例详情": test_cases
-        }
+        report_data = build_report_data(
+            self.current_project_name,
+            self.current_test_suite,
+            self.test_settings,
+            self.total_tests,
+            self.passed_tests,
+            self.failed_tests,
+            test_cases,
+        )
         
         return report_data
 
@@ -611,11 +582,18 @@ class MainWindow(QMainWindow):
         dialog.rounds_spinbox.setValue(self.test_settings["rounds"])
         dialog.stop_on_fail_checkbox.setChecked(self.test_settings["stop_on_fail"])
         dialog.delay_spinbox.setValue(self.test_settings["delay"])
+        dialog.parallel_checkbox.setChecked(self.test_settings.get("parallel", False))
+        dialog.max_workers_spinbox.setValue(self.test_settings.get("max_workers", 4))
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.test_settings = dialog.get_settings()
+            mode = (
+                f"并行 {self.test_settings['max_workers']} 线程"
+                if self.test_settings["parallel"]
+                else "顺序执行"
+            )
             self.log_message(
-                f"多轮测试设置已更新: {self.test_settings['rounds']}轮", "INFO"
+                f"多轮测试设置已更新: {self.test_settings['rounds']}轮，{mode}", "INFO"
             )
 
     def _setup_table_properties(self):
@@ -686,102 +664,41 @@ class MainWindow(QMainWindow):
 
     def filter_test_cases(self, text):
         """根据搜索框内容筛选测试用例列表"""
-        for i in range(self.test_case_model.rowCount()):
-            case_name_item = self.test_case_model.item(i, 1)
-            if case_name_item:
-                should_hide = text.lower() not in case_name_item.text().lower()
-                self.test_case_table.setRowHidden(i, should_hide)
+        self.test_case_proxy.set_filter_text(text)
+
+    def _apply_search_text(self):
+        """搜索防抖结束，按搜索框当前内容筛选"""
+        self.search_timer.stop()
+        self.filter_test_cases(self.search_box.text())
+
+    def _visible_case_rows(self):
+        """当前筛选结果对应的模型行号，搜索尚未生效时先立即筛选"""
+        if self.search_timer.isActive():
+            self._apply_search_text()
+        return self.test_case_proxy.visible_source_rows()
+
+    def _on_case_filter_changed(self, index):
+        """状态 / 结果筛选变化"""
+        filters = self.case_filter_combo.itemData(index) or {}
+        self.test_case_proxy.set_filters(**filters)
 
     # ========== 项目加载方法 ==========
 
     def _load_project_tree(self):
-        """加载项目树结构"""
+        """加载项目树结构（项目节点立即显示，测试套件在后台加载）"""
         self.logger.info("开始加载项目树结构")
-        model = self.tree_view.model()
-        if not isinstance(model, QStandardItemModel):
-            self.logger.error("树视图模型类型错误")
-            return
-
-        model.clear()
-
         try:
-            # 读取项目配置文件
-            project_root = Config.ROOT_DIR
-            config_path = os.path.join(
-                project_root, "user_config", "project_config", "project_cfg.yaml"
-            )
-
-            if not os.path.exists(config_path):
-                self.log_message(f"项目配置文件不存在: {config_path}", "ERROR")
-                self.logger.error(f"项目配置文件不存在: {config_path}")
-                return
-
-            self.logger.debug(f"正在加载项目配置: {config_path}")
-            self.project_config = load_yaml_config(config_path)
-            projects = self.project_config.get("projects", {})
-
-            for project_cfg in projects:
-                # 创建项目节点
-                project_item = QStandardItem(f"📁 {project_cfg.get('name', '')}")
-                project_item.setData(
-                    {"type": "project", "name": project_cfg.get("name", "")},
-                )
-
-                # 读取项目的测试套件配置文件
-                project_config_file = project_cfg.get("path", "")
-                if project_config_file:
-                    project_config_path = os.path.join(
-                        project_root,
-                        "user_config",
-                        "project_config",
-                        "project_list",
-                        project_config_file,
-                    )
-
-                    if os.path.exists(project_config_path):
-                        try:
-                            project_detail_config = load_yaml_config(
-                                project_config_path
-                            )
-
-                            # 为每个测试套件创建子节点
-                            for (
-                                suite_name,
-                                suite_config,
-                            ) in project_detail_config.items():
-                                suite_item = QStandardItem(f"📋 {suite_name}")
-                                suite_item.setData(
-                                    {
-                                        "type": "test_suite",
-                                        "project": project_cfg.get("name", ""),
-                                        "suite_name": suite_name,
-                                    },
-                                )
-                                project_item.appendRow(suite_item)
-
-                        except Exception as e:
-                            self.log_message(
-                                f"加载项目 {project_cfg.get('name', '')} 的配置失败: {str(e)}",
-                                "ERROR",
-                            )
-                    else:
-                        self.log_message(
-                            f"项目 {project_cfg.get('name', '')} 的配置文件不存在: {project_config_path}",
-                            "WARNING",
-                        )
-
-                model.appendRow(project_item)
-
-            # 展开所有项目节点
-            self.tree_view.expandAll()
-
-            self.log_message(f"已加载 {len(projects)} 个项目", "INFO")
-            self.logger.success(f"项目树加载完成，共 {len(projects)} 个项目")
-
+            project_count = self.project_tree_model.load_projects()
+            if project_count >= 0:
+                self.logger.info(f"项目树已显示 {project_count} 个项目，正在后台加载测试套件")
         except Exception as e:
             self.log_message(f"加载项目树失败: {str(e)}", "ERROR")
             self.logger.exception("加载项目树时发生异常")
 
+    def _on_project_loaded(self, index):
+        """项目的测试套件首次加载完成时展开该项目"""
+        self.tree_view.expand(index)
+
     def _on_tree_item_clicked(self, index):
         """处理树节点点击事件"""
         model = self.tree_view.model()
@@ -811,51 +728,41 @@ class MainWindow(QMainWindow):
         """加载指定项目的测试套件"""
         self.logger.info(f"开始加载测试套件: {suite_name} (项目: {project_name})")
         try:
+            if self.selection_store is None or self.selection_store.project != project_name:
+                self.selection_store = SelectionStore(project_name)
+                self._refresh_selection_combo()
             self.current_project_name = project_name
             self.current_test_suite = suite_name
 
-            # 构建测试套件文件路径
-            project_root = Config.ROOT_DIR
-            suite_file_path = os.path.join(
-                project_root,
-                "user_config",
-                "test_suite",
-                project_name,
-                f"{suite_name}.yaml",
-            )
-
-            # 如果没有找到 .yaml 文件，尝试 .yml 文件
-            if not os.path.exists(suite_file_path):
-                suite_file_path = os.path.join(
-                    project_root,
-                    "user_config",
-                    "test_suite",
-                    project_name,
-                    f"{suite_name}.yml",
-                )
-
-            if not os.path.exists(suite_file_path):
-                self.log_message(f"测试套件文件不存在: {suite_file_path}", "ERROR")
-                self.logger.error(f"测试套件文件不存在: {suite_file_path}")
+            # 读取测试套件清单（源文件未变化时不再解析 YAML，最近使用的套件直接从内存获取）
+            try:
+                manifest = load_suite_manifest(project_name, suite_name)
+            except FileNotFoundError as e:
+                self.log_message(str(e), "ERROR")
+                self.logger.error(str(e))
                 return
-
-            # 加载测试套件配置
-            self.logger.debug(f"正在加载测试套件配置: {suite_file_path}")
-            suite_config = load_yaml_config(suite_file_path)
+            self.logger.debug(f"测试套件清单: {manifest.source_path}")
 
             # 清空现有测试用例
             self.test_case_model.clear_all_cases()
 
-            # 解析测试用例
-            test_cases = self._parse_test_cases(suite_config)
+            for case_name, case_config in manifest.invalid_cases:
+                self.log_message(
+                    f"测试用例 '{case_name}' 的配置格式不正确，需要数组格式如: [\"项目\", \"文件\", \"类\"] (当前: {case_config})", 
+                    "WARNING"
+                )
+                self.logger.warning(f"测试用例 '{case_name}' 配置格式错误: {case_config}")
 
+            test_cases = manifest.test_cases
             if test_cases:
                 # 添加测试用例到模型
-                for case_name in test_cases.keys():
-                    self.test_case_model.add_test_case(case_name)
+                self.test_case_model.add_test_cases(test_cases.keys())
 
-                # 存储测试用例配置，供后续执行使用
-                self.test_cases_config = {"test_cases": {project_name: test_cases}}
+                # 存储测试用例配置与执行选项（超时等），供后续执行使用
+                self.test_cases_config = {
+                    "test_cases": {project_name: test_cases},
+                    "case_options": {project_name: manifest.case_options},
+                }
                 
                 self.log_message(
                     f"已加载项目 '{project_name}' 的测试套件 '{suite_name}'，共 {len(test_cases)} 个测试用例",
@@ -871,51 +778,6 @@ class MainWindow(QMainWindow):
             self.log_message(f"加载测试套件失败: {str(e)}", "ERROR")
             self.logger.exception(f"加载测试套件失败: {project_name}/{suite_name}")
 
-    def _parse_test_cases(self, suite_config):
-        """解析测试套件配置文件中的测试用例
-        
-        格式要求（数组格式）:
-        测试用例名: ["项目名", "模块文件", "类名", 测试数据...]
-        
-        说明:
-        - 前3个元素必须是: 项目名、模块文件、类名
-        - 可以在后面添加额外的测试数据参数（可选）
-        
-        示例:
-        root:
-          process0:
-            # 基础用例（无额外参数）
-            简单测试用例: ["demo_project", "demo_test_cases.py", "SimpleTestCase"]
-            # 带测试数据的用例
-            数据验证测试: ["demo_project", "demo_test_cases.py", "DataTest", {"key": "value"}, 100]
-        """
-        self.logger.debug("开始解析测试用例配置")
-        test_cases = {}
-
-        try:
-            # 结构: root -> process0 -> 测试用例名 -> 数组配置
-            root = suite_config.get("root", {})
-            process0 = root.get("process0", {})
-
-            for case_name, case_config in process0.items():
-                if isinstance(case_config, list) and len(case_config) >= 3:
-                    # 数组格式: ["项目文件夹", "文件路径", "类名", ...]
-                    test_cases[case_name] = case_config
-                    self.logger.debug(f"已解析测试用例 '{case_name}': {case_config}")
-                else:
-                    self.log_message(
-                        f"测试用例 '{case_name}' 的配置格式不正确，需要数组格式如: [\"项目\", \"文件\", \"类\"] (当前: {case_config})", 
-                        "WARNING"
-                    )
-                    self.logger.warning(f"测试用例 '{case_name}' 配置格式错误: {case_config}")
-
-        except Exception as e:
-            self.log_message(f"解析测试用例配置时出错: {str(e)}", "ERROR")
-            self.logger.exception("解析测试用例配置时发生异常")
-
-        self.logger.info(f"成功解析 {len(test_cases)} 个测试用例")
-        return test_cases
-
     # ========== 测试执行方法 ==========
 
     def start_test(self):
@@ -951,13 +813,106 @@ class MainWindow(QMainWindow):
         self.logger.info(f"当前项目: {self.current_project_name}, 测试套件: {self.current_test_suite}")
         self.logger.info(f"选中测试用例数: {len(selected_case_names)}, 测试轮次: {self.test_settings['rounds']}")
 
-        # 准备要执行的用例
+        case_plan = self._build_case_plan(selected_case_names)
+        if case_plan is None:
+            if self.is_restarting:
+                self.is_restarting = False
+            return
+
+        self.total_tests = len(case_plan) * self.test_settings["rounds"]
+        case_names = [entry.case_name for entry in case_plan]
+
+        # 结果日志：执行过程中每个结果立即落盘，崩溃后可从日志补出报告
+        journal = ResultJournal(
+            new_journal_path(self.current_project_name, self.current_test_suite)
+        )
+        journal.start(
+            self.current_project_name,
+            self.current_test_suite,
+            self.test_settings,
+            case_names,
+            self.total_tests,
+        )
+
+        # 断点：定期保存执行位置，中断后可通过“断点续测”继续
+        checkpoint = RunCheckpoint(
+            checkpoint_path(self.current_project_name, self.current_test_suite),
+            self.current_project_name,
+            self.current_test_suite,
+            self.test_settings,
+            case_names,
+            self.total_tests,
+            journal.path,
+        )
+        checkpoint.save()
+
+        self.log_message(
+            f"开始执行测试套件 '{self.current_test_suite}'，共 {len(case_plan)} 个用例，{self.test_settings['rounds']} 轮",
+            "INFO",
+        )
+        self._launch_test(case_plan, journal, checkpoint)
+
+    def resume_test(self):
+        """从上次中断的断点继续执行（测试设置与用例沿用断点中的记录）"""
+        if self.test_thread and self.test_thread.isRunning():
+            return
+        if not self.current_project_name or not self.current_test_suite:
+            self.log_message("请先选择项目和测试套件", "WARNING")
+            return
+
+        try:
+            checkpoint = load_checkpoint(self.current_project_name, self.current_test_suite)
+        except (OSError, ValueError) as e:
+            self.log_message(str(e), "WARNING")
+            return
+
+        if checkpoint.finished_all_rounds:
+            # 全部轮次已完成，只是结束前未来得及清理断点
+            checkpoint.remove()
+            self.journal_path = checkpoint.journal_path
+            self.log_message("断点中的测试已全部完成，直接生成报告", "INFO")
+            self._save_test_report()
+            return
+
+        case_plan = self._build_case_plan(checkpoint.case_names)
+        if case_plan is None:
+            return
+
+        self.logger.info("=" * 50)
+        self.logger.info(f"从断点继续执行测试: {checkpoint.path}")
+        self.logger.info("=" * 50)
+
+        # 恢复测试设置、统计计数与用例统计数据
+        self.test_settings = dict(checkpoint.test_settings)
+        self.total_tests = checkpoint.total_tests
+        self.passed_tests = checkpoint.tracker.passed
+        self.failed_tests = checkpoint.tracker.failed
+        self.test_case_model.reset_all_case_data()
+        self.test_case_model.restore_case_data(checkpoint.tracker.case_data)
+
+        # 续测结果追加到原结果日志，报告包含中断前后的全部结果
+        journal = ResultJournal(checkpoint.journal_path)
+        journal.resume(checkpoint.results_count, checkpoint.current_round)
+
+        self.log_message(
+            f"从断点继续执行测试套件 '{self.current_test_suite}'，"
+            f"已完成 {self.passed_tests + self.failed_tests}/{self.total_tests}",
+            "INFO",
+        )
+        self._launch_test(case_plan, journal, checkpoint)
+
+    def _build_case_plan(self, case_names):
+        """
+        根据用例名构建执行计划，失败时记录错误并返回 None
+
+        预解析执行计划：一次性导入用例类并校验配置，所有轮次复用
+        """
         cases_to_run = []
         project_cases_config = self.test_cases_config.get("test_cases", {}).get(
             self.current_project_name, {}
         )
 
-        for case_name in selected_case_names:
+        for case_name in case_names:
             case_details = project_cases_config.get(case_name)
             if case_details:
                 cases_to_run.append((case_name, case_details))
@@ -966,28 +921,89 @@ class MainWindow(QMainWindow):
                     f"在配置文件中找不到用例 '{case_name}' 的详细信息", "ERROR"
                 )
 
-        self.total_tests = len(cases_to_run) * self.test_settings["rounds"]
+        case_options = self.test_cases_config.get("case_options", {}).get(
+            self.current_project_name, {}
+        )
+        case_plan, plan_errors = build_case_plan(cases_to_run, case_options)
+        if plan_errors:
+            for case_name, error_msg in plan_errors:
+                self.log_message(f"用例 '{case_name}' 解析失败: {error_msg}", "ERROR")
+            self.log_message(
+                f"共 {len(plan_errors)} 个用例解析失败，请修正配置后重新开始测试", "ERROR"
+            )
+            self.logger.error(f"执行计划构建失败，{len(plan_errors)} 个用例无效")
+            return None
+        if not case_plan:
+            self.log_message("没有可执行的测试用例", "WARNING")
+            return None
+        self.logger.info(f"执行计划构建完成，共 {len(case_plan)} 个用例")
+        return case_plan
+
+    def _launch_test(self, case_plan, journal, checkpoint):
+        """创建执行线程并开始测试（开始测试与断点续测共用）"""
+        self.journal_path = journal.path
+        self.logger.info(f"结果日志: {journal.path}")
+        # JUnit XML 逐条写入，续测时先写入结果日志中已有的结果
+        junit_writer = start_junit_export(journal.path)
+        if junit_writer is not None:
+            self.logger.info(f"JUnit 结果: {junit_writer.path}")
         self._update_stats_ui()
 
+        # 用例耗时历史：用于并行调度排序与剩余时间估算
+        duration_history = DurationHistory(self.current_project_name)
+        self.eta_estimator = EtaEstimator(
+            [entry.case_name for entry in case_plan],
+            self.test_settings["rounds"],
+            duration_history,
+            delay=self.test_settings["delay"],
+            concurrency=(
+                min(self.test_settings["max_workers"], len(case_plan))
+                if self.test_settings["parallel"]
+                else 1
+            ),
+        )
+        for case_name, data in checkpoint.tracker.case_data.items():
+            self.eta_estimator.skip(case_name, data["test_count"])
+
         # 设置进度条
+        current_progress = self.passed_tests + self.failed_tests
         self.progress_bar.setMaximum(self.total_tests)
-        self.progress_bar.setValue(0)
+        self.progress_bar.setValue(current_progress)
+        self.progress_bar.setFormat(f"{current_progress} / {self.total_tests}{self._eta_text()}")
 
-        self.log_message(
-            f"开始执行测试套件 '{self.current_test_suite}'，共 {len(cases_to_run)} 个用例，{self.test_settings['rounds']} 轮",
-            "INFO",
+        if self.eta_estimator.available:
+            self.log_message(
+                f"根据历史耗时，预计总耗时 {format_duration(self.eta_estimator.total_seconds())}",
+                "INFO",
+            )
+
+        # 本次执行的日志目录（每个用例一个日志文件）
+        run_log = RunLog.create(
+            f"{self.current_project_name}_{self.current_test_suite}", case_log_names(case_plan)
         )
+        self.logger.info(f"执行日志目录: {run_log.run_dir}")
 
         # 启动测试线程
         self.test_thread = QThread()
-        self.test_worker = TestWorker(cases_to_run, self.test_settings)
+        self.test_worker = TestWorker(
+            case_plan,
+            self.test_settings,
+            duration_history,
+            journal,
+            checkpoint,
+            run_log,
+            open_history_db(),
+            open_allure_writer(
+                self.current_project_name, self.current_test_suite, self.test_settings
+            ),
+            junit_writer,
+        )
         self.test_worker.moveToThread(self.test_thread)
 
         # 1. 线程启动后，执行worker的run方法
         self.test_thread.started.connect(self.test_worker.run)
 
         # 2. 连接worker的信号到主窗口的槽
-        self.test_worker.finished.connect(self._on_test_finished)
         self.test_worker.log.connect(self.log_message)
         self.test_worker.round_finished.connect(self._on_round_finished)
 
@@ -1006,58 +1022,70 @@ class MainWindow(QMainWindow):
         self.test_thread.finished.connect(self._on_thread_cleaned_up)
 
         self.logger.info(
-            f"测试线程设置完成，共 {len(cases_to_run)} 个用例，{self.test_settings['rounds']} 轮，"
+            f"测试线程设置完成，共 {len(case_plan)} 个用例，{self.test_settings['rounds']} 轮，"
             f"总计 {self.total_tests} 个测试"
         )
 
         self._update_button_states(is_running=True)
+        self.result_flush_timer.start()
+        self.eta_estimator.start()
         self.test_thread.start()
         self.logger.success("测试线程已启动")
 
     # ========== 测试回调方法 ==========
 
-    def _on_test_finished(self, case_name, result, message, round_num):
-        """测试完成回调"""
-        log_level = (
-            "SUCCESS" if result == "Pass" else ("FAIL" if result == "Fail" else "ERROR")
-        )
-        self.log_message(
-            f"[轮次 {round_num}] 测试完成: {case_name} - 结果: {result} - 信息: {message}",
-            log_level,
-        )
+    def _flush_results(self):
+        """批量处理执行线程缓冲的测试结果（由定时器触发，每次刷新界面一次）"""
+        if not self.test_worker:
+            return
+        results = self.test_worker.result_buffer.drain()
+        if not results:
+            return
         
-        # 使用 loguru 记录更详细的信息
-        if result == "Pass":
-            self.logger.success(f"[轮次 {round_num}] {case_name}: {message}")
-        elif result == "Fail":
-            self.logger.error(f"[轮次 {round_num}] {case_name}: {message}")
-        else:
-            self.logger.warning(f"[轮次 {round_num}] {case_name}: {message}")
+        for case_name, result, message, round_num in results:
+            log_level = (
+                "SUCCESS" if result == "Pass" else ("FAIL" if result == "Fail" else "ERROR")
+            )
+            self.log_message(
+                f"[轮次 {round_num}] 测试完成: {case_name} - 结果: {result} - 信息: {message}",
+                log_level,
+            )
 
-        # 更新模型中的测试用例结果
-        self.test_case_model.update_case_result(
-            case_name, result, message, round_num, self.test_settings["rounds"]
-        )
+            if self.eta_estimator:
+                self.eta_estimator.complete(case_name)
 
-        # 更新统计
-        if result == "Pass":
-            self.passed_tests += 1
-        else:
-            self.failed_tests += 1
+            # 更新统计
+            if result == "Pass":
+                self.passed_tests += 1
+            else:
+                self.failed_tests += 1
+
+        # 批量更新模型中的测试用例结果
+        self.test_case_model.update_case_results(results, self.test_settings["rounds"])
 
         # 更新进度条
         current_progress = self.passed_tests + self.failed_tests
         self.progress_bar.setValue(current_progress)
-        self.progress_bar.setFormat(f"{current_progress} / {self.total_tests}")
+        eta_text = self._eta_text() if current_progress < self.total_tests else ""
+        self.progress_bar.setFormat(f"{current_progress} / {self.total_tests}{eta_text}")
 
         # 更新状态栏
         self.status_bar.showMessage(
-            f"正在执行测试... ({current_progress}/{self.total_tests})"
+            f"正在执行测试... ({current_progress}/{self.total_tests}){eta_text}"
         )
         
         # 刷新UI统计显示
         self._update_stats_ui()
 
+    def _eta_text(self):
+        """进度显示中的预计剩余时间，无历史耗时数据时为空"""
+        if not self.eta_estimator:
+            return ""
+        remaining = self.eta_estimator.remaining_seconds()
+        if remaining is None:
+            return ""
+        return f"  预计剩余 {format_duration(remaining)}"
+
     def _on_case_updated(self, case_name):
         """测试用例更新回调"""
         # 当测试用例更新时，刷新UI统计
@@ -1065,6 +1093,8 @@ class MainWindow(QMainWindow):
 
     def _on_round_finished(self, round_num):
         """轮次完成处理"""
+        # 先处理缓冲中的结果，保证日志顺序
+        self._flush_results()
         self.log_message(
             f"第 {round_num}/{self.test_settings['rounds']} 轮测试完成", "INFO"
         )
@@ -1075,6 +1105,10 @@ class MainWindow(QMainWindow):
         当所有测试轮次都执行完毕后调用。
         此方法只负责更新UI状态，不处理线程生命周期。
         """
+        # 停止定时刷新并处理剩余结果
+        self.result_flush_timer.stop()
+        self._flush_results()
+
         self.logger.info("=" * 50)
         self.logger.info("所有测试执行完毕")
         self.logger.info(f"总计: {self.total_tests}, 成功: {self.passed_tests}, 失败: {self.failed_tests}")
@@ -1097,9 +1131,10 @@ class MainWindow(QMainWindow):
             self._save_test_report()
 
         if self.is_restarting:
+            # 旧线程清理完成后立即重启（见 _on_thread_cleaned_up）
             self.is_restarting = False
-            self.log_message("将在1秒后自动重启测试...", "INFO")
-            QTimer.singleShot(1000, self.start_test)
+            self.restart_pending = True
+            self.log_message("测试线程结束后将立即重启测试...", "INFO")
 
     def _on_thread_cleaned_up(self):
         """
@@ -1109,6 +1144,10 @@ class MainWindow(QMainWindow):
         self.test_thread = None
         self.test_worker = None
 
+        if self.restart_pending:
+            self.restart_pending = False
+            self.start_test()
+
     def stop_test(self):
         """停止测试"""
         self.logger.warning("用户请求停止测试")
@@ -1121,6 +1160,11 @@ class MainWindow(QMainWindow):
         else:
             self.log_message("没有正在运行的测试。", "INFO")
 
+    def closeEvent(self, event):
+        """关闭窗口时停止项目树的文件监视与后台加载"""
+        self.project_tree_model.shutdown()
+        super().closeEvent(event)
+
     def restart_test(self):
         """重启测试功能"""
         self.logger.info("用户请求重启测试")
@@ -1139,7 +1183,7 @@ class MainWindow(QMainWindow):
         #  使用实际的测试总数（如果为0则使用选中用例数计算）
         if self.total_tests == 0:
             # 测试未开始，显示预估数量
-            selected_cases = len(self.test_case_model.get_selected_cases())
+            selected_cases = self.test_case_model.selected_count()
             display_total = selected_cases * self.test_settings["rounds"]
         else:
             # 测试已开始，使用实际总数
@@ -1169,36 +1213,76 @@ class MainWindow(QMainWindow):
         self.start_button.setEnabled(not is_running)
         self.stop_button.setEnabled(is_running)
         self.restart_button.setEnabled(not is_running)
+        self.resume_button.setEnabled(not is_running)
 
     # ========== 用例选择方法 ==========
 
     def select_all(self):
-        """全选测试用例"""
-        for i in range(self.test_case_model.rowCount()):
-            if not self.test_case_table.isRowHidden(i):
-                checkbox_item = self.test_case_model.item(i, 0)
-                if checkbox_item:
-                    checkbox_item.setCheckState(Qt.CheckState.Checked)
+        """全选测试用例（只作用于当前筛选结果）"""
+        self.test_case_model.set_rows_checked(True, self._visible_case_rows())
 
     def select_none(self):
         """全不选测试用例"""
-        for i in range(self.test_case_model.rowCount()):
-            checkbox_item = self.test_case_model.item(i, 0)
-            if checkbox_item:
-                checkbox_item.setCheckState(Qt.CheckState.Unchecked)
+        self.test_case_model.set_rows_checked(False)
 
     def select_inverse(self):
-        """反选测试用例"""
-        for i in range(self.test_case_model.rowCount()):
-            if not self.test_case_table.isRowHidden(i):
-                checkbox_item = self.test_case_model.item(i, 0)
-                if checkbox_item:
-                    current_state = checkbox_item.checkState()
-                    checkbox_item.setCheckState(
-                        Qt.CheckState.Unchecked
-                        if current_state == Qt.CheckState.Checked
-                        else Qt.CheckState.Checked
-                    )
+        """反选测试用例（只作用于当前筛选结果）"""
+        self.test_case_model.invert_rows_checked(self._visible_case_rows())
+
+    def save_selection(self):
+        """将当前勾选的用例保存为具名选择"""
+        if self.selection_store is None:
+            FluentMessageBox.warning(self, "警告", "请先加载测试套件")
+            return
+        selected = self.test_case_model.get_selected_cases()
+        if not selected:
+            FluentMessageBox.warning(self, "警告", "请先勾选要保存的测试用例")
+            return
+
+        name, ok = FluentInputDialog.getText(
+            self, "保存选择", f"为当前勾选的 {len(selected)} 个用例命名:",
+            default=self.selection_combo.currentText(),
+        )
+        name = name.strip()
+        if not ok or not name:
+            return
+        self.selection_store.save_selection(name, selected)
+        self._refresh_selection_combo(name)
+        self.log_message(f"已保存用例选择 '{name}'，共 {len(selected)} 个用例", "INFO")
+
+    def delete_selection(self):
+        """删除下拉框中当前的选择"""
+        name = self.selection_combo.currentText()
+        if self.selection_store is None or not name:
+            return
+        if not FluentMessageBox.question(self, "确认", f"确定删除保存的选择 '{name}' 吗？"):
+            return
+        self.selection_store.delete(name)
+        self._refresh_selection_combo()
+        self.log_message(f"已删除用例选择 '{name}'", "INFO")
+
+    def _apply_saved_selection(self, index):
+        """应用保存的选择（替换当前勾选）"""
+        name = self.selection_combo.itemText(index)
+        cases = self.selection_store.get(name) if self.selection_store else None
+        if cases is None:
+            return
+        applied = self.test_case_model.set_checked_cases(cases)
+        message = f"已应用用例选择 '{name}'，勾选 {applied} 个用例"
+        if applied < len(cases):
+            message += f"（{len(cases) - applied} 个用例不在当前测试套件中）"
+        self.log_message(message, "INFO")
+
+    def _refresh_selection_combo(self, current=None):
+        """重新填充保存的选择下拉框"""
+        self.selection_combo.blockSignals(True)
+        self.selection_combo.clear()
+        if self.selection_store is not None:
+            self.selection_combo.addItems(self.selection_store.names())
+        self.selection_combo.setCurrentIndex(
+            self.selection_combo.findText(current) if current else -1
+        )
+        self.selection_combo.blockSignals(False)
 
 
 if __name__ == "__main__":
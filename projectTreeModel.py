@@ -0,0 +1,236 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QFileSystemWatcher, QModelIndex, Signal
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+
+from runner.suite_loader import (
+    get_project_config_path,
+    get_project_list_path,
+    load_project_config,
+    load_project_suites,
+)
+
+# 同时读取项目测试套件列表的线程数（网络盘上的配置文件读取较慢）
+LOADER_THREADS = 4
+
+PROJECT_ICON = "📁"
+SUITE_ICON = "📋"
+
+
+class ProjectTreeModel(QStandardItemModel):
+    """
+    项目树模型
+
+    - 项目列表（project_cfg.yaml）读取后立即显示项目节点
+    - 各项目的测试套件列表在后台线程读取，读取完成后填充对应节点，界面线程不等待文件 I/O
+    - 读取失败的项目汇总为一条日志，节点上显示失败原因
+    - 监视项目列表与各项目的套件列表文件，文件变化时只重新加载受影响的节点
+
+    节点数据（item.data()）:
+        {"type": "project", "name": 项目名}
+        {"type": "test_suite", "project": 项目名, "suite_name": 套件名}
+    """
+
+    # 日志消息 (消息, 级别)
+    log = Signal(str, str)
+    # 项目的测试套件首次加载完成，参数为项目节点索引（用于展开）
+    project_loaded = Signal(QModelIndex)
+
+    # 后台线程读取结果: (加载批次, 项目名, 套件名列表, 错误信息)
+    _suites_ready = Signal(int, str, object, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=LOADER_THREADS, thread_name_prefix="project_loader"
+        )
+        self._generation = 0  # 每次全量加载递增，丢弃过期的后台结果
+        self._shut_down = False  # shutdown 之后后台线程不再发出结果
+        self._project_items = {}  # 项目名 -> 项目节点
+        self._project_cfgs = {}  # 项目名 -> 项目配置
+        self._list_paths = {}  # 套件列表文件路径 -> 项目名
+        self._loaded = set()  # 已完成首次加载的项目
+        self._pending = set()  # 本批次尚未返回结果的项目
+        self._stale = set()  # 加载过程中文件又发生变化、需要再次加载的项目
+        self._errors = []  # 本批次加载失败的项目，全部返回后汇总输出
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._suites_ready.connect(self._on_suites_ready)
+
+    # ========== 加载 ==========
+
+    def load_projects(self):
+        """
+        读取项目列表并显示项目节点，各项目的测试套件在后台加载
+
+        Returns:
+            int: 项目数；项目配置文件不存在时返回 -1
+        """
+        self._generation += 1
+        self.clear()
+        self._project_items = {}
+        self._project_cfgs = {}
+        self._list_paths = {}
+        self._loaded = set()
+        self._pending = set()
+        self._stale = set()
+        self._errors = []
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+        config_path = get_project_config_path()
+        self._watch(config_path)
+        try:
+            project_config = load_project_config()
+        except FileNotFoundError as e:
+            self.log.emit(str(e), "ERROR")
+            return -1
+
+        projects = project_config.get("projects", []) or []
+        for project_cfg in projects:
+            project_name = project_cfg.get("name", "")
+            project_item = QStandardItem(f"{PROJECT_ICON} {project_name}")
+            project_item.setData({"type": "project", "name": project_name})
+            self.appendRow(project_item)
+            self._project_items[project_name] = project_item
+            self._project_cfgs[project_name] = project_cfg
+
+            list_path = get_project_list_path(project_cfg)
+            if list_path:
+                self._list_paths[list_path] = project_name
+                self._watch(list_path)
+                # 监视所在目录，配置文件之后才创建时也能发现
+                self._watch_directory(os.path.dirname(list_path))
+
+        for project_name in self._project_items:
+            self._request(project_name)
+        return len(projects)
+
+    def reload_project(self, project_name):
+        """重新加载单个项目的测试套件"""
+        if project_name in self._project_items:
+            self._request(project_name)
+
+    def _request(self, project_name):
+        """提交后台加载"""
+        if self._shut_down:
+            return
+        if project_name in self._pending:
+            self._stale.add(project_name)
+            return
+        self._pending.add(project_name)
+        generation = self._generation
+        project_cfg = self._project_cfgs[project_name]
+        self._executor.submit(self._load_suites, generation, project_name, project_cfg)
+
+    def _load_suites(self, generation, project_name, project_cfg):
+        """后台线程：读取套件列表，结果通过信号交回界面线程"""
+        try:
+            suites = load_project_suites(project_cfg)
+            error = ""
+        except Exception as e:
+            suites = []
+            error = str(e) or e.__class__.__name__
+        if self._shut_down:
+            return
+        try:
+            self._suites_ready.emit(generation, project_name, suites, error)
+        except RuntimeError:
+            # 窗口关闭时模型可能已被销毁
+            pass
+
+    def _on_suites_ready(self, generation, project_name, suites, error):
+        """界面线程：用加载结果替换项目节点的子节点"""
+        if generation != self._generation:
+            return
+        self._pending.discard(project_name)
+        project_item = self._project_items.get(project_name)
+        if project_item is None:
+            return
+
+        if project_item.rowCount():
+            project_item.removeRows(0, project_item.rowCount())
+        if error:
+            project_item.setText(f"{PROJECT_ICON} {project_name} (加载失败)")
+            project_item.setToolTip(error)
+            self._errors.append(f"{project_name}: {error}")
+        else:
+            project_item.setText(f"{PROJECT_ICON} {project_name}")
+            project_item.setToolTip("")
+            suite_items = []
+            for suite_name in suites:
+                suite_item = QStandardItem(f"{SUITE_ICON} {suite_name}")
+                suite_item.setData(
+                    {"type": "test_suite", "project": project_name, "suite_name": suite_name}
+                )
+                suite_items.append(suite_item)
+            if suite_items:
+                project_item.appendRows(suite_items)
+
+        if project_name not in self._loaded:
+            self._loaded.add(project_name)
+            self.project_loaded.emit(project_item.index())
+            if len(self._loaded) == len(self._project_items):
+                self.log.emit(f"已加载 {len(self._project_items)} 个项目", "INFO")
+
+        if project_name in self._stale:
+            self._stale.discard(project_name)
+            self._request(project_name)
+
+        if not self._pending and self._errors:
+            self.log.emit(
+                f"{len(self._errors)} 个项目的测试套件加载失败:\n" + "\n".join(self._errors),
+                "WARNING",
+            )
+            self._errors = []
+
+    # ========== 文件监视 ==========
+
+    def _watch(self, path):
+        if path and path not in self._watcher.files():
+            self._watcher.addPath(path)  # 文件不存在时添加失败，不影响加载
+
+    def _watch_directory(self, path):
+        if path and path not in self._watcher.directories() and os.path.isdir(path):
+            self._watcher.addPath(path)
+
+    def _on_directory_changed(self, path):
+        """目录变化：之前缺失的套件列表文件被创建时加载对应项目"""
+        watched = set(self._watcher.files())
+        for list_path, project_name in self._list_paths.items():
+            if (
+                os.path.dirname(list_path) == path
+                and list_path not in watched
+                and os.path.exists(list_path)
+            ):
+                self._watch(list_path)
+                self.reload_project(project_name)
+
+    def _on_file_changed(self, path):
+        """文件变化：项目列表变化时全量重新加载，套件列表变化时只重新加载对应项目"""
+        # 编辑器保存时可能先删除再创建文件，监视会被移除，重新添加
+        self._watch(path)
+        if path == get_project_config_path():
+            self.log.emit("项目配置已变化，重新加载项目树", "INFO")
+            self.load_projects()
+            return
+        project_name = self._list_paths.get(path)
+        if project_name is not None:
+            self.log.emit(f"项目 {project_name} 的测试套件列表已变化，重新加载", "INFO")
+            self.reload_project(project_name)
+
+    def shutdown(self):
+        """停止文件监视与后台加载线程（窗口关闭时调用），重复调用无效果"""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        self._generation += 1
+        self._watcher.blockSignals(True)
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,36 @@
+"""
+测试执行引擎模块
+
+提供与界面无关的用例调度与执行支持
+"""
+
+from .cancel import CancelToken
+from .duration_history import DurationHistory, EtaEstimator, format_duration
+from .scheduler import EXCLUSIVE_RESOURCE, CaseScheduler, ResourceLockManager
+from .engine import DEFAULT_TEST_SETTINGS, TestRunner
+from .case_plan import (
+    CasePlanError,
+    PlanEntry,
+    build_case_plan,
+    build_plan_entry,
+    case_log_names,
+    resolve_case_class,
+)
+
+__all__ = [
+    "CancelToken",
+    "DurationHistory",
+    "EtaEstimator",
+    "format_duration",
+    "EXCLUSIVE_RESOURCE",
+    "CaseScheduler",
+    "ResourceLockManager",
+    "CasePlanError",
+    "PlanEntry",
+    "build_case_plan",
+    "build_plan_entry",
+    "case_log_names",
+    "resolve_case_class",
+    "DEFAULT_TEST_SETTINGS",
+    "TestRunner",
+]
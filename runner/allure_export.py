@@ -0,0 +1,224 @@
+"""
+Allure 结果导出
+
+执行过程中每个用例结果写入 Config.ALLURE_RESULTS_DIR 下的一个 Allure 结果文件
+（<uuid>-result.json），Allure 报告与看板可直接读取该目录，无需另行转换：
+- 同一用例各轮次的结果使用相同的 historyId，在 Allure 中显示为该用例的多次尝试（retries）
+- 用例通过 CaseBase.step 记录的步骤导出为 Allure 步骤
+- 每轮执行期间用例记录的日志（RunLog.read_attempt 取出的片段）作为该轮结果的附件
+
+结果文件由后台写入线程生成，执行线程只把结果放入队列，不等待磁盘。
+附件在结果文件之前写入，结果文件先写临时文件再改名，读取方不会看到写了一半的文件，
+也不会看到引用了尚不存在的附件的结果。
+"""
+
+import hashlib
+import json
+import os
+import platform
+import queue
+import threading
+import time
+import uuid
+
+from config import Config
+from tools.log_tool import get_logger
+
+logger = get_logger("allure_export")
+
+# 执行结果 -> Allure 状态
+STATUS_MAP = {"Pass": "passed", "Fail": "failed", "Error": "broken"}
+FRAMEWORK_NAME = "automation-test-framework"
+
+
+def _ms(timestamp):
+    return int(timestamp * 1000)
+
+
+def _history_id(*parts):
+    return hashlib.md5("/".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def _convert_steps(steps, default_stop):
+    """CaseBase.step 记录 -> Allure 步骤；未结束的步骤（超时或停止时）标记为中断"""
+    converted = []
+    for step in steps or ():
+        stop = step.get("stop")
+        status = step.get("status", "passed") if stop is not None else "broken"
+        item = {
+            "name": step.get("name", ""),
+            "status": status,
+            "stage": "finished",
+            "start": _ms(step.get("start") or default_stop),
+            "stop": _ms(stop if stop is not None else default_stop),
+            "steps": _convert_steps(step.get("steps"), default_stop),
+        }
+        if step.get("message"):
+            item["statusDetails"] = {"message": step["message"]}
+        converted.append(item)
+    return converted
+
+
+class AllureResultWriter:
+    """
+    Allure 结果写入器
+
+    Args:
+        project_name / suite_name: 项目与测试套件名，对应 Allure 的 parentSuite / suite
+        results_dir: 结果目录，默认 Config.ALLURE_RESULTS_DIR
+        test_settings: 测试设置，写入 environment.properties
+
+    Example:
+        writer = AllureResultWriter("demo_project", "基础功能测试")
+        writer.add_result("简单测试用例", "Pass", "测试通过", 1, 0.12, steps=instance.steps)
+        writer.close()   # 写完队列中的结果
+    """
+
+    def __init__(self, project_name, suite_name, results_dir=None, test_settings=None):
+        self.project_name = project_name
+        self.suite_name = suite_name
+        self.results_dir = results_dir or Config.ALLURE_RESULTS_DIR
+        self.test_settings = dict(test_settings or {})
+        os.makedirs(self.results_dir, exist_ok=True)
+        self._host = platform.node()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="allure-writer", daemon=True)
+        self._thread.start()
+
+    def add_result(
+        self,
+        case_name,
+        outcome,
+        message,
+        round_num,
+        duration,
+        steps=None,
+        class_name=None,
+        log_reader=None,
+        thread=None,
+    ):
+        """
+        添加一个用例结果（只放入写入队列，立即返回）
+
+        Args:
+            steps: CaseBase.steps 步骤记录
+            class_name: 用例类名
+            log_reader: 返回本轮用例日志文本的函数，由写入线程调用，结果作为附件写入
+            thread: 用例执行线程名，Allure 时间线按该标签分组；未提供时不写 thread 标签
+        """
+        stop = time.time()
+        start = stop - max(0.0, duration or 0.0)
+        history_id = _history_id(self.project_name, self.suite_name, case_name)
+        result_uuid = str(uuid.uuid4())
+        labels = [
+            {"name": "parentSuite", "value": str(self.project_name)},
+            {"name": "suite", "value": str(self.suite_name)},
+            {"name": "host", "value": self._host},
+            {"name": "framework", "value": FRAMEWORK_NAME},
+            {"name": "language", "value": "python"},
+        ]
+        if thread:
+            labels.append({"name": "thread", "value": str(thread)})
+        if class_name:
+            labels.append({"name": "testClass", "value": class_name})
+        result = {
+            "uuid": result_uuid,
+            "historyId": history_id,
+            "testCaseId": history_id,
+            "name": str(case_name),
+            "fullName": f"{self.project_name}.{self.suite_name}.{case_name}",
+            "status": STATUS_MAP.get(outcome, "unknown"),
+            "statusDetails": {"message": str(message or "")},
+            "stage": "finished",
+            "start": _ms(start),
+            "stop": _ms(stop),
+            "labels": labels,
+            "parameters": [{"name": "轮次", "value": str(round_num)}],
+            "steps": _convert_steps(steps, stop),
+            "attachments": [],
+        }
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put((result, log_reader))
+
+    def close(self):
+        """写完队列中的结果并写入环境信息；重复调用无效果"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        self._write_environment()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            result, log_reader = item
+            if log_reader is not None:
+                self._write_log_attachment(result, log_reader)
+            path = os.path.join(self.results_dir, f"{result['uuid']}-result.json")
+            try:
+                self._write_file(path, json.dumps(result, ensure_ascii=False))
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"写入 Allure 结果失败: {path} ({e})")
+
+    def _write_log_attachment(self, result, log_reader):
+        """写入本轮的用例日志附件并加入结果的附件列表"""
+        try:
+            text = log_reader()
+        except Exception as e:
+            logger.warning(f"读取用例日志失败: {result['name']} ({e})")
+            return
+        if not text:
+            return
+        source = f"{uuid.uuid4()}-attachment.log"
+        try:
+            self._write_file(os.path.join(self.results_dir, source), text)
+        except OSError as e:
+            logger.warning(f"写入 Allure 日志附件失败: {source} ({e})")
+            return
+        result["attachments"].append({"name": "用例日志", "source": source, "type": "text/plain"})
+
+    def _write_environment(self):
+        """environment.properties：报告首页的环境信息，以最近一次执行为准"""
+        lines = [
+            f"project={self.project_name}",
+            f"suite={self.suite_name}",
+            f"host={self._host}",
+            f"python={platform.python_version()}",
+        ]
+        lines.extend(f"{key}={value}" for key, value in self.test_settings.items())
+        try:
+            self._write_file(
+                os.path.join(self.results_dir, "environment.properties"), "\n".join(lines) + "\n"
+            )
+        except OSError as e:
+            logger.warning(f"写入 Allure 环境信息失败: {e}")
+
+    @staticmethod
+    def _write_file(path, content):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+
+def open_allure_writer(project_name, suite_name, test_settings=None, results_dir=None):
+    """
+    按 Config.ALLURE_EXPORT 创建 Allure 结果写入器
+
+    未启用或结果目录无法创建时返回 None（不影响测试执行）
+    """
+    if not Config.ALLURE_EXPORT:
+        return None
+    try:
+        return AllureResultWriter(project_name, suite_name, results_dir, test_settings)
+    except OSError as e:
+        logger.error(f"创建 Allure 结果目录失败: {e}")
+        return None
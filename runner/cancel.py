@@ -0,0 +1,46 @@
+"""
+协作式取消令牌
+
+执行器在停止时取消令牌，用例与执行器通过 wait() 代替 time.sleep()，
+停止请求发出后等待立即返回，停止与重启可在毫秒级生效。
+
+使用示例:
+    token = CancelToken()
+
+    # 用例或执行器中
+    for step in steps:
+        if token.wait(0.2):   # 返回 True 表示已请求停止
+            break
+
+    # 停止测试时
+    token.cancel()
+"""
+
+import threading
+
+
+class CancelToken:
+    """基于 threading.Event 的取消令牌（线程安全）"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """请求取消"""
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._event.is_set()
+
+    def wait(self, seconds) -> bool:
+        """
+        等待指定秒数，期间请求取消则立即返回
+
+        Returns:
+            bool: True 表示等待被取消打断，False 表示正常等待结束
+        """
+        if seconds is None or seconds <= 0:
+            return self._event.is_set()
+        return self._event.wait(seconds)
@@ -0,0 +1,172 @@
+"""
+用例执行计划
+
+在测试开始前一次性完成用例解析：
+1. 校验用例配置格式
+2. 导入用例模块并解析测试类
+3. 拆分测试数据、收集用例声明的资源
+
+生成的执行计划在所有轮次中复用，执行阶段不再进行 importlib 导入与配置校验。
+"""
+
+import copy
+import importlib
+from typing import Any, List, Tuple
+
+from tools.log_tool.logger import Logger
+from .scheduler import EXCLUSIVE_RESOURCE
+
+
+class CasePlanError(Exception):
+    """用例配置无法解析为可执行条目"""
+
+
+class PlanEntry:
+    """执行计划中的单个用例"""
+
+    __slots__ = (
+        "case_name",
+        "case_details",
+        "test_class",
+        "test_data",
+        "resources",
+        "timeout",
+        "log_level",
+    )
+
+    def __init__(
+        self, case_name, case_details, test_class, test_data, resources, timeout=0, log_level=None
+    ):
+        self.case_name = case_name
+        self.case_details = case_details
+        self.test_class = test_class
+        self.test_data = test_data
+        self.resources = resources
+        self.timeout = timeout  # 超时时间（秒），0 表示不限制
+        self.log_level = log_level  # 用例日志级别，None 表示使用用例类的默认值
+
+    def create_instance(self):
+        """创建用例实例，每次执行使用独立的测试数据副本"""
+        instance = self.test_class(copy.copy(self.test_data))
+        if self.log_level is not None:
+            instance.log_level = self.log_level
+        return instance
+
+    def __repr__(self):
+        return f"PlanEntry({self.case_name!r}, {self.test_class.__name__})"
+
+
+def case_log_names(case_plan):
+    """执行计划中用例日志的绑定名称（CaseBase 以类名创建日志记录器），用于按用例拆分日志文件"""
+    names = set()
+    for entry in case_plan:
+        names.add(entry.case_name)
+        names.add(entry.test_class.__name__)
+    return names
+
+
+def resolve_case_class(case_details) -> Any:
+    """
+    根据用例配置导入模块并返回测试类
+
+    Args:
+        case_details: [项目名, 模块文件, 类名, 其他参数...]
+
+    Raises:
+        CasePlanError: 配置不完整、模块导入失败或类不存在
+    """
+    if not isinstance(case_details, (list, tuple)) or len(case_details) < 3:
+        raise CasePlanError("配置不完整")
+
+    project_name = case_details[0]  # 项目名，如 "zhongqi"
+    module_file = case_details[1]  # 模块文件，如 "zhongqi_Phone_case.py"
+    class_name = case_details[2]  # 类名，如 "DialingKeyboard_UI"
+
+    # 构建导入路径
+    module_name = module_file.replace(".py", "")
+    module_import_path = f"case_script.{project_name}.{module_name}"
+
+    try:
+        module = importlib.import_module(module_import_path)
+    except ImportError as e:
+        raise CasePlanError(f"导入模块失败: {str(e)}") from e
+
+    if not hasattr(module, class_name):
+        raise CasePlanError(f"模块 {module_import_path} 中未找到类 {class_name}")
+
+    return getattr(module, class_name)
+
+
+def build_plan_entry(case_name, case_details, options=None) -> PlanEntry:
+    """
+    解析单个用例配置，失败时抛出 CasePlanError
+
+    Args:
+        case_name: 用例名
+        case_details: [项目名, 模块文件, 类名, 其他参数...]
+        options: 用例执行选项，如 {"timeout": 30, "log_level": "WARNING"}
+    """
+    options = options or {}
+    try:
+        timeout = float(options.get("timeout") or 0)
+    except (TypeError, ValueError):
+        raise CasePlanError(f"超时配置无效: {options.get('timeout')}")
+    if timeout < 0:
+        raise CasePlanError(f"超时配置无效: {timeout}")
+
+    log_level = options.get("log_level")
+    if log_level is not None:
+        log_level = str(log_level).upper()
+        try:
+            Logger.level_no(log_level)
+        except ValueError:
+            raise CasePlanError(f"日志级别配置无效: {options.get('log_level')}")
+
+    test_class = resolve_case_class(case_details)
+    # 用例配置来自共享的套件清单，复制测试数据，避免用例脚本修改后影响清单
+    test_data = copy.deepcopy(case_details[3:]) if len(case_details) > 3 else {}
+
+    # 未实现 get_resources 的非 CaseBase 用例按独占处理
+    if hasattr(test_class, "get_resources"):
+        try:
+            resources = tuple(test_class.get_resources(test_data))
+            # LIN 通道资源只由用例的 LIN 配置生成，重写 get_resources 时遗漏也会补上
+            lin_resource = test_class.lin_resource() if hasattr(test_class, "lin_resource") else None
+        except Exception as e:
+            raise CasePlanError(f"获取用例资源声明失败: {str(e)}") from e
+        if lin_resource and lin_resource not in resources:
+            resources += (lin_resource,)
+    else:
+        resources = (EXCLUSIVE_RESOURCE,)
+
+    return PlanEntry(
+        case_name, case_details, test_class, test_data, resources, timeout, log_level
+    )
+
+
+def build_case_plan(
+    cases_to_run, case_options=None
+) -> Tuple[List[PlanEntry], List[Tuple[str, str]]]:
+    """
+    将待执行用例编译为执行计划
+
+    Args:
+        cases_to_run: [(用例名, 用例配置), ...]
+        case_options: {用例名: 执行选项}，见 suite_loader.parse_case_options
+
+    Returns:
+        tuple: (执行计划条目列表, [(用例名, 错误信息), ...])
+    """
+    case_options = case_options or {}
+    entries = []
+    errors = []
+    for case_name, case_details in cases_to_run:
+        try:
+            entries.append(
+                build_plan_entry(case_name, case_details, case_options.get(case_name))
+            )
+        except CasePlanError as e:
+            errors.append((case_name, str(e)))
+        except Exception as e:
+            errors.append((case_name, f"解析用例时出错: {str(e)}"))
+    return entries, errors
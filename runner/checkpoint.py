@@ -0,0 +1,218 @@
+"""
+断点续测
+
+执行过程中定期保存执行位置（当前轮次、本轮已完成的用例、统计计数与各用例统计数据），
+进程崩溃、断电或用户停止后可以从最近的断点继续执行，而不必从第 1 轮重新开始。
+
+每个测试套件只保留一个断点文件，全部轮次正常执行完毕后自动删除。
+断点与结果日志（Journal）配合使用：续测时日志中断点之后写入的结果会被丢弃（这些用例会重新执行），
+最终报告由日志重放生成，包含崩溃前与续测后的全部结果。
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+from config import Config
+from tools.log_tool import get_logger
+from .report import CaseResultTracker
+
+logger = get_logger("checkpoint")
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(project_name, suite_name, checkpoint_dir=None):
+    """测试套件对应的断点文件路径"""
+    checkpoint_dir = checkpoint_dir or Config.CHECKPOINT_DIR
+    return os.path.join(checkpoint_dir, f"断点_{project_name}_{suite_name}.json")
+
+
+class RunCheckpoint:
+    """
+    执行断点（线程安全）
+
+    由 TestRunner 在每个用例结果写入日志后调用 record()，距上次保存超过
+    interval 秒时写盘；每轮结束时 finish_round() 立即写盘。
+
+    Example:
+        checkpoint = RunCheckpoint(path, "demo_project", "基础功能测试", settings,
+                                   ["用例A"], total_tests=3, journal_path=journal.path)
+        checkpoint.save()
+
+        # 续测
+        checkpoint = RunCheckpoint.load(path)
+        checkpoint.current_round, checkpoint.done_in_round
+    """
+
+    def __init__(
+        self,
+        path,
+        project_name,
+        suite_name,
+        test_settings,
+        case_names,
+        total_tests,
+        journal_path,
+        interval=None,
+    ):
+        self.path = path
+        self.project_name = project_name
+        self.suite_name = suite_name
+        self.test_settings = dict(test_settings)
+        self.case_names = list(case_names)
+        self.total_tests = total_tests
+        self.journal_path = journal_path
+        self.interval = Config.CHECKPOINT_INTERVAL if interval is None else interval
+
+        self.tracker = CaseResultTracker(self.case_names, self.test_settings["rounds"])
+        self.current_round = 1  # 尚未完成的轮次
+        self.done_in_round = set()  # 当前轮次已完成的用例
+        self.round_failed = False  # 当前轮次已完成的用例中是否有失败
+        self.results_count = 0  # 已记录的结果条数，与结果日志中的 result 记录一一对应
+
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+        # 结果日志 ResultJournal 及保护日志与断点写入顺序的锁，由 attach_journal 设置
+        self._journal = None
+        self._journal_lock = None
+
+    def attach_journal(self, journal, lock=None):
+        """
+        关联结果日志：保存断点前先持有 lock 将日志同步到磁盘，再生成断点内容，
+        断电后断点中的结果条数不会超过日志中实际落盘的结果
+
+        Args:
+            journal: ResultJournal
+            lock: 写入结果日志与调用 record() 时持有的锁（需可重入）
+        """
+        self._journal = journal
+        self._journal_lock = lock
+
+    def record(self, case_name, result, message, round_num):
+        """记录一条用例结果，距上次保存超过 interval 秒时写盘"""
+        with self._lock:
+            self.tracker.update(case_name, result, message, round_num)
+            if round_num == self.current_round:
+                self.done_in_round.add(case_name)
+                if result != "Pass":
+                    self.round_failed = True
+            self.results_count += 1
+            due = time.monotonic() - self._last_save >= self.interval
+        if due:
+            self.save()
+
+    def finish_round(self, round_num):
+        """轮次完成，断点移到下一轮并立即写盘"""
+        with self._lock:
+            self.current_round = round_num + 1
+            self.done_in_round = set()
+            self.round_failed = False
+        self.save()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "version": CHECKPOINT_VERSION,
+                "time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "project": self.project_name,
+                "suite": self.suite_name,
+                "settings": self.test_settings,
+                "cases": self.case_names,
+                "total_tests": self.total_tests,
+                "journal": self.journal_path,
+                "round": self.current_round,
+                "done_in_round": sorted(self.done_in_round),
+                "round_failed": self.round_failed,
+                "results_count": self.results_count,
+                "stats": self.tracker.to_state(),
+            }
+
+    def save(self):
+        """写入断点文件（先写临时文件再替换，写入中断时保留上一次的断点）"""
+        with self._journal_lock or nullcontext():
+            if self._journal is not None:
+                self._journal.sync()
+            data = self.to_dict()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"保存断点失败: {e}")
+            return
+        with self._lock:
+            self._last_save = time.monotonic()
+
+    def remove(self):
+        """删除断点文件（全部轮次执行完毕后调用）"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            logger.error(f"删除断点失败: {e}")
+
+    @classmethod
+    def load(cls, path):
+        """
+        读取断点文件
+
+        Raises:
+            OSError: 文件不存在或无法读取
+            ValueError: 文件内容无效
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"断点文件版本不兼容: {path}")
+
+        try:
+            checkpoint = cls(
+                path,
+                data["project"],
+                data["suite"],
+                data["settings"],
+                data["cases"],
+                data["total_tests"],
+                data["journal"],
+            )
+            checkpoint.current_round = int(data["round"])
+            checkpoint.done_in_round = set(data.get("done_in_round") or [])
+            checkpoint.round_failed = bool(data.get("round_failed"))
+            checkpoint.results_count = int(data.get("results_count", 0))
+            checkpoint.tracker.load_state(data.get("stats") or {})
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"断点文件内容无效: {e}") from e
+        return checkpoint
+
+    @property
+    def finished_all_rounds(self):
+        """断点是否已越过最后一轮"""
+        return self.current_round > self.test_settings["rounds"]
+
+
+def load_checkpoint(project_name, suite_name, checkpoint_dir=None):
+    """
+    读取测试套件的断点，用于续测
+
+    Raises:
+        FileNotFoundError: 没有断点，或断点对应的结果日志已不存在
+        ValueError: 断点文件内容无效
+    """
+    path = checkpoint_path(project_name, suite_name, checkpoint_dir)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"测试套件 '{suite_name}' 没有可继续执行的断点")
+    try:
+        checkpoint = RunCheckpoint.load(path)
+    except OSError as e:
+        raise ValueError(f"读取断点失败: {e}") from e
+    if not os.path.exists(checkpoint.journal_path):
+        raise FileNotFoundError(f"断点对应的结果日志不存在: {checkpoint.journal_path}")
+    return checkpoint
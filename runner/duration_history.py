@@ -0,0 +1,228 @@
+"""
+用例耗时历史与剩余时间估算
+
+每次执行记录用例的实际耗时（墙钟时间），按项目保存在本地 JSON 文件中。
+每个用例保留最近 MAX_SAMPLES 次的耗时，预计耗时为这些耗时的指数移动平均（EMA），
+平滑单次波动；保留的原始耗时可用于查看异常值。历史数据用于：
+1. 并行调度：按预计耗时从长到短派发用例，减少最后只剩一个长用例在跑的情况
+2. 剩余时间估算：GUI 进度条与命令行日志显示多轮执行的预计剩余时间
+
+文件格式:
+{
+  "version": 2,
+  "projects": {
+    "<项目名>": {
+      "<用例名>": {"avg": 12.3, "last": 11.8, "runs": 5, "recent": [12.9, 12.1, ..., 11.8]}
+    }
+  }
+}
+
+版本 1 的记录没有 recent，读取时以其 avg 作为唯一一次耗时。
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from tools.log_tool import get_logger
+from .project_store import ProjectJsonFile
+
+logger = get_logger("duration_history")
+
+HISTORY_VERSION = 2
+# 指数移动平均系数，越大越偏向最近一次耗时
+EMA_ALPHA = 0.3
+# 每个用例保留的最近耗时次数
+MAX_SAMPLES = 50
+
+
+class DurationHistory:
+    """
+    单个项目的用例耗时历史（线程安全）
+
+    Example:
+        history = DurationHistory("chery_lin")
+        history.estimate("奇瑞水泵LIN转速递增测试")   # 无记录时返回 None
+        history.record("奇瑞水泵LIN转速递增测试", 12.5)
+        history.save()
+    """
+
+    def __init__(
+        self,
+        project: str,
+        path: Optional[str] = None,
+        alpha: float = EMA_ALPHA,
+        max_samples: int = MAX_SAMPLES,
+    ):
+        self.project = project
+        self.path = path or Config.DURATION_HISTORY_FILE
+        self.alpha = alpha
+        self.max_samples = max(1, max_samples)
+        self._lock = threading.Lock()
+        self._updated = set()  # 本次运行中有新记录的用例
+        self._file = ProjectJsonFile(self.path, HISTORY_VERSION, "用例耗时历史")
+        self._cases: Dict[str, dict] = self._file.load_project(project)
+
+    def estimate(self, case_name: str) -> Optional[float]:
+        """用例的预计耗时（秒），无历史记录时返回 None"""
+        with self._lock:
+            record = self._cases.get(case_name)
+        return record["avg"] if record else None
+
+    def estimate_all(self, case_names: Iterable[str]) -> Dict[str, float]:
+        """
+        一组用例的预计耗时
+
+        无历史记录的用例取其余有记录用例的平均值；全部无记录时返回空字典
+        """
+        case_names = list(case_names)
+        known = {name: self.estimate(name) for name in case_names}
+        known = {name: value for name, value in known.items() if value is not None}
+        if not known:
+            return {}
+        fallback = sum(known.values()) / len(known)
+        return {name: known.get(name, fallback) for name in case_names}
+
+    def durations(self, case_name: str) -> List[float]:
+        """用例最近的耗时记录（秒，从旧到新），无记录时返回空列表"""
+        with self._lock:
+            record = self._cases.get(case_name)
+            return list(self._samples(record)) if record else []
+
+    def record(self, case_name: str, seconds: float) -> None:
+        """记录一次用例耗时"""
+        seconds = round(max(0.0, float(seconds)), 3)
+        with self._lock:
+            record = self._cases.get(case_name)
+            if record:
+                samples = self._samples(record) + [seconds]
+                runs = record.get("runs", 0) + 1
+            else:
+                samples = [seconds]
+                runs = 1
+            samples = samples[-self.max_samples:]
+            self._cases[case_name] = {
+                "avg": round(self._ema(samples), 3),
+                "last": seconds,
+                "runs": runs,
+                "recent": samples,
+            }
+            self._updated.add(case_name)
+
+    @staticmethod
+    def _samples(record) -> List[float]:
+        """记录中的最近耗时；版本 1 的记录以平均值作为唯一一次耗时"""
+        samples = record.get("recent")
+        if isinstance(samples, list) and samples:
+            return [float(value) for value in samples]
+        return [float(record["avg"])]
+
+    def _ema(self, samples) -> float:
+        """按时间顺序计算指数移动平均"""
+        avg = samples[0]
+        for value in samples[1:]:
+            avg = self.alpha * value + (1 - self.alpha) * avg
+        return avg
+
+    def save(self) -> None:
+        """写回历史文件，只合并本次更新的用例（见 ProjectJsonFile.update_project）"""
+        with self._lock:
+            if not self._updated:
+                return
+            updates = {name: dict(self._cases[name]) for name in self._updated}
+            self._updated.clear()
+
+        try:
+            self._file.update_project(self.project, lambda cases: cases.update(updates))
+        except OSError as e:
+            logger.error(f"保存用例耗时历史失败: {e}")
+
+
+class EtaEstimator:
+    """
+    多轮执行的剩余时间估算
+
+    预计总工作量 = 各用例历史耗时之和 × 轮数。执行过程中按
+    “实际用时 / 已完成用例的预计耗时” 校正速度，并行执行时该比例自然小于 1。
+
+    Args:
+        case_names: 本次执行的用例名
+        rounds: 轮数
+        history: DurationHistory，为 None 时无法估算
+        delay: 轮次间延时（秒）
+        concurrency: 预计并发数，用于尚无完成用例时的初始估算
+    """
+
+    def __init__(self, case_names, rounds, history=None, delay=0, concurrency=1):
+        self.case_names = list(case_names)
+        self.rounds = max(1, rounds)
+        self.delay = max(0, delay)
+        self.concurrency = max(1, concurrency)
+        self._estimates = history.estimate_all(self.case_names) if history else {}
+        self._round_work = sum(self._estimates.values())
+        self._done_work = 0.0
+        self._completed = 0
+        self._skipped_work = 0.0  # 断点前已完成的工作量，不参与速度校正
+        self._skipped = 0
+        self._start_time = None
+
+    @property
+    def available(self) -> bool:
+        """是否有历史数据可供估算"""
+        return bool(self._estimates)
+
+    def start(self) -> None:
+        """开始计时"""
+        self._start_time = time.monotonic()
+
+    def complete(self, case_name: str) -> None:
+        """登记一个已完成的用例"""
+        self._completed += 1
+        self._done_work += self._estimates.get(case_name, 0.0)
+
+    def skip(self, case_name: str, count: int = 1) -> None:
+        """登记断点续测前已完成的用例执行次数"""
+        self._skipped += count
+        self._skipped_work += self._estimates.get(case_name, 0.0) * count
+
+    def total_seconds(self) -> Optional[float]:
+        """执行前的预计总耗时（秒），续测时不含断点前已完成的部分"""
+        if not self.available:
+            return None
+        remaining_work = max(self._round_work * self.rounds - self._skipped_work, 0.0)
+        rounds_left = self.rounds - 1 - self._rounds_done(self._skipped)
+        return remaining_work / self.concurrency + self.delay * rounds_left
+
+    def remaining_seconds(self) -> Optional[float]:
+        """预计剩余时间（秒），无法估算时返回 None"""
+        if not self.available:
+            return None
+        if self._start_time is None or self._completed == 0 or self._done_work <= 0:
+            return self.total_seconds()
+
+        # 本次执行中已完成轮次的延时不计入用例执行速度
+        rounds_before = self._rounds_done(self._skipped)
+        rounds_done = self._rounds_done(self._skipped + self._completed)
+        elapsed = time.monotonic() - self._start_time - (rounds_done - rounds_before) * self.delay
+        speed = max(elapsed, 0.0) / self._done_work
+
+        remaining_work = max(
+            self._round_work * self.rounds - self._skipped_work - self._done_work, 0.0
+        )
+        remaining_delays = self.delay * (self.rounds - 1 - rounds_done)
+        return remaining_work * speed + remaining_delays
+
+    def _rounds_done(self, executions):
+        """按执行次数折算已完成的轮次（不含最后一轮）"""
+        return min(executions // max(1, len(self.case_names)), self.rounds - 1)
+
+
+def format_duration(seconds) -> str:
+    """将秒数格式化为 H:MM:SS 或 MM:SS"""
+    seconds = int(round(max(0, seconds)))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
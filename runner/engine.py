@@ -0,0 +1,416 @@
+"""
+测试执行引擎
+
+与界面无关的多轮执行逻辑，GUI 的 TestWorker 与命令行执行器共用：
+- 轮次循环、失败停止、轮次间延时
+- 顺序执行 / 按资源调度的并行执行
+- 通过回调上报日志、用例结果与轮次完成事件
+- 运行期间激活设备池，CAN/LIN 设备在各用例、各轮次间复用，运行结束时统一关闭
+- 用例在看门狗下执行，超时或停止后仍未结束的用例被强制中断并释放资源
+- 停止请求通过 CancelToken 传递给用例，轮次间延时与用例内等待均可被立即打断
+- 记录每个用例的实际耗时到耗时历史，并行执行时按历史耗时从长到短派发
+- 每个用例结果立即追加写入结果日志（Journal），崩溃后已完成的结果不丢失
+- 定期保存断点，可从断点记录的轮次与用例位置继续执行
+- 用例结果（含步骤与日志附件）导出为 Allure 结果文件，由后台线程写入
+- 用例结果逐条追加到 JUnit XML，执行中途被结束时文件仍然有效
+"""
+
+import threading
+import time
+import traceback
+
+from tools.can_tool.device_pool import device_pool_session
+from .cancel import CancelToken
+from .scheduler import CaseScheduler
+from .watchdog import CaseCancelledError, CaseTimeoutError, run_guarded
+
+# 默认测试设置
+DEFAULT_TEST_SETTINGS = {
+    "rounds": 1,
+    "stop_on_fail": False,
+    "delay": 1,
+    "parallel": False,
+    "max_workers": 4,
+}
+
+# 停止请求中断的用例的执行结果：不写入结果日志与断点，续测时重新执行
+STOPPED = "Stopped"
+
+
+def _noop(*args):
+    pass
+
+
+class TestRunner:
+    """
+    测试执行器
+
+    Args:
+        case_plan: 执行计划 [PlanEntry, ...]
+        test_settings: 测试设置，缺省项使用 DEFAULT_TEST_SETTINGS
+        on_result: 用例结果回调 (case_name, result, message, round_num)
+        on_log: 日志回调 (message, level)
+        on_round_finished: 轮次完成回调 (round_num)
+        duration_history: 用例耗时历史 DurationHistory，为 None 时不记录耗时
+        journal: 结果日志 ResultJournal，为 None 时不写日志；执行结束时由执行器关闭
+        checkpoint: 断点 RunCheckpoint，为 None 时不保存断点；从其记录的轮次与位置开始执行，
+            全部轮次执行完毕后删除断点文件
+        run_log: 本次执行的日志文件 RunLog，执行结束时关闭
+        history_db: 执行历史数据库 HistoryDB，执行结束时导入结果日志；为 None 时不记录
+        allure_writer: Allure 结果写入器 AllureResultWriter，执行结束时关闭；为 None 时不导出
+        junit_writer: JUnit XML 写入器 JUnitXmlWriter，执行结束时关闭；为 None 时不导出
+
+    说明：
+        并行模式下 on_result / on_log 会在工作线程中被调用，回调需保证线程安全。
+    """
+
+    def __init__(
+        self,
+        case_plan,
+        test_settings=None,
+        on_result=None,
+        on_log=None,
+        on_round_finished=None,
+        duration_history=None,
+        journal=None,
+        checkpoint=None,
+        run_log=None,
+        history_db=None,
+        allure_writer=None,
+        junit_writer=None,
+    ):
+        self.case_plan = case_plan
+        self.test_settings = dict(DEFAULT_TEST_SETTINGS)
+        self.test_settings.update(test_settings or {})
+        self.on_result = on_result or _noop
+        self.on_log = on_log or _noop
+        self.on_round_finished = on_round_finished or _noop
+        self.duration_history = duration_history
+        self.journal = journal
+        self.checkpoint = checkpoint
+        self.run_log = run_log  # tools.log_tool.RunLog，执行结束时关闭
+        self.history_db = history_db
+        self.allure_writer = allure_writer
+        self.junit_writer = junit_writer
+        # 结果日志与断点按同一顺序记录，断点中的结果条数才能与日志对应；
+        # 断点在持有该锁时保存（record 内可能触发保存），因此使用可重入锁
+        self._record_lock = threading.RLock()
+        if self.checkpoint is not None and self.journal is not None:
+            self.checkpoint.attach_journal(self.journal, self._record_lock)
+        # 取消令牌，停止时取消，同时下发给每个用例实例
+        self.cancel_token = CancelToken()
+
+    @property
+    def is_running(self):
+        """是否未被请求停止"""
+        return not self.cancel_token.is_cancelled
+
+    def run(self):
+        """执行全部轮次，返回时所有用例均已结束"""
+        finished = False
+        try:
+            with device_pool_session():
+                finished = self._run_rounds()
+        finally:
+            if self.duration_history is not None:
+                self.duration_history.save()
+            if self.journal is not None:
+                self.journal.close("completed" if finished else "stopped")
+                if self.history_db is not None:
+                    self.history_db.record_journal(self.journal.path)
+            if self.junit_writer is not None:
+                self.junit_writer.close()
+            if self.checkpoint is not None:
+                if finished:
+                    self.checkpoint.remove()
+                else:
+                    self.checkpoint.save()
+                    self.on_log(f"断点已保存，可继续执行: {self.checkpoint.path}", "INFO")
+            if self.run_log is not None:
+                self.run_log.close()
+            if self.allure_writer is not None:
+                self.allure_writer.close()
+
+    def _run_rounds(self):
+        """轮次循环，全部轮次执行完毕（含失败停止）时返回 True，被中断时返回 False"""
+        try:
+            total_rounds = self.test_settings["rounds"]
+            parallel = self.test_settings["parallel"]
+            if parallel:
+                self.on_log(
+                    f"并行执行模式，最大并发数: {self.test_settings['max_workers']}",
+                    "INFO",
+                )
+
+            start_round = 1
+            if self.checkpoint is not None and self.checkpoint.current_round > 1:
+                start_round = self.checkpoint.current_round
+            if self.checkpoint is not None and (
+                start_round > 1 or self.checkpoint.done_in_round
+            ):
+                self.on_log(
+                    f"从断点继续执行: 第 {start_round} 轮，本轮已完成 "
+                    f"{len(self.checkpoint.done_in_round)} 个用例",
+                    "INFO",
+                )
+
+            for current_round in range(start_round, total_rounds + 1):
+                if not self.is_running:
+                    self.on_log("测试执行被用户中断。", "WARNING")
+                    return False
+
+                self.on_log(f"开始第 {current_round}/{total_rounds} 轮测试", "INFO")
+
+                # 续测的第一轮跳过断点前已完成的用例
+                entries = self.case_plan
+                round_has_failure = False
+                if self.checkpoint is not None and current_round == start_round:
+                    done = set(self.checkpoint.done_in_round)
+                    entries = [entry for entry in self.case_plan if entry.case_name not in done]
+                    round_has_failure = self.checkpoint.round_failed
+
+                if parallel:
+                    round_has_failure |= self._run_round_parallel(current_round, entries)
+                else:
+                    round_has_failure |= self._run_round_sequential(current_round, entries)
+
+                if not self.is_running:
+                    # 本轮未执行完，断点保持在本轮
+                    self.on_round_finished(current_round)
+                    return False
+
+                if self.journal is not None:
+                    self.journal.mark_round(current_round)
+                if self.checkpoint is not None:
+                    self.checkpoint.finish_round(current_round)
+                self.on_round_finished(current_round)
+
+                # 如果设置了失败停止且本轮有失败，则停止
+                if self.test_settings["stop_on_fail"] and round_has_failure:
+                    self.on_log(
+                        f"第 {current_round} 轮测试有失败，根据设置停止后续测试",
+                        "WARNING",
+                    )
+                    return True
+
+                # 轮次间延时（除了最后一轮）
+                if current_round < total_rounds and self.is_running:
+                    delay = self.test_settings["delay"]
+                    if delay > 0:
+                        self.on_log(f"等待 {delay} 秒后开始下一轮测试...", "INFO")
+                        self.cancel_token.wait(delay)
+
+            return True
+
+        except Exception as e:
+            self.on_log(f"测试执行过程中发生未处理的异常: {str(e)}", "ERROR")
+            self.on_log(f"异常详情: {traceback.format_exc()}", "ERROR")
+            return False
+
+    def stop(self):
+        """
+        请求停止
+
+        轮次间等待与使用 CaseBase.wait() 的用例立即返回；
+        宽限期后仍未结束的用例会被强制中断
+        """
+        self.cancel_token.cancel()
+
+    def _run_round_sequential(self, current_round, entries):
+        """按顺序执行一轮测试，返回本轮是否有失败"""
+        round_has_failure = False
+        for entry in entries:
+            if not self.is_running:
+                self.on_log("测试执行被用户中断。", "WARNING")
+                break
+            if self._execute_case(entry, current_round) != "Pass":
+                round_has_failure = True
+        return round_has_failure
+
+    def _run_round_parallel(self, current_round, entries):
+        """
+        并行执行一轮测试，返回本轮是否有失败
+
+        用例按声明的资源进行调度，资源冲突的用例互斥执行，其余用例在线程池中并发
+        """
+        failures = []
+        jobs = [(entry, entry.resources) for entry in self._longest_first(entries)]
+
+        def execute(entry):
+            if self._execute_case(entry, current_round) != "Pass":
+                failures.append(entry.case_name)
+
+        scheduler = CaseScheduler(self.test_settings["max_workers"])
+        scheduler.run_batch(jobs, execute, should_continue=lambda: self.is_running)
+
+        if not self.is_running:
+            self.on_log("测试执行被用户中断。", "WARNING")
+        return bool(failures)
+
+    def _longest_first(self, entries):
+        """按历史耗时从长到短排列用例，无历史数据时保持原顺序"""
+        if self.duration_history is None:
+            return list(entries)
+        estimates = self.duration_history.estimate_all(entry.case_name for entry in entries)
+        if not estimates:
+            return list(entries)
+        # sorted 为稳定排序，耗时相同的用例保持套件中的顺序
+        return sorted(entries, key=lambda entry: -estimates[entry.case_name])
+
+    def _execute_case(self, entry, current_round):
+        """
+        执行单个用例并上报结果
+
+        Args:
+            entry: 执行计划条目
+
+        Returns:
+            str: 执行结果 Pass / Fail / Error，被停止请求中断时为 STOPPED
+        """
+        case_name = entry.case_name
+        start_time = time.monotonic()
+        test_instance = None
+        case_thread = []  # 用例实际执行的线程名（Allure 时间线按线程分组）
+
+        def attempt():
+            case_thread.append(threading.current_thread().name)
+            return self._invoke_attempt(test_instance, (case_name, current_round))
+
+        try:
+            self.on_log(f"[轮次 {current_round}] 正在执行: {case_name}...", "INFO")
+
+            # 创建测试实例，传入测试数据
+            test_instance = entry.create_instance()
+            if hasattr(test_instance, "cancel_token"):
+                test_instance.cancel_token = self.cancel_token
+
+            # 在看门狗下执行测试
+            outcome, message = run_guarded(
+                attempt,
+                timeout=entry.timeout,
+                should_continue=lambda: self.is_running,
+                on_interrupt=lambda: self._release_case(test_instance),
+                name=case_name,
+            )
+            if not self.is_running:
+                return self._discard_stopped(case_name, current_round)
+            duration = time.monotonic() - start_time
+            # 超时、停止中断的用例耗时不具代表性，只记录正常结束的用例
+            if self.duration_history is not None:
+                self.duration_history.record(case_name, duration)
+
+            self._report(
+                entry, outcome, message, current_round, duration, test_instance, case_thread
+            )
+            return outcome
+
+        except (CaseTimeoutError, CaseCancelledError) as e:
+            error_msg = f"{case_name}: {str(e)}"
+            if e.abandoned:
+                self.on_log(f"用例 {case_name} 的执行线程未能退出，已放弃该线程", "WARNING")
+
+        except AttributeError as e:
+            error_msg = f"类或方法不存在: {str(e)}"
+
+        except Exception as e:
+            error_msg = f"执行测试用例时出错: {str(e)}"
+
+        if not self.is_running:
+            return self._discard_stopped(case_name, current_round)
+        self.on_log(error_msg, "ERROR")
+        self._report(
+            entry,
+            "Error",
+            error_msg,
+            current_round,
+            time.monotonic() - start_time,
+            test_instance,
+            case_thread,
+        )
+        return "Error"
+
+    def _discard_stopped(self, case_name, current_round):
+        """停止请求中断的用例不上报结果，断点中该用例仍未完成"""
+        self.on_log(
+            f"[轮次 {current_round}] 用例 {case_name} 被停止中断，结果不记录，续测时重新执行",
+            "WARNING",
+        )
+        return STOPPED
+
+    def _report(
+        self, entry, outcome, message, current_round, duration, test_instance=None, case_thread=()
+    ):
+        """先写入结果日志与断点再回调上报，保证界面看到的结果均已落盘"""
+        case_name = entry.case_name
+        with self._record_lock:
+            if self.journal is not None:
+                self.journal.append_result(case_name, outcome, message, current_round, duration)
+            if self.junit_writer is not None:
+                self.junit_writer.add_result(case_name, outcome, message, current_round, duration)
+            if self.checkpoint is not None:
+                self.checkpoint.record(case_name, outcome, message, current_round)
+        if self.allure_writer is not None:
+            self._export_allure(
+                entry, outcome, message, current_round, duration, test_instance, case_thread
+            )
+        self.on_result(case_name, outcome, message, current_round)
+
+    def _export_allure(
+        self, entry, outcome, message, current_round, duration, test_instance, case_thread=()
+    ):
+        """把结果放入 Allure 写入队列（不等待写入）"""
+        class_name = entry.test_class.__name__
+        # 超时被放弃的用例线程可能仍在记录步骤，导出前复制
+        steps = list(getattr(test_instance, "steps", None) or ())
+        log_reader = None
+        if self.run_log is not None:
+            attempt = (entry.case_name, current_round)
+            log_reader = lambda: self.run_log.read_attempt(attempt)
+        self.allure_writer.add_result(
+            entry.case_name,
+            outcome,
+            message,
+            current_round,
+            duration,
+            steps=steps,
+            class_name=class_name,
+            log_reader=log_reader,
+            thread=case_thread[0] if case_thread else None,
+        )
+
+    def _invoke_attempt(self, test_instance, attempt):
+        """导出 Allure 结果时在用例线程中标记本轮日志，结果附件只包含本轮的日志"""
+        if self.run_log is None or self.allure_writer is None:
+            return self._invoke_case(test_instance)
+        with self.run_log.attempt_context(attempt):
+            return self._invoke_case(test_instance)
+
+    @staticmethod
+    def _invoke_case(test_instance):
+        """
+        调用用例，返回 (outcome, message)
+
+        按 setUp -> env_init（用例需要 LIN 通道时）-> run -> tearDown 执行，
+        tearDown 在 finally 中调用，从设备池获取的通道总会归还
+        """
+        if not hasattr(test_instance, "run"):
+            # 如果没有 run 方法，直接调用实例
+            test_instance()
+            return "Pass", "执行完成（无返回值）"
+
+        if hasattr(test_instance, "setUp"):
+            test_instance.setUp()
+        try:
+            requires_lin = getattr(test_instance, "requires_lin", None)
+            if requires_lin is not None and requires_lin() and not test_instance.env_init():
+                return "Error", "环境初始化失败"
+            result, message = test_instance.run()
+            return ("Pass" if result else "Fail"), message
+        finally:
+            if hasattr(test_instance, "tearDown"):
+                test_instance.tearDown()
+
+    def _release_case(self, test_instance):
+        """强制中断用例时释放其占用的设备资源"""
+        if hasattr(test_instance, "teardown_test"):
+            test_instance.teardown_test()
@@ -0,0 +1,431 @@
+"""
+测试执行历史数据库
+
+每次执行结束后，执行器将结果日志整体导入本地 SQLite 数据库（test_history/run_history.db），
+用于跨多次执行的统计查询，如"某用例近 30 天的失败率"、"本周最慢的用例"、"测试套件历次成功率"。
+已有的 JSON 报告可以通过 history_tool.py 导入。
+
+表结构:
+    runs:       一次执行，source 为结果日志路径（无结果日志的旧报告为报告路径），重复导入时替换
+    results:    一次用例执行结果，冗余保存项目与套件名，以便按项目/用例/时间走索引
+    case_daily: 每次执行中每个用例每天的汇总（次数、失败数、耗时），导入时生成；
+                跨用例的排行查询（最慢、失败最多）只扫描汇总行，与轮数无关
+
+时间统一保存为 "YYYY-MM-DD HH:MM:SS" 文本，与结果日志一致，可直接按字符串比较范围。
+"""
+
+import contextlib
+import datetime
+import json
+import os
+import sqlite3
+
+from config import Config
+from tools.log_tool import get_logger
+from .journal import iter_journal_results, scan_journal
+
+logger = get_logger("history_db")
+
+SCHEMA_VERSION = 1
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    project TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT,
+    rounds INTEGER,
+    total_tests INTEGER,
+    passed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL,
+    project TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    case_name TEXT NOT NULL,
+    round INTEGER,
+    result TEXT NOT NULL,
+    message TEXT,
+    duration REAL,
+    time TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS case_daily (
+    run_id INTEGER NOT NULL,
+    project TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    case_name TEXT NOT NULL,
+    day TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    duration_sum REAL NOT NULL,
+    duration_count INTEGER NOT NULL,
+    duration_max REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_suite_time ON runs (project, suite, started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_time ON runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_results_case_time ON results (project, case_name, time, result);
+CREATE INDEX IF NOT EXISTS idx_results_suite_time ON results (project, suite, time);
+CREATE INDEX IF NOT EXISTS idx_results_time ON results (time);
+CREATE INDEX IF NOT EXISTS idx_results_run_round ON results (run_id, round);
+CREATE INDEX IF NOT EXISTS idx_case_daily_project_day ON case_daily (
+    project, day, case_name, total, failed, duration_count, duration_sum, duration_max
+);
+CREATE INDEX IF NOT EXISTS idx_case_daily_day ON case_daily (
+    day, project, case_name, duration_count, duration_sum, duration_max
+);
+CREATE INDEX IF NOT EXISTS idx_case_daily_run ON case_daily (run_id);
+"""
+
+
+def _since(days):
+    """days 天前的时间文本"""
+    return (datetime.datetime.now() - datetime.timedelta(days=days)).strftime(TIME_FORMAT)
+
+
+def _since_day(days):
+    """days 天前的日期文本（按天汇总的查询包含该日全天）"""
+    return _since(days)[:10]
+
+
+class HistoryDB:
+    """
+    执行历史数据库
+
+    每次操作使用独立连接，可在执行线程与界面线程中同时使用。
+
+    Example:
+        db = HistoryDB()
+        db.record_journal(journal_path)
+        db.case_fail_rate("chery_lin", "奇瑞水泵LIN转速递增测试", days=30)
+        db.slowest_cases("chery_lin", days=7)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.HISTORY_DB_FILE
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._transaction() as conn:
+            # WAL 模式下查询与写入互不阻塞
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """连接并开启事务，正常结束时提交，异常时回滚"""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _query(self, sql, params=()):
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    # ========== 写入 ==========
+
+    def _replace_run(self, conn, source, project, suite, started_at, rows):
+        """
+        写入一次执行（同一 source 已存在时先删除），rows 为 (用例名, 轮次, 结果, 信息, 耗时, 时间)
+
+        Returns:
+            tuple: (执行记录 id, {"passed": 成功数, "failed": 失败数, "last_time": 最后一条结果的时间})
+        """
+        for (run_id,) in conn.execute("SELECT id FROM runs WHERE source = ?", (source,)).fetchall():
+            conn.execute("DELETE FROM results WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM case_daily WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        run_id = conn.execute(
+            "INSERT INTO runs (source, project, suite, started_at) VALUES (?, ?, ?, ?)",
+            (source, project, suite, started_at),
+        ).lastrowid
+
+        counts = {"passed": 0, "failed": 0, "last_time": None}
+
+        def result_rows():
+            for case_name, round_num, result, message, duration, time_text in rows:
+                counts["passed" if result == "Pass" else "failed"] += 1
+                counts["last_time"] = time_text or counts["last_time"]
+                yield (
+                    run_id, project, suite, case_name, round_num,
+                    result, message, duration, time_text or started_at,
+                )
+
+        conn.executemany(
+            "INSERT INTO results (run_id, project, suite, case_name, round, result, message, duration, time)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            result_rows(),
+        )
+        conn.execute(
+            "INSERT INTO case_daily (run_id, project, suite, case_name, day, total, failed,"
+            " duration_sum, duration_count, duration_max)"
+            " SELECT run_id, project, suite, case_name, substr(time, 1, 10), COUNT(*),"
+            " SUM(result != 'Pass'), TOTAL(duration), COUNT(duration), MAX(duration)"
+            " FROM results WHERE run_id = ? GROUP BY case_name, substr(time, 1, 10)",
+            (run_id,),
+        )
+        conn.execute(
+            "UPDATE runs SET passed = ?, failed = ? WHERE id = ?",
+            (counts["passed"], counts["failed"], run_id),
+        )
+        # 更新查询优化器的统计信息（采样统计，百万行级别只需几毫秒）
+        conn.execute("PRAGMA analysis_limit = 400")
+        conn.execute("ANALYZE")
+        return run_id, counts
+
+    def record_journal(self, journal_path):
+        """
+        导入结果日志（执行结束时由执行器调用；续测后再次导入会替换之前的记录）
+
+        Returns:
+            int: 执行记录 id，失败时返回 None
+        """
+        source = os.path.abspath(journal_path)
+        try:
+            header, end = scan_journal(journal_path)
+            if header is None:
+                logger.warning(f"结果日志缺少执行开始记录，未写入历史数据库: {journal_path}")
+                return None
+            rows = (
+                (
+                    record["case"],
+                    record.get("round"),
+                    record["result"],
+                    record.get("message"),
+                    record.get("duration"),
+                    record.get("time"),
+                )
+                for record in iter_journal_results(journal_path)
+            )
+            settings = header.get("settings") or {}
+            with self._transaction() as conn:
+                run_id, counts = self._replace_run(
+                    conn,
+                    source,
+                    header.get("project", ""),
+                    header.get("suite", ""),
+                    header.get("time") or _since(0),
+                    rows,
+                )
+                conn.execute(
+                    "UPDATE runs SET finished_at = ?, status = ?, rounds = ?, total_tests = ? WHERE id = ?",
+                    (
+                        (end or {}).get("time") or counts["last_time"],
+                        (end or {}).get("status", "interrupted"),
+                        settings.get("rounds"),
+                        header.get("total_tests"),
+                        run_id,
+                    ),
+                )
+            return run_id
+        except (OSError, KeyError, TypeError, ValueError, sqlite3.Error) as e:
+            logger.error(f"写入历史数据库失败: {e}")
+            return None
+
+    def import_report(self, report_path):
+        """
+        导入 JSON 测试报告
+
+        报告对应的结果日志已导入时跳过。包含逐轮结果的报告按逐条结果导入；
+        旧报告只有用例汇总，按执行次数与失败次数还原为结果记录（轮次为空，时间为报告生成时间）。
+
+        Returns:
+            bool: 是否导入（已存在时返回 False）
+
+        Raises:
+            OSError / ValueError / sqlite3.Error: 报告无法读取或写入失败
+        """
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        try:
+            info = report["报告信息"]
+            stats = report["测试统计"]
+            case_rows = report["测试用例详情"]
+            generated_at = info["生成时间"]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"报告格式无效: {e}") from e
+
+        source = info.get("结果日志") or os.path.abspath(report_path)
+        try:
+            with self._transaction() as conn:
+                if conn.execute("SELECT 1 FROM runs WHERE source = ?", (source,)).fetchone():
+                    return False
+
+                if "轮次结果" in report:
+                    rows = (
+                        (
+                            item["用例名称"],
+                            round_item["轮次"],
+                            item["结果"],
+                            item.get("详细信息"),
+                            item.get("耗时(秒)"),
+                            item.get("时间"),
+                        )
+                        for round_item in report["轮次结果"]
+                        for item in round_item["用例结果"]
+                    )
+                else:
+                    rows = self._summary_rows(case_rows, generated_at)
+
+                run_id, _ = self._replace_run(
+                    conn, source, info.get("项目名称", ""), info.get("测试套件", ""), generated_at, rows
+                )
+                conn.execute(
+                    "UPDATE runs SET finished_at = ?, status = ?, rounds = ?, total_tests = ? WHERE id = ?",
+                    (generated_at, "imported", info.get("测试轮次"), stats.get("总测试数"), run_id),
+                )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"报告格式无效: {e}") from e
+        return True
+
+    @staticmethod
+    def _summary_rows(case_rows, generated_at):
+        """由报告中的用例汇总还原结果记录"""
+        for row in case_rows:
+            try:
+                test_count = int(row.get("执行次数") or 0)
+                fail_count = int(row.get("失败次数") or 0)
+            except ValueError:
+                continue
+            last_result = str(row.get("最后结果", "")).split(" ")[-1]
+            fail_result = last_result if last_result in ("Fail", "Error") else "Fail"
+            message = row.get("详细信息")
+            message = None if message == "-" else message
+            for i in range(test_count):
+                result = fail_result if i < fail_count else "Pass"
+                # 最后结果对应的信息记在最后一条
+                yield (
+                    row["用例名称"],
+                    None,
+                    result,
+                    message if i == test_count - 1 else None,
+                    None,
+                    generated_at,
+                )
+
+    def import_reports(self, paths):
+        """
+        导入报告文件或目录（目录下的 测试报告_*.json）
+
+        Returns:
+            tuple: (导入数, 跳过数, [(路径, 错误信息), ...])
+        """
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(
+                    os.path.join(path, name)
+                    for name in sorted(os.listdir(path))
+                    if name.startswith("测试报告_") and name.endswith(".json")
+                )
+            else:
+                files.append(path)
+
+        imported = skipped = 0
+        errors = []
+        for file_path in files:
+            try:
+                if self.import_report(file_path):
+                    imported += 1
+                else:
+                    skipped += 1
+            except (OSError, ValueError, sqlite3.Error) as e:
+                errors.append((file_path, str(e)))
+        return imported, skipped, errors
+
+    # ========== 查询 ==========
+
+    def case_fail_rate(self, project_name, case_name, days=30):
+        """
+        用例在最近 days 天内的执行次数与失败率
+
+        Returns:
+            dict: {"total": 执行次数, "failed": 失败次数, "fail_rate": 失败率(0~1)}
+        """
+        row = self._query(
+            "SELECT COUNT(*) AS total, COALESCE(SUM(result != 'Pass'), 0) AS failed FROM results"
+            " WHERE project = ? AND case_name = ? AND time >= ?",
+            (project_name, case_name, _since(days)),
+        )[0]
+        row["fail_rate"] = row["failed"] / row["total"] if row["total"] else 0.0
+        return row
+
+    def slowest_cases(self, project_name=None, days=7, limit=10):
+        """
+        最近 days 天内（按天汇总）平均耗时最长的用例
+
+        Returns:
+            list: [{"project", "case_name", "runs", "avg_duration", "max_duration"}, ...]
+        """
+        conditions = ["day >= ?", "duration_count > 0"]
+        params = [_since_day(days)]
+        if project_name is not None:
+            conditions.insert(0, "project = ?")
+            params.insert(0, project_name)
+        params.append(limit)
+        return self._query(
+            "SELECT project, case_name, SUM(duration_count) AS runs,"
+            " SUM(duration_sum) / SUM(duration_count) AS avg_duration,"
+            " MAX(duration_max) AS max_duration FROM case_daily"
+            f" WHERE {' AND '.join(conditions)}"
+            " GROUP BY project, case_name ORDER BY avg_duration DESC LIMIT ?",
+            params,
+        )
+
+    def suite_trend(self, project_name, suite_name, limit=30):
+        """
+        测试套件最近 limit 次执行的成功率，按时间先后排列
+
+        Returns:
+            list: [{"started_at", "status", "passed", "failed", "pass_rate"}, ...]
+        """
+        rows = self._query(
+            "SELECT started_at, status, passed, failed FROM runs"
+            " WHERE project = ? AND suite = ? ORDER BY started_at DESC LIMIT ?",
+            (project_name, suite_name, limit),
+        )
+        for row in rows:
+            total = row["passed"] + row["failed"]
+            row["pass_rate"] = row["passed"] / total if total else 0.0
+        rows.reverse()
+        return rows
+
+    def failing_cases(self, project_name, days=30, limit=10):
+        """
+        最近 days 天内（按天汇总）失败次数最多的用例
+
+        Returns:
+            list: [{"case_name", "total", "failed", "fail_rate"}, ...]
+        """
+        rows = self._query(
+            "SELECT case_name, SUM(total) AS total, SUM(failed) AS failed FROM case_daily"
+            " WHERE project = ? AND day >= ? GROUP BY case_name"
+            " HAVING SUM(failed) > 0 ORDER BY failed DESC LIMIT ?",
+            (project_name, _since_day(days), limit),
+        )
+        for row in rows:
+            row["fail_rate"] = row["failed"] / row["total"]
+        return rows
+
+
+def open_history_db(path=None):
+    """打开执行历史数据库，失败时记录错误并返回 None（不影响测试执行）"""
+    try:
+        return HistoryDB(path)
+    except (OSError, sqlite3.Error) as e:
+        logger.error(f"打开历史数据库失败: {e}")
+        return None
@@ -0,0 +1,246 @@
+"""
+测试结果日志（Journal）
+
+执行过程中每个用例结果立即以一行 JSON 追加写入磁盘（JSON Lines 格式），
+长时间稳定性测试中途崩溃或断电时，已完成的结果不会丢失。最终的 JSON 报告由日志重放生成。
+
+记录类型:
+    {"type": "run_start", "project": ..., "suite": ..., "settings": {...}, "cases": [...], "total_tests": N, "time": ...}
+    {"type": "result", "case": ..., "result": "Pass", "message": ..., "round": 1, "duration": 1.23, "time": ...}
+    {"type": "round_end", "round": 1, "time": ...}
+    {"type": "run_end", "status": "completed" | "stopped", "time": ...}
+    {"type": "run_resume", "results": N, "round": 3, "time": ...}
+
+断点续测时在同一日志末尾追加 run_resume 记录，读取时只保留其前面的 N 条结果
+（断点之后写入的结果对应的用例会被重新执行），续测后的结果接在后面。
+
+写入策略:
+    每条记录写入后立即 flush 到操作系统，fsync 按条数或时间间隔批量执行，
+    兼顾断电时的数据安全与高频短用例下的磁盘开销。
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+
+from config import Config
+from tools.log_tool import get_logger
+
+logger = get_logger("journal")
+
+# 累计多少条记录后执行一次 fsync
+FSYNC_EVERY = 20
+# 距上次 fsync 超过多少秒后执行一次 fsync
+FSYNC_INTERVAL = 2.0
+
+
+def _now():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def new_journal_path(project_name, suite_name, journal_dir=None):
+    """生成本次执行的日志文件路径"""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    journal_dir = journal_dir or Config.JOURNAL_DIR
+    os.makedirs(journal_dir, exist_ok=True)
+    base_name = f"执行日志_{project_name or '未知项目'}_{suite_name or '未知套件'}_{timestamp}"
+    # 同一秒内重新开始（如重启测试）时避免追加到上一次的日志中
+    path = os.path.join(journal_dir, f"{base_name}.jsonl")
+    index = 1
+    while os.path.exists(path):
+        path = os.path.join(journal_dir, f"{base_name}_{index}.jsonl")
+        index += 1
+    return path
+
+
+class ResultJournal:
+    """
+    追加写入的结果日志（线程安全）
+
+    Example:
+        journal = ResultJournal(path)
+        journal.start("demo_project", "基础功能测试", test_settings, ["用例A"], total_tests=3)
+        journal.append_result("用例A", "Pass", "ok", 1, duration=0.5)
+        journal.close("completed")
+    """
+
+    def __init__(self, path, fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._pending = 0  # 上次 fsync 后写入的记录数
+        self._last_sync = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def start(self, project_name, suite_name, test_settings, case_names, total_tests):
+        """写入执行开始记录"""
+        self._write(
+            {
+                "type": "run_start",
+                "project": project_name,
+                "suite": suite_name,
+                "settings": dict(test_settings),
+                "cases": list(case_names),
+                "total_tests": total_tests,
+                "time": _now(),
+            },
+            sync=True,
+        )
+
+    def append_result(self, case_name, result, message, round_num, duration=None):
+        """写入一条用例结果"""
+        self._write(
+            {
+                "type": "result",
+                "case": case_name,
+                "result": result,
+                "message": message,
+                "round": round_num,
+                "duration": None if duration is None else round(duration, 3),
+                "time": _now(),
+            }
+        )
+
+    def resume(self, results_count, round_num):
+        """写入续测记录，results_count 为断点记录的结果条数"""
+        self._write(
+            {"type": "run_resume", "results": results_count, "round": round_num, "time": _now()},
+            sync=True,
+        )
+
+    def mark_round(self, round_num):
+        """写入轮次完成记录"""
+        self._write({"type": "round_end", "round": round_num, "time": _now()}, sync=True)
+
+    def sync(self):
+        """将已写入的记录立即同步到磁盘（保存断点前调用，断点中的结果必须已在日志中）"""
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._pending = 0
+                self._last_sync = time.monotonic()
+            except OSError as e:
+                logger.error(f"同步结果日志失败: {e}")
+
+    def close(self, status="completed"):
+        """写入执行结束记录并关闭文件，重复调用无效果"""
+        self._write({"type": "run_end", "status": status, "time": _now()}, sync=True)
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _write(self, record, sync=False):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            if self._file.closed:
+                return
+            try:
+                self._file.write(line + "\n")
+                self._file.flush()
+                self._pending += 1
+                now = time.monotonic()
+                if (
+                    sync
+                    or self._pending >= self.fsync_every
+                    or now - self._last_sync >= self.fsync_interval
+                ):
+                    os.fsync(self._file.fileno())
+                    self._pending = 0
+                    self._last_sync = now
+            except OSError as e:
+                logger.error(f"写入结果日志失败: {e}")
+
+
+def _iter_records(path, types=None):
+    """
+    逐行读取日志记录，末尾因崩溃写了一半的行会被忽略
+
+    Args:
+        types: 只需要的记录类型，不含这些类型名的行不做 JSON 解析
+    """
+    markers = [f'"{record_type}"' for record_type in types] if types else None
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if markers is not None and not any(marker in line for marker in markers):
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning(f"结果日志第 {line_no} 行不完整，已忽略: {path}")
+                continue
+            if types is None or record.get("type") in types:
+                yield record
+
+
+def scan_journal(path):
+    """
+    扫描结果日志的执行开始与结束记录，不解析结果记录
+
+    Returns:
+        tuple: (run_start 记录或 None, run_end 记录或 None)
+    """
+    header = None
+    end = None
+    for record in _iter_records(path, ("run_start", "run_resume", "run_end")):
+        record_type = record["type"]
+        if record_type == "run_start":
+            if header is None:
+                header = record
+        elif record_type == "run_resume":
+            end = None
+        else:
+            end = record
+    return header, end
+
+
+def iter_journal_results(path):
+    """
+    按写入顺序逐条返回有效的 result 记录，内存占用与日志大小无关
+
+    续测记录（run_resume）会丢弃其前面超出断点条数的结果。流式读取时无法撤回已返回的记录，
+    因此先扫描一遍续测记录：第 k 条有效结果只有在之后每次续测的断点条数都大于 k 时才保留。
+    """
+    # 第一遍：各续测记录的断点条数，再求从每次续测往后的最小值
+    cuts = [int(record.get("results", 0)) for record in _iter_records(path, ("run_resume",))]
+    for i in range(len(cuts) - 2, -1, -1):
+        cuts[i] = min(cuts[i], cuts[i + 1])
+
+    # 第二遍：跟踪每条结果在有效列表中的位置，被之后的续测截断的结果跳过
+    length = 0
+    next_resume = 0
+    for record in _iter_records(path, ("result", "run_resume")):
+        if record["type"] == "run_resume":
+            length = min(length, int(record.get("results", length)))
+            next_resume += 1
+        else:
+            cut = cuts[next_resume] if next_resume < len(cuts) else None
+            if cut is None or length < cut:
+                yield record
+            length += 1
+
+
+def read_journal(path):
+    """
+    读取结果日志（全部结果读入内存，大日志请使用 iter_journal_results）
+
+    末尾因崩溃写了一半的行会被忽略。
+
+    Returns:
+        tuple: (run_start 记录或 None, [result 记录, ...], run_end 记录或 None)
+    """
+    header, end = scan_journal(path)
+    return header, list(iter_journal_results(path)), end
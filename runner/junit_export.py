@@ -0,0 +1,258 @@
+"""
+JUnit XML 导出
+
+执行过程中把每个用例结果追加到 JUnit XML 文件，供 CI 系统直接读取：
+- 每写入一个 testcase 都同时写出结尾的 </testsuite></testsuites>，下一条结果从结尾标签处覆盖写入，
+  执行中途被强制结束时文件仍是完整的 XML
+- testsuite 上的统计属性（tests/failures/errors/time）预留固定宽度，每条结果后原地更新
+- 多轮执行时每轮结果是一个 testcase，名称带轮次后缀（如 "用例A[第2轮]"），轮次同时写入 testcase 的 properties
+- Fail 写为 <failure>、Error 写为 <error>，完整信息写入元素内容，Pass 的信息写入 <system-out>
+
+JUnit 文件与结果日志一一对应（test_reports/junit/JUnit_<项目>_<套件>_<时间>.xml），
+续测时按结果日志中的有效结果重建后继续追加，也可随时从结果日志重新生成。
+"""
+
+import datetime
+import os
+import platform
+import re
+import threading
+from xml.sax.saxutils import escape, quoteattr
+
+from config import Config
+from tools.log_tool import get_logger
+from .journal import iter_journal_results, scan_journal
+
+logger = get_logger("junit_export")
+
+# testsuite 统计属性预留的宽度，更新时用空格补齐（标签内的空白不影响 XML 解析）
+COUNTS_WIDTH = 96
+CLOSING_TAGS = b"  </testsuite>\n</testsuites>\n"
+# 从结果日志重建时每批写入的 testcase 数
+REPLAY_BATCH = 1000
+# XML 1.0 不允许的字符（用例信息中可能含有设备返回的控制字符）
+_INVALID_XML_CHARS = re.compile("[^\u0009\u000a\u000d\u0020-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+
+def _clean(text):
+    return _INVALID_XML_CHARS.sub("\ufffd", str(text if text is not None else ""))
+
+
+def _attr(value):
+    return quoteattr(_clean(value))
+
+
+def _iso_time(value=None):
+    """journal 的 "YYYY-MM-DD HH:MM:SS" 时间转为 ISO 8601，缺省为当前时间"""
+    if value:
+        return str(value).replace(" ", "T")
+    return datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def junit_path_for_journal(journal_path, junit_dir=None):
+    """结果日志对应的 JUnit 文件路径"""
+    base_name = os.path.splitext(os.path.basename(journal_path))[0]
+    if base_name.startswith("执行日志_"):
+        base_name = "JUnit_" + base_name[len("执行日志_"):]
+    return os.path.join(junit_dir or Config.JUNIT_DIR, f"{base_name}.xml")
+
+
+class JUnitXmlWriter:
+    """
+    流式 JUnit XML 写入器（线程安全）
+
+    Args:
+        path: 输出文件路径（已存在时覆盖）
+        project_name / suite_name: 项目与测试套件名，testcase 的 classname 为 "<项目>.<套件>"
+        test_settings: 测试设置，写入 testsuite 的 properties；rounds 大于 1 时用例名带轮次后缀
+
+    Example:
+        writer = JUnitXmlWriter("junit.xml", "demo_project", "基础功能测试", {"rounds": 3})
+        writer.add_result("用例A", "Fail", "转速超限: 3100 > 3000", 1, 0.52)
+        writer.close()
+    """
+
+    def __init__(self, path, project_name, suite_name, test_settings=None):
+        self.path = path
+        self.project_name = project_name
+        self.suite_name = suite_name
+        self.test_settings = dict(test_settings or {})
+        self.multi_round = int(self.test_settings.get("rounds", 1) or 1) > 1
+        self.classname = f"{project_name}.{suite_name}"
+        self.tests = 0
+        self.failures = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "wb")
+        self._write_header()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def _write_header(self):
+        head = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f"<testsuites name={_attr(self.project_name)}>\n"
+            f"  <testsuite name={_attr(self.suite_name)} timestamp={_attr(_iso_time())} "
+            f"hostname={_attr(platform.node())} "
+        ).encode("utf-8")
+        self._counts_offset = len(head)
+        properties = "".join(
+            f"      <property name={_attr(key)} value={_attr(value)}/>\n"
+            for key, value in self.test_settings.items()
+        )
+        body = f">\n    <properties>\n{properties}    </properties>\n".encode("utf-8")
+        self._file.write(head + self._counts() + body + CLOSING_TAGS)
+        self._body_end = len(head) + COUNTS_WIDTH + len(body)
+        self._file.flush()
+
+    def _counts(self):
+        counts = (
+            f'tests="{self.tests}" failures="{self.failures}" errors="{self.errors}" '
+            f'skipped="0" time="{self.total_time:.3f}"'
+        )
+        return counts.ljust(COUNTS_WIDTH).encode("utf-8")
+
+    def add_result(self, case_name, outcome, message, round_num, duration=None, timestamp=None):
+        """
+        追加一个 testcase，返回时文件已是完整的 XML
+
+        Args:
+            outcome: 执行结果 Pass / Fail / Error
+            timestamp: 结果时间（结果日志中的时间字符串），缺省为当前时间
+        """
+        self._append([self._testcase(case_name, outcome, message, round_num, duration, timestamp)])
+
+    def add_records(self, records):
+        """批量添加结果日志中的 result 记录（从结果日志重建时使用，每批只写一次文件）"""
+        batch = []
+        for record in records:
+            batch.append(
+                self._testcase(
+                    record.get("case", ""),
+                    record.get("result", ""),
+                    record.get("message", ""),
+                    record.get("round", 1),
+                    record.get("duration"),
+                    record.get("time"),
+                )
+            )
+            if len(batch) >= REPLAY_BATCH:
+                self._append(batch)
+                batch = []
+        if batch:
+            self._append(batch)
+
+    def _testcase(self, case_name, outcome, message, round_num, duration, timestamp):
+        """生成 testcase 元素，返回 (XML 字节, 执行结果, 耗时)"""
+        duration = max(0.0, float(duration or 0.0))
+        name = f"{case_name}[第{round_num}轮]" if self.multi_round else str(case_name)
+        message = _clean(message)
+        lines = [
+            f"    <testcase name={_attr(name)} classname={_attr(self.classname)} "
+            f'time="{duration:.3f}" timestamp={_attr(_iso_time(timestamp))}>',
+            f'      <properties><property name="round" value={_attr(round_num)}/></properties>',
+        ]
+        if outcome == "Pass":
+            if message:
+                lines.append(f"      <system-out>{escape(message)}</system-out>")
+        else:
+            tag = "failure" if outcome == "Fail" else "error"
+            summary = message.splitlines()[0] if message else str(outcome)
+            lines.append(
+                f"      <{tag} message={_attr(summary)} type={_attr(outcome)}>"
+                f"{escape(message)}</{tag}>"
+            )
+        lines.append("    </testcase>\n")
+        return "\n".join(lines).encode("utf-8"), outcome, duration
+
+    def _append(self, testcases):
+        with self._lock:
+            if self._file.closed:
+                return
+            for _, outcome, duration in testcases:
+                self.tests += 1
+                if outcome == "Fail":
+                    self.failures += 1
+                elif outcome != "Pass":
+                    self.errors += 1
+                self.total_time += duration
+            data = b"".join(xml for xml, _, _ in testcases)
+            try:
+                # 覆盖上次写出的结尾标签，再写出新的结尾标签
+                self._file.seek(self._body_end)
+                self._file.write(data + CLOSING_TAGS)
+                self._body_end += len(data)
+                self._file.seek(self._counts_offset)
+                self._file.write(self._counts())
+                self._file.flush()
+            except OSError as e:
+                logger.error(f"写入 JUnit 结果失败: {e}")
+
+    def close(self):
+        """关闭文件，重复调用无效果"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def open_junit_writer(journal_path, path=None):
+    """
+    创建与结果日志对应的 JUnit 写入器，并写入日志中已有的结果（续测时）
+
+    Args:
+        path: 输出路径，默认 junit_path_for_journal(journal_path)
+
+    Raises:
+        ValueError: 日志中没有执行开始记录
+        OSError: 文件无法读写
+    """
+    header, _ = scan_journal(journal_path)
+    if header is None:
+        raise ValueError(f"结果日志缺少执行开始记录: {journal_path}")
+    writer = JUnitXmlWriter(
+        path or junit_path_for_journal(journal_path),
+        header.get("project", ""),
+        header.get("suite", ""),
+        header.get("settings"),
+    )
+    try:
+        writer.add_records(iter_journal_results(journal_path))
+    except BaseException:
+        writer.close()
+        raise
+    return writer
+
+
+def write_junit_from_journal(journal_path, path=None):
+    """
+    从结果日志生成 JUnit XML 文件
+
+    Returns:
+        str: JUnit 文件路径
+
+    Raises:
+        ValueError: 日志中没有执行开始记录
+        OSError: 文件无法读写
+    """
+    writer = open_junit_writer(journal_path, path)
+    writer.close()
+    return writer.path
+
+
+def start_junit_export(journal_path, path=None):
+    """
+    按 Config.JUNIT_EXPORT 为本次执行创建 JUnit 写入器
+
+    未启用或创建失败时返回 None（不影响测试执行）
+    """
+    if not Config.JUNIT_EXPORT and path is None:
+        return None
+    try:
+        return open_junit_writer(journal_path, path)
+    except (OSError, ValueError) as e:
+        logger.error(f"创建 JUnit 结果文件失败: {e}")
+        return None
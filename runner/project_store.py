@@ -0,0 +1,78 @@
+"""
+按项目保存的本地 JSON 文件
+
+用例耗时历史、保存的用例选择等数据按项目存放在相同结构的 JSON 文件中：
+{
+  "version": <格式版本>,
+  "projects": {
+    "<项目名>": {...}
+  }
+}
+
+ProjectJsonFile 负责读取与写回。写回时重新读取文件，只修改指定项目的数据，
+避免覆盖其他项目或其他进程同时写入的记录；先写临时文件再替换，写入中断时不会留下损坏的文件。
+"""
+
+import json
+import os
+from typing import Callable
+
+from tools.log_tool import get_logger
+
+logger = get_logger("project_store")
+
+
+class ProjectJsonFile:
+    """
+    按项目分区的 JSON 文件
+
+    Args:
+        path: 文件路径
+        version: 写回时记录的格式版本
+        description: 文件用途，用于日志，如 "用例耗时历史"
+
+    Example:
+        store = ProjectJsonFile(Config.CASE_SELECTION_FILE, 1, "用例选择")
+        selections = store.load_project("chery_lin")
+        store.update_project("chery_lin", lambda data: data.update({"冒烟": ["用例A"]}))
+    """
+
+    def __init__(self, path: str, version: int, description: str):
+        self.path = path
+        self.version = version
+        self.description = description
+
+    def read(self) -> dict:
+        """读取整个文件，文件不存在或损坏时返回空结构"""
+        if not os.path.exists(self.path):
+            return {"version": self.version, "projects": {}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or not isinstance(data.get("projects"), dict):
+                raise ValueError("格式错误")
+            return data
+        except (OSError, ValueError) as e:
+            logger.warning(f"{self.description}文件无法读取，将重新记录: {self.path} ({e})")
+            return {"version": self.version, "projects": {}}
+
+    def load_project(self, project: str) -> dict:
+        """读取指定项目的数据，没有记录时返回空字典"""
+        return dict(self.read()["projects"].get(project, {}) or {})
+
+    def update_project(self, project: str, update: Callable[[dict], None]) -> None:
+        """
+        重新读取文件，调用 update 原地修改指定项目的数据后写回
+
+        Raises:
+            OSError: 文件无法写入
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = self.read()
+        data["version"] = self.version
+        update(data["projects"].setdefault(project, {}))
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,378 @@
+"""
+测试结果统计与 JSON 报告
+
+提供与界面无关的结果统计（字段与 TestCaseModel.test_case_data 一致）与报告生成，
+GUI 与命令行执行器生成的报告结构相同。报告由执行过程中写入的结果日志重放生成，
+执行中途崩溃后也可以从日志补出报告。
+
+报告中除用例汇总外还包含逐轮的用例结果（完整信息与耗时）。生成时逐条读取日志、
+逐轮写入磁盘，内存占用只与用例数有关，与轮数无关。
+"""
+
+import datetime
+import json
+import os
+import threading
+
+from config import Config
+from .engine import DEFAULT_TEST_SETTINGS
+from .journal import iter_journal_results, scan_journal
+
+# 拼接逐轮结果时每次复制的字符数
+REPORT_COPY_CHUNK = 1024 * 1024
+
+# 最后结果显示文本，与用例表格一致
+RESULT_DISPLAY = {
+    "Pass": "✓ Pass",
+    "Fail": "✗ Fail",
+    "Error": "⚠ Error",
+}
+
+
+def new_case_data():
+    """单个用例的初始统计数据"""
+    return {
+        "test_count": 0,
+        "fail_count": 0,
+        "result": "",
+        "message": "",
+        "progress": 0,
+        "status": "待测试",
+    }
+
+
+def case_data_to_report_rows(case_data):
+    """
+    将用例统计数据转换为报告中的用例详情列表
+
+    Args:
+        case_data: {用例名: 统计数据}，字段见 new_case_data()
+    """
+    return [
+        {
+            "用例名称": case_name,
+            "状态": data["status"],
+            "进度": f"{data['progress']}%",
+            "执行次数": str(data["test_count"]),
+            "失败次数": str(data["fail_count"]),
+            "最后结果": RESULT_DISPLAY.get(data["result"], "-"),
+            "详细信息": data["message"] or "-",
+        }
+        for case_name, data in case_data.items()
+    ]
+
+
+class CaseResultTracker:
+    """
+    用例结果统计（线程安全）
+
+    Example:
+        tracker = CaseResultTracker(["用例A", "用例B"], total_rounds=3)
+        tracker.update("用例A", "Pass", "ok", 1)
+        rows = tracker.to_report_rows()
+    """
+
+    def __init__(self, case_names, total_rounds=1):
+        self.total_rounds = max(1, total_rounds)
+        self.case_data = {name: new_case_data() for name in case_names}
+        self.passed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def update(self, case_name, result, message, round_num):
+        """记录一次用例执行结果"""
+        with self._lock:
+            data = self.case_data.setdefault(case_name, new_case_data())
+            data["test_count"] += 1
+            if result != "Pass":
+                data["fail_count"] += 1
+                self.failed += 1
+            else:
+                self.passed += 1
+            data["result"] = result
+            data["message"] = message
+            data["progress"] = int((round_num / self.total_rounds) * 100)
+            data["status"] = "执行中" if data["progress"] < 100 else "已完成"
+
+    @property
+    def completed(self):
+        """已完成的执行次数"""
+        return self.passed + self.failed
+
+    def to_state(self):
+        """导出统计状态（用于保存断点）"""
+        with self._lock:
+            return {
+                "passed": self.passed,
+                "failed": self.failed,
+                "case_data": {name: dict(data) for name, data in self.case_data.items()},
+            }
+
+    def load_state(self, state):
+        """恢复 to_state() 导出的统计状态（用于断点续测）"""
+        with self._lock:
+            self.passed = int(state.get("passed", 0))
+            self.failed = int(state.get("failed", 0))
+            for name, data in (state.get("case_data") or {}).items():
+                case_data = new_case_data()
+                case_data.update(data)
+                self.case_data[name] = case_data
+
+    def to_report_rows(self):
+        """生成报告中的用例详情列表"""
+        with self._lock:
+            return case_data_to_report_rows(self.case_data)
+
+
+def build_report_data(
+    project_name, suite_name, test_settings, total_tests, passed_tests, failed_tests, test_cases
+):
+    """
+    组装测试报告数据
+
+    Args:
+        project_name: 项目名称
+        suite_name: 测试套件名称
+        test_settings: 测试设置
+        total_tests: 计划执行总数
+        passed_tests: 成功数
+        failed_tests: 失败数
+        test_cases: 用例详情列表
+
+    Returns:
+        dict: 报告数据
+    """
+    # 计算成功率
+    pass_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
+
+    return {
+        "报告信息": {
+            "生成时间": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "项目名称": project_name,
+            "测试套件": suite_name,
+            "测试轮次": test_settings["rounds"],
+        },
+        "测试统计": {
+            "总测试数": total_tests,
+            "成功数": passed_tests,
+            "失败数": failed_tests,
+            "成功率": f"{pass_rate:.2f}%",
+        },
+        "测试设置": {
+            "测试轮数": test_settings["rounds"],
+            "失败时停止": test_settings["stop_on_fail"],
+            "轮次间延时": f"{test_settings['delay']}秒",
+            "并行执行": test_settings.get("parallel", False),
+            "最大并发数": test_settings.get("max_workers", 4),
+        },
+        "测试用例详情": test_cases,
+    }
+
+
+class ReportBuilder:
+    """
+    由结果记录生成报告（逐条累计，不保留结果列表）
+
+    传入 round_file 时，每轮结束后将该轮的用例结果作为一行 JSON 写入 round_file，
+    各行之间以逗号分隔，可直接拼接为报告中的"轮次结果"数组。
+
+    Example:
+        builder = ReportBuilder("demo_project", "基础功能测试", settings, ["用例A"], total_tests=3)
+        builder.add_result("用例A", "Pass", "ok", 1, duration=0.5)
+        builder.finish()
+        report_data = builder.build()
+    """
+
+    def __init__(
+        self, project_name, suite_name, test_settings, case_names, total_tests, round_file=None
+    ):
+        self.project_name = project_name
+        self.suite_name = suite_name
+        self.test_settings = test_settings
+        self.total_tests = total_tests  # None 时按实际执行次数计算
+        self.tracker = CaseResultTracker(case_names, test_settings["rounds"])
+        self.durations = {}  # 用例名 -> [总耗时, 最长耗时, 有耗时记录的次数]
+        self.round_file = round_file
+        self.rounds_written = 0
+        self._round = None  # 当前轮次的汇总，轮次变化时写出
+
+    def add_result(self, case_name, result, message, round_num, duration=None, time=None):
+        """累计一条用例结果"""
+        self.tracker.update(case_name, result, message, round_num)
+        if duration is not None:
+            stats = self.durations.setdefault(case_name, [0.0, 0.0, 0])
+            stats[0] += duration
+            stats[1] = max(stats[1], duration)
+            stats[2] += 1
+
+        if self.round_file is None:
+            return
+        if self._round is None or self._round["轮次"] != round_num:
+            self._write_round()
+            self._round = {"轮次": round_num, "成功数": 0, "失败数": 0, "耗时(秒)": 0.0, "用例结果": []}
+        current = self._round
+        current["成功数" if result == "Pass" else "失败数"] += 1
+        if duration is not None:
+            current["耗时(秒)"] += duration
+        current["用例结果"].append(
+            {
+                "用例名称": case_name,
+                "结果": result,
+                "详细信息": message,
+                "耗时(秒)": duration,
+                "时间": time,
+            }
+        )
+
+    def add_record(self, record):
+        """累计一条结果日志中的 result 记录"""
+        self.add_result(
+            record["case"],
+            record["result"],
+            record["message"],
+            record["round"],
+            record.get("duration"),
+            record.get("time"),
+        )
+
+    def finish(self):
+        """写出最后一轮"""
+        self._write_round()
+
+    def _write_round(self):
+        if self._round is None:
+            return
+        self._round["耗时(秒)"] = round(self._round["耗时(秒)"], 3)
+        prefix = ",\n    " if self.rounds_written else "\n    "
+        self.round_file.write(prefix + json.dumps(self._round, ensure_ascii=False))
+        self.rounds_written += 1
+        self._round = None
+
+    def report_rows(self):
+        """用例详情列表，附带耗时统计"""
+        rows = self.tracker.to_report_rows()
+        for row in rows:
+            total, longest, count = self.durations.get(row["用例名称"], (0.0, 0.0, 0))
+            row["总耗时(秒)"] = round(total, 3) if count else None
+            row["平均耗时(秒)"] = round(total / count, 3) if count else None
+            row["最长耗时(秒)"] = round(longest, 3) if count else None
+        return rows
+
+    def build(self):
+        """报告数据（不含逐轮结果）"""
+        total_tests = self.tracker.completed if self.total_tests is None else self.total_tests
+        return build_report_data(
+            self.project_name,
+            self.suite_name,
+            self.test_settings,
+            total_tests,
+            self.tracker.passed,
+            self.tracker.failed,
+            self.report_rows(),
+        )
+
+    @classmethod
+    def from_journal_header(cls, header, round_file=None):
+        test_settings = dict(DEFAULT_TEST_SETTINGS)
+        test_settings.update(header.get("settings") or {})
+        return cls(
+            header.get("project", ""),
+            header.get("suite", ""),
+            test_settings,
+            header.get("cases") or [],
+            header.get("total_tests"),
+            round_file,
+        )
+
+
+def _read_journal_header(journal_path):
+    header, _ = scan_journal(journal_path)
+    if header is None:
+        raise ValueError(f"结果日志缺少执行开始记录: {journal_path}")
+    return header
+
+
+def build_report_from_journal(journal_path):
+    """
+    重放结果日志生成报告数据（不含逐轮结果）
+
+    Raises:
+        ValueError: 日志中没有执行开始记录
+    """
+    builder = ReportBuilder.from_journal_header(_read_journal_header(journal_path))
+    for record in iter_journal_results(journal_path):
+        builder.add_record(record)
+    return builder.build()
+
+
+def write_report_from_journal(journal_path, report_dir=None):
+    """
+    重放结果日志，流式生成并保存包含逐轮结果的 JSON 报告
+
+    逐轮结果先写入临时文件，汇总完成后与报告头部拼接，报告文件最后一步才替换到位，
+    中途出错不会留下不完整的报告。
+
+    Returns:
+        tuple: (报告文件路径, 报告数据（不含逐轮结果）)
+
+    Raises:
+        ValueError: 日志中没有执行开始记录
+    """
+    header = _read_journal_header(journal_path)
+    report_path = new_report_path(header.get("project"), header.get("suite"), report_dir)
+    rounds_path = f"{report_path}.rounds.tmp"
+    tmp_path = f"{report_path}.tmp"
+    try:
+        with open(rounds_path, "w", encoding="utf-8") as round_file:
+            builder = ReportBuilder.from_journal_header(header, round_file)
+            for record in iter_journal_results(journal_path):
+                builder.add_record(record)
+            builder.finish()
+
+        # 报告头部与 save_report 的格式相同，在末尾的 "}" 之前接上逐轮结果数组
+        report_data = builder.build()
+        # 记录来源日志，导入历史数据库时据此识别已导入的执行
+        report_data["报告信息"]["结果日志"] = os.path.abspath(journal_path)
+        head = json.dumps(report_data, ensure_ascii=False, indent=2)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(head[: head.rindex("}")].rstrip())
+            f.write(',\n  "轮次结果": [')
+            with open(rounds_path, "r", encoding="utf-8") as round_file:
+                while True:
+                    chunk = round_file.read(REPORT_COPY_CHUNK)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+            f.write("\n  ]\n}\n" if builder.rounds_written else "]\n}\n")
+        os.replace(tmp_path, report_path)
+    finally:
+        for path in (rounds_path, tmp_path):
+            if os.path.exists(path):
+                os.remove(path)
+    return report_path, report_data
+
+
+def new_report_path(project_name, suite_name, report_dir=None):
+    """生成报告文件路径（同时创建报告目录）"""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    project_name = project_name or "未知项目"
+    suite_name = suite_name or "未知套件"
+    report_filename = f"测试报告_{project_name}_{suite_name}_{timestamp}.json"
+
+    # 确保报告目录存在
+    report_dir = report_dir or Config.TEST_REPORT_DIR
+    os.makedirs(report_dir, exist_ok=True)
+    return os.path.join(report_dir, report_filename)
+
+
+def save_report(report_data, project_name, suite_name, report_dir=None):
+    """
+    保存 JSON 测试报告
+
+    Returns:
+        str: 报告文件路径
+    """
+    report_path = new_report_path(project_name, suite_name, report_dir)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report_data, f, ensure_ascii=False, indent=2)
+    return report_path
@@ -0,0 +1,43 @@
+"""
+用例结果缓冲区
+
+执行线程只负责把结果追加到缓冲区（不等待界面），界面按固定间隔一次性取走全部结果批量刷新，
+避免高频短用例产生的逐条信号压垮 UI 线程。
+"""
+
+import threading
+from collections import deque
+
+
+class ResultBuffer:
+    """
+    线程安全的结果缓冲区
+
+    Example:
+        buffer = ResultBuffer()
+        buffer.put(("用例A", "Pass", "ok", 1))   # 执行线程
+        for item in buffer.drain():             # 界面定时器
+            ...
+    """
+
+    def __init__(self):
+        self._items = deque()
+        self._lock = threading.Lock()
+
+    def put(self, item) -> None:
+        """追加一条结果"""
+        with self._lock:
+            self._items.append(item)
+
+    def drain(self) -> list:
+        """取走当前全部结果（按写入顺序）"""
+        with self._lock:
+            if not self._items:
+                return []
+            items = list(self._items)
+            self._items.clear()
+        return items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
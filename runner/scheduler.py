@@ -0,0 +1,129 @@
+"""
+并行用例调度器
+
+提供功能：
+1. 资源锁管理：用例声明所需资源（CAN/LIN 通道、ADB 序列号等），占用相同资源的用例互斥执行
+2. 并行调度：在工作线程池上并发执行资源互不冲突的用例
+3. 资源整体获取：一个用例的全部资源一次性获取，避免多资源交叉等待造成死锁
+
+资源命名约定:
+    "lin:<设备索引>:<通道>"   例如 "lin:0:0"
+    "can:<设备索引>:<通道>"   例如 "can:0:1"
+    "adb:<序列号>"            例如 "adb:emulator-5554"
+    "*"                       独占资源，执行期间不与任何其他用例并发
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Tuple, Any
+
+# 独占资源标识
+EXCLUSIVE_RESOURCE = "*"
+
+
+class ResourceLockManager:
+    """
+    资源占用表
+
+    只记录当前被占用的资源集合，不自带锁，由调用方（CaseScheduler）持有条件变量后调用。
+    """
+
+    def __init__(self):
+        self._busy = set()
+
+    def is_free(self, resources: Iterable[str]) -> bool:
+        """判断一组资源是否全部空闲"""
+        resources = set(resources)
+        if EXCLUSIVE_RESOURCE in self._busy:
+            return False
+        if EXCLUSIVE_RESOURCE in resources:
+            return not self._busy
+        return self._busy.isdisjoint(resources)
+
+    def acquire(self, resources: Iterable[str]) -> None:
+        """占用一组资源（调用前需先确认 is_free）"""
+        self._busy.update(resources)
+
+    def release(self, resources: Iterable[str]) -> None:
+        """释放一组资源"""
+        self._busy.difference_update(resources)
+
+    @property
+    def busy(self) -> set:
+        """当前被占用的资源"""
+        return set(self._busy)
+
+
+class CaseScheduler:
+    """
+    并行用例调度器
+
+    按给定顺序派发任务：每当有空闲工作线程时，选取队列中第一个资源空闲的任务执行，
+    被资源阻塞的任务不会挡住排在其后、资源不冲突的任务。
+
+    Example:
+        scheduler = CaseScheduler(max_workers=4)
+        jobs = [(("case_a", details_a), ("lin:0:0",)), (("case_b", details_b), ())]
+        scheduler.run_batch(jobs, execute=lambda job: run_case(*job))
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, int(max_workers))
+        self._locks = ResourceLockManager()
+        self._cond = threading.Condition()
+        self._running = 0
+
+    def run_batch(
+        self,
+        jobs: List[Tuple[Any, Tuple[str, ...]]],
+        execute: Callable[[Any], None],
+        should_continue: Callable[[], bool] = lambda: True,
+    ) -> None:
+        """
+        并发执行一批任务，全部结束后返回
+
+        Args:
+            jobs: [(任务, 所需资源元组), ...]，按优先顺序排列
+            execute: 在工作线程中执行单个任务的回调，异常需由回调自行处理
+            should_continue: 返回 False 时停止派发新任务（已在执行的任务会等待完成）
+        """
+        pending = list(jobs)
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="case_worker"
+        ) as pool:
+            with self._cond:
+                while pending and should_continue():
+                    index = self._next_runnable(pending)
+                    if index is None:
+                        # 没有空闲线程或资源全部冲突，等待任意任务结束
+                        self._cond.wait(timeout=0.5)
+                        continue
+
+                    job, resources = pending.pop(index)
+                    self._locks.acquire(resources)
+                    self._running += 1
+                    pool.submit(self._run_job, execute, job, resources)
+
+                # 等待已派发的任务全部结束
+                while self._running > 0:
+                    self._cond.wait(timeout=0.5)
+
+    def _next_runnable(self, pending) -> Any:
+        """返回队列中第一个可立即执行的任务下标，没有则返回 None"""
+        if self._running >= self.max_workers:
+            return None
+        for index, (_, resources) in enumerate(pending):
+            if self._locks.is_free(resources):
+                return index
+        return None
+
+    def _run_job(self, execute, job, resources) -> None:
+        """工作线程入口：执行任务并归还资源"""
+        try:
+            execute(job)
+        finally:
+            with self._cond:
+                self._locks.release(resources)
+                self._running -= 1
+                self._cond.notify_all()
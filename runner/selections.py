@@ -0,0 +1,87 @@
+"""
+保存的用例选择
+
+按项目保存具名的用例选择（用例名列表），重新加载测试套件后可一键恢复勾选。
+保存的是用例名而非行号，套件中用例增删或顺序变化后仍然有效，不存在的用例在应用时被忽略。
+
+文件格式:
+{
+  "version": 1,
+  "projects": {
+    "<项目名>": {
+      "<选择名称>": ["用例A", "用例B"]
+    }
+  }
+}
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from tools.log_tool import get_logger
+from .project_store import ProjectJsonFile
+
+logger = get_logger("selections")
+
+SELECTIONS_VERSION = 1
+
+
+class SelectionStore:
+    """
+    单个项目的具名用例选择（线程安全）
+
+    Example:
+        store = SelectionStore("chery_lin")
+        store.save_selection("冒烟", ["用例A", "用例B"])
+        store.names()                 # ["冒烟"]
+        store.get("冒烟")             # ["用例A", "用例B"]
+        store.delete("冒烟")
+    """
+
+    def __init__(self, project: str, path: Optional[str] = None):
+        self.project = project
+        self.path = path or Config.CASE_SELECTION_FILE
+        self._lock = threading.Lock()
+        self._file = ProjectJsonFile(self.path, SELECTIONS_VERSION, "用例选择")
+        self._selections: Dict[str, List[str]] = self._file.load_project(project)
+
+    def names(self) -> List[str]:
+        """已保存的选择名称（按名称排序）"""
+        with self._lock:
+            return sorted(self._selections)
+
+    def get(self, name: str) -> Optional[List[str]]:
+        """选择中的用例名，不存在时返回 None"""
+        with self._lock:
+            cases = self._selections.get(name)
+        return list(cases) if cases is not None else None
+
+    def save_selection(self, name: str, case_names: Iterable[str]) -> None:
+        """保存（或覆盖）一个选择并写盘"""
+        cases = list(case_names)
+        with self._lock:
+            self._selections[name] = cases
+        self._write(name, cases)
+
+    def delete(self, name: str) -> bool:
+        """删除一个选择并写盘，返回是否存在"""
+        with self._lock:
+            if self._selections.pop(name, None) is None:
+                return False
+        self._write(name, None)
+        return True
+
+    def _write(self, name, cases) -> None:
+        """只修改指定的选择写回文件（见 ProjectJsonFile.update_project）"""
+
+        def update(project_selections):
+            if cases is None:
+                project_selections.pop(name, None)
+            else:
+                project_selections[name] = cases
+
+        try:
+            self._file.update_project(self.project, update)
+        except OSError as e:
+            logger.error(f"保存用例选择失败: {e}")
@@ -0,0 +1,132 @@
+"""
+项目与测试套件配置加载
+
+GUI 与命令行执行器共用的配置读取逻辑：
+- user_config/project_config/project_cfg.yaml       项目列表
+- user_config/project_config/project_list/*.yaml    项目下的测试套件列表
+- user_config/test_suite/<项目名>/<套件名>.yaml      测试套件中的用例
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from tools.load_yaml import load_yaml_config
+
+
+def get_project_config_path() -> str:
+    """项目配置文件路径"""
+    return os.path.join(Config.PROJECT_CONFIG_DIR, "project_cfg.yaml")
+
+
+def load_project_config() -> dict:
+    """
+    加载项目配置
+
+    Raises:
+        FileNotFoundError: 项目配置文件不存在
+    """
+    config_path = get_project_config_path()
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"项目配置文件不存在: {config_path}")
+    return load_yaml_config(config_path) or {}
+
+
+def get_project_list_path(project_cfg: dict) -> str:
+    """项目的测试套件列表文件路径，未配置 path 时返回空字符串"""
+    project_config_file = project_cfg.get("path", "")
+    if not project_config_file:
+        return ""
+    return os.path.join(Config.PROJECT_CONFIG_DIR, "project_list", project_config_file)
+
+
+def load_project_suites(project_cfg: dict) -> List[str]:
+    """
+    读取项目的测试套件名称列表，未配置 path 的项目返回空列表
+
+    Raises:
+        FileNotFoundError: 测试套件列表文件不存在
+    """
+    project_list_path = get_project_list_path(project_cfg)
+    if not project_list_path:
+        return []
+    if not os.path.exists(project_list_path):
+        raise FileNotFoundError(f"配置文件不存在: {project_list_path}")
+    return list((load_yaml_config(project_list_path) or {}).keys())
+
+
+def find_suite_file(project_name: str, suite_name: str) -> Optional[str]:
+    """查找测试套件文件，优先 .yaml，其次 .yml，均不存在时返回 None"""
+    for ext in (".yaml", ".yml"):
+        suite_file_path = os.path.join(
+            Config.TEST_SUITE_DIR, project_name, f"{suite_name}{ext}"
+        )
+        if os.path.exists(suite_file_path):
+            return suite_file_path
+    return None
+
+
+def parse_test_cases(suite_config: dict) -> Tuple[Dict[str, list], List[tuple]]:
+    """
+    解析测试套件配置文件中的测试用例
+
+    格式要求（数组格式）:
+    测试用例名: ["项目名", "模块文件", "类名", 测试数据...]
+
+    Args:
+        suite_config: 测试套件 YAML 内容
+
+    Returns:
+        tuple: ({用例名: 用例配置}, [(用例名, 格式错误的配置), ...])
+    """
+    test_cases = {}
+    invalid_cases = []
+
+    # 结构: root -> process0 -> 测试用例名 -> 数组配置
+    root = (suite_config or {}).get("root", {}) or {}
+    process0 = root.get("process0", {}) or {}
+
+    for case_name, case_config in process0.items():
+        if isinstance(case_config, list) and len(case_config) >= 3:
+            # 数组格式: ["项目文件夹", "文件路径", "类名", ...]
+            test_cases[case_name] = case_config
+        else:
+            invalid_cases.append((case_name, case_config))
+
+    return test_cases, invalid_cases
+
+
+def parse_case_options(suite_config: dict, case_names) -> Dict[str, dict]:
+    """
+    解析用例执行选项（超时、日志级别等）
+
+    套件级默认值写在 root.settings，单个用例的覆盖写在 root.case_options:
+
+    root:
+      settings:
+        timeout: 600          # 套件内用例默认超时（秒），0 表示不限制
+        log_level: INFO       # 套件内用例默认日志级别（可选）
+      case_options:
+        奇瑞水泵LIN转速递增测试:
+          timeout: 30
+          log_level: WARNING  # 长时间循环发送时只记录警告与错误
+      process0:
+        ...
+
+    Returns:
+        dict: {用例名: {"timeout": 超时秒数, "log_level": 日志级别或 None}}
+    """
+    root = (suite_config or {}).get("root", {}) or {}
+    settings = root.get("settings", {}) or {}
+    case_options = root.get("case_options", {}) or {}
+    default_timeout = settings.get("timeout", Config.DEFAULT_CASE_TIMEOUT)
+    default_log_level = settings.get("log_level")
+
+    options = {}
+    for case_name in case_names:
+        case_option = case_options.get(case_name, {}) or {}
+        options[case_name] = {
+            "timeout": case_option.get("timeout", default_timeout),
+            "log_level": case_option.get("log_level", default_log_level),
+        }
+    return options
@@ -0,0 +1,241 @@
+"""
+测试套件清单（Manifest）
+
+测试套件 YAML 首次加载时编译为清单：已校验的用例列表（名称、目标模块/类、测试数据）、
+格式错误的用例与执行选项，并以 JSON 保存在 cache/suite_manifest/<项目>/<套件>.json。
+清单记录源文件的修改时间与大小，源文件未变化时直接使用清单，不再解析 YAML；
+源文件变化后自动重新编译。
+
+最近使用的清单同时保存在内存 LRU 中，在几个套件之间来回切换时无需任何磁盘读取。
+
+清单对象在多处共享，调用方不应修改其中的数据。
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from config import Config
+from tools.load_yaml import load_yaml_config
+from tools.log_tool import get_logger
+from .suite_loader import find_suite_file, parse_case_options, parse_test_cases
+
+logger = get_logger("suite_manifest")
+
+MANIFEST_VERSION = 1
+# 内存中保留的最近使用清单数
+LRU_CAPACITY = 16
+
+
+class SuiteManifest:
+    """
+    编译后的测试套件
+
+    Attributes:
+        project_name / suite_name: 项目与套件名
+        source_path: 套件 YAML 路径
+        source_mtime_ns / source_size: 编译时源文件的修改时间与大小
+        test_cases: {用例名: [项目名, 模块文件, 类名, 测试数据...]}（保持套件中的顺序）
+        invalid_cases: [(用例名, 格式错误的配置), ...]
+        case_options: {用例名: {"timeout": ..., "log_level": ...}}
+    """
+
+    def __init__(
+        self,
+        project_name,
+        suite_name,
+        source_path,
+        source_mtime_ns,
+        source_size,
+        test_cases,
+        invalid_cases,
+        case_options,
+    ):
+        self.project_name = project_name
+        self.suite_name = suite_name
+        self.source_path = source_path
+        self.source_mtime_ns = source_mtime_ns
+        self.source_size = source_size
+        self.test_cases = test_cases
+        self.invalid_cases = invalid_cases
+        self.case_options = case_options
+
+    @property
+    def case_names(self):
+        return list(self.test_cases)
+
+    def is_current(self, stat):
+        """源文件自编译以来是否未变化"""
+        return stat.st_mtime_ns == self.source_mtime_ns and stat.st_size == self.source_size
+
+    def to_dict(self):
+        # 用例以 [名称, 配置] 列表保存，保留顺序与非字符串的用例名
+        return {
+            "version": MANIFEST_VERSION,
+            "project": self.project_name,
+            "suite": self.suite_name,
+            "source": {
+                "path": self.source_path,
+                "mtime_ns": self.source_mtime_ns,
+                "size": self.source_size,
+            },
+            "cases": [[name, config] for name, config in self.test_cases.items()],
+            "invalid_cases": [[name, config] for name, config in self.invalid_cases],
+            "case_options": [[name, options] for name, options in self.case_options.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Raises:
+            ValueError: 版本不兼容或内容无效
+        """
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            raise ValueError("清单版本不兼容")
+        try:
+            source = data["source"]
+            return cls(
+                data["project"],
+                data["suite"],
+                source["path"],
+                int(source["mtime_ns"]),
+                int(source["size"]),
+                {name: config for name, config in data["cases"]},
+                [(name, config) for name, config in data["invalid_cases"]],
+                {name: options for name, options in data["case_options"]},
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"清单内容无效: {e}") from e
+
+
+def compile_suite(project_name, suite_name, source_path, stat=None):
+    """解析套件 YAML 并编译为清单"""
+    stat = stat or os.stat(source_path)
+    suite_config = load_yaml_config(source_path)
+    test_cases, invalid_cases = parse_test_cases(suite_config)
+    case_options = parse_case_options(suite_config, test_cases.keys())
+    return SuiteManifest(
+        project_name,
+        suite_name,
+        source_path,
+        stat.st_mtime_ns,
+        stat.st_size,
+        test_cases,
+        invalid_cases,
+        case_options,
+    )
+
+
+class SuiteManifestCache:
+    """
+    清单缓存：内存 LRU + 磁盘 JSON（线程安全）
+
+    Example:
+        cache = SuiteManifestCache()
+        manifest = cache.get("demo_project", "基础功能测试")
+        manifest.test_cases, manifest.case_options
+    """
+
+    def __init__(self, manifest_dir=None, capacity=LRU_CAPACITY):
+        self.manifest_dir = manifest_dir or Config.MANIFEST_DIR
+        self.capacity = max(1, capacity)
+        self._lru = OrderedDict()  # (项目名, 套件名) -> SuiteManifest
+        self._lock = threading.Lock()
+
+    def manifest_path(self, project_name, suite_name):
+        return os.path.join(self.manifest_dir, str(project_name), f"{suite_name}.json")
+
+    def get(self, project_name, suite_name):
+        """
+        获取测试套件清单，源文件变化时重新编译
+
+        Raises:
+            FileNotFoundError: 测试套件文件不存在
+        """
+        source_path = find_suite_file(project_name, suite_name)
+        if not source_path:
+            missing_path = os.path.join(Config.TEST_SUITE_DIR, project_name, f"{suite_name}.yaml")
+            raise FileNotFoundError(f"测试套件文件不存在: {missing_path}")
+        stat = os.stat(source_path)
+        key = (project_name, suite_name)
+
+        with self._lock:
+            manifest = self._lru.get(key)
+            if manifest is not None and manifest.source_path == source_path and manifest.is_current(stat):
+                self._lru.move_to_end(key)
+                return manifest
+
+        manifest = self._read(project_name, suite_name)
+        if manifest is None or manifest.source_path != source_path or not manifest.is_current(stat):
+            manifest = compile_suite(project_name, suite_name, source_path, stat)
+            self._write(manifest)
+
+        with self._lock:
+            self._lru[key] = manifest
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.capacity:
+                self._lru.popitem(last=False)
+        return manifest
+
+    def invalidate(self, project_name=None, suite_name=None):
+        """丢弃内存中的清单（磁盘清单在下次使用时按源文件校验）"""
+        with self._lock:
+            if project_name is None:
+                self._lru.clear()
+            else:
+                for key in [k for k in self._lru if k[0] == project_name]:
+                    if suite_name is None or key[1] == suite_name:
+                        del self._lru[key]
+
+    def _read(self, project_name, suite_name):
+        """读取磁盘清单，不存在或无效时返回 None"""
+        path = self.manifest_path(project_name, suite_name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return SuiteManifest.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"测试套件清单无效，将重新编译: {path} ({e})")
+            return None
+
+    def _write(self, manifest):
+        """
+        写入磁盘清单（先写临时文件再替换）
+
+        无法序列化为 JSON，或 JSON 无法原样还原（如帧映射 {0x10: ...} 的整数键会变成字符串）时
+        只保留在内存中，保证从清单读取的测试数据与解析 YAML 得到的完全一致
+        """
+        path = self.manifest_path(manifest.project_name, manifest.suite_name)
+        data = manifest.to_dict()
+        try:
+            content = json.dumps(data, ensure_ascii=False)
+            round_trip_ok = json.loads(content) == data
+        except (TypeError, ValueError) as e:
+            logger.debug(f"测试套件包含无法写入清单的数据，仅缓存在内存中: {e}")
+            return
+        if not round_trip_ok:
+            logger.debug("测试套件包含 JSON 无法原样保存的数据（如非字符串键），仅缓存在内存中")
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"保存测试套件清单失败: {e}")
+
+
+_default_cache = SuiteManifestCache()
+
+
+def load_suite_manifest(project_name, suite_name):
+    """
+    从共享缓存获取测试套件清单
+
+    Raises:
+        FileNotFoundError: 测试套件文件不存在
+    """
+    return _default_cache.get(project_name, suite_name)
@@ -0,0 +1,124 @@
+"""
+用例超时看门狗
+
+每个用例在独立线程中执行，执行线程在等待期间监控：
+1. 超时：超过套件配置的 timeout 后中断用例，按 Error 处理
+2. 停止请求：用户停止测试后给予宽限期，仍未结束的用例被强制中断
+
+强制中断方式：
+- 向用例线程注入 CaseInterrupted 异常（线程回到 Python 代码时立即抛出）
+- 调用 on_interrupt 回调释放用例资源（复位通道、关闭设备），使阻塞在 DLL 调用中的线程尽快返回
+- 仍无法退出的线程被放弃（守护线程，不阻塞后续用例与进程退出）
+"""
+
+import ctypes
+import threading
+import time
+
+# 用户停止后等待用例自行结束的宽限期（秒）
+STOP_GRACE_PERIOD = 5.0
+# 注入中断后等待用例线程退出的时间（秒）
+INTERRUPT_JOIN_TIMEOUT = 2.0
+# 监控轮询间隔（秒）
+POLL_INTERVAL = 0.05
+
+
+class CaseInterrupted(BaseException):
+    """
+    注入到用例线程中的中断异常
+
+    继承 BaseException，避免被用例中常见的 except Exception 吞掉
+    """
+
+
+class CaseTimeoutError(Exception):
+    """用例执行超时"""
+
+    def __init__(self, message, abandoned=False):
+        super().__init__(message)
+        self.abandoned = abandoned  # 用例线程是否未能退出而被放弃
+
+
+class CaseCancelledError(Exception):
+    """用户停止测试，用例被强制中断"""
+
+    def __init__(self, message, abandoned=False):
+        super().__init__(message)
+        self.abandoned = abandoned
+
+
+def _async_raise(thread, exc_type):
+    """向指定线程注入异常"""
+    if thread.ident is None:
+        return
+    ret = ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread.ident), ctypes.py_object(exc_type)
+    )
+    if ret > 1:
+        # 影响了多个线程，撤销注入
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread.ident), None)
+
+
+def _interrupt(thread, on_interrupt):
+    """中断用例线程，返回线程是否仍未退出"""
+    _async_raise(thread, CaseInterrupted)
+    if on_interrupt is not None:
+        try:
+            on_interrupt()
+        except Exception:
+            pass
+    thread.join(INTERRUPT_JOIN_TIMEOUT)
+    return thread.is_alive()
+
+
+def run_guarded(func, timeout=0, should_continue=None, on_interrupt=None, name="case"):
+    """
+    在看门狗监控下执行 func 并返回其返回值
+
+    Args:
+        func: 无参可调用对象
+        timeout: 超时时间（秒），0 或 None 表示不限制
+        should_continue: 返回 False 表示用户请求停止
+        on_interrupt: 强制中断时调用，用于释放用例占用的资源
+        name: 线程名称
+
+    Raises:
+        CaseTimeoutError: 执行超时
+        CaseCancelledError: 用户停止后宽限期内未结束
+        Exception: func 自身抛出的异常
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = func()
+        except CaseInterrupted:
+            outcome["interrupted"] = True
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, name=f"case:{name}", daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + timeout if timeout else None
+    stop_deadline = None
+    while True:
+        thread.join(POLL_INTERVAL)
+        if not thread.is_alive():
+            break
+
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            abandoned = _interrupt(thread, on_interrupt)
+            raise CaseTimeoutError(f"用例执行超时（{timeout:g} 秒），已中断", abandoned)
+
+        if should_continue is not None and not should_continue():
+            if stop_deadline is None:
+                stop_deadline = now + STOP_GRACE_PERIOD
+            elif now >= stop_deadline:
+                abandoned = _interrupt(thread, on_interrupt)
+                raise CaseCancelledError("用户停止测试，用例已中断", abandoned)
+
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome.get("value")
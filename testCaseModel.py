@@ -1,185 +1,560 @@
-from PySide6.QtCore import  Signal, Qt
-from PySide6.QtGui import QStandardItemModel, QStandardItem, QColor
+from array import array
+from itertools import compress
 
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, Signal
+from PySide6.QtGui import QColor
 
-class TestCaseModel(QStandardItemModel):
-    """专门管理测试用例数据的模型"""
+# 列索引
+COL_CHECK = 0
+COL_NAME = 1
+COL_STATUS = 2
+COL_PROGRESS = 3
+COL_TEST_COUNT = 4
+COL_FAIL_COUNT = 5
+COL_RESULT = 6
+COL_MESSAGE = 7
+
+HEADERS = [
+    "选择",
+    "用例名称",
+    "状态",
+    "进度",
+    "执行次数",
+    "失败次数",
+    "最后结果",
+    "详细信息",
+]
+
+# 最后结果编码，数组中只保存编码
+RESULT_NAMES = ["", "Pass", "Fail", "Error"]
+RESULT_CODES = {name: code for code, name in enumerate(RESULT_NAMES)}
+RESULT_TEXT = ["-", "✓ Pass", "✗ Fail", "⚠ Error"]
+
+# 勾选位图取反用的转换表（0 <-> 1）
+_INVERT_TABLE = bytes([1, 0]) + bytes(254)
+
+# 详细信息列最多显示的字符数，完整信息见工具提示
+MESSAGE_DISPLAY_LENGTH = 50
+
+# 颜色在模块加载时创建一次，data() 中直接复用
+COLOR_GRAY = QColor("gray")
+COLOR_BLUE = QColor("blue")
+COLOR_GREEN = QColor("green")
+COLOR_RED = QColor("red")
+COLOR_ORANGE = QColor("orange")
+COLOR_PROGRESS_DONE = QColor(76, 175, 80, 50)  # 绿色背景
+COLOR_PROGRESS_RUNNING = QColor(255, 193, 7, 50)  # 黄色背景
+COLOR_FAIL_BACKGROUND = QColor(244, 67, 54, 30)  # 红色背景
+RESULT_COLORS = [None, COLOR_GREEN, COLOR_RED, COLOR_ORANGE]
+
+
+class TestCaseModel(QAbstractTableModel):
+    """
+    专门管理测试用例数据的模型
+
+    用例状态保存在按行排列的并行数组中，用例名到行号通过字典映射，
+    结果更新为 O(1)；显示文本与颜色只在视图请求 data() 时为可见行生成。
+    """
 
     # 定义信号
     case_updated = Signal(str)  # 当测试用例更新时发出信号
 
     def __init__(self):
         super().__init__()
-        self.test_case_data = {}  # 存储测试用例的详细数据
-        self.setup_headers()
-
-    def setup_headers(self):
-        """设置表头"""
-        headers = [
-            "选择",
-            "用例名称",
-            "状态",
-            "进度",
-            "执行次数",
-            "失败次数",
-            "最后结果",
-            "详细信息",
-        ]
-        self.setHorizontalHeaderLabels(headers)
+        self._names = []  # 用例名称
+        self._search_keys = []  # 归一化（casefold）后的用例名称，供搜索使用
+        self._row_of = {}  # 用例名 -> 行号
+        self.revision = 0  # 行结构版本号，增删用例时递增，供筛选缓存判断是否失效
+        self._checked = bytearray()  # 勾选位图，每行一个字节（0/1）
+        self._test_count = array("l")  # 执行次数
+        self._fail_count = array("l")  # 失败次数
+        self._progress = array("b")  # 进度（百分比）
+        self._result = array("b")  # 最后结果编码，见 RESULT_NAMES
+        self._message = []  # 最后一次结果信息
+
+    # ========== Qt 模型接口 ==========
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and 0 <= section < len(HEADERS)
+        ):
+            return HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == COL_CHECK:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display_text(row, column)
+
+        if role == Qt.ItemDataRole.CheckStateRole and column == COL_CHECK:
+            return Qt.CheckState.Checked if self._checked[row] else Qt.CheckState.Unchecked
+
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self._foreground(row, column)
+
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._background(row, column)
+
+        if role == Qt.ItemDataRole.ToolTipRole and column == COL_MESSAGE:
+            return self._message[row]  # 完整信息作为工具提示
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > COL_NAME:
+            return Qt.AlignmentFlag.AlignCenter
+
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if (
+            not index.isValid()
+            or index.column() != COL_CHECK
+            or role != Qt.ItemDataRole.CheckStateRole
+        ):
+            return False
+        checked = value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+        self._checked[index.row()] = 1 if checked else 0
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    def _display_text(self, row, column):
+        if column == COL_NAME:
+            return self._names[row]
+        if column == COL_STATUS:
+            return self._status(row)
+        if column == COL_PROGRESS:
+            return f"{self._progress[row]}%"
+        if column == COL_TEST_COUNT:
+            return str(self._test_count[row])
+        if column == COL_FAIL_COUNT:
+            return str(self._fail_count[row])
+        if column == COL_RESULT:
+            return RESULT_TEXT[self._result[row]]
+        if column == COL_MESSAGE:
+            message = self._message[row]
+            if len(message) > MESSAGE_DISPLAY_LENGTH:
+                message = message[: MESSAGE_DISPLAY_LENGTH - 3] + "..."
+            return message
+        return None
+
+    def _foreground(self, row, column):
+        if column == COL_STATUS:
+            if self._test_count[row] == 0:
+                return COLOR_GRAY
+            return COLOR_BLUE if self._progress[row] < 100 else COLOR_GREEN
+        if column == COL_FAIL_COUNT and self._fail_count[row] > 0:
+            return COLOR_RED
+        if column == COL_RESULT:
+            return RESULT_COLORS[self._result[row]]
+        return None
+
+    def _background(self, row, column):
+        if column == COL_PROGRESS:
+            if self._progress[row] == 100:
+                return COLOR_PROGRESS_DONE
+            if self._progress[row] > 0:
+                return COLOR_PROGRESS_RUNNING
+        if column == COL_FAIL_COUNT and self._fail_count[row] > 0:
+            return COLOR_FAIL_BACKGROUND
+        return None
+
+    def _status(self, row):
+        """状态由执行次数与进度推导"""
+        if self._test_count[row] == 0:
+            return "待测试"
+        return "执行中" if self._progress[row] < 100 else "已完成"
+
+    # ========== 用例管理 ==========
 
     def add_test_case(self, case_name):
         """添加测试用例到模型"""
-        # 初始化数据
-        self.test_case_data[case_name] = {
-            "test_count": 0,
-            "fail_count": 0,
-            "result": "",
-            "message": "",
-            "progress": 0,
-            "status": "待测试",
-        }
+        self.add_test_cases([case_name])
+
+    def add_test_cases(self, case_names):
+        """批量添加测试用例（只发出一次行插入通知），已存在的用例被忽略"""
+        new_names = []
+        seen = set()
+        for case_name in case_names:
+            if case_name not in self._row_of and case_name not in seen:
+                seen.add(case_name)
+                new_names.append(case_name)
+        if not new_names:
+            return
+
+        first = len(self._names)
+        count = len(new_names)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        for offset, case_name in enumerate(new_names):
+            self._row_of[case_name] = first + offset
+        self._names.extend(new_names)
+        self._search_keys.extend(case_name.casefold() for case_name in new_names)
+        self.revision += 1
+        self._checked.extend(bytes(count))
+        self._test_count.extend([0] * count)
+        self._fail_count.extend([0] * count)
+        self._progress.extend([0] * count)
+        self._result.extend([0] * count)
+        self._message.extend([""] * count)
+        self.endInsertRows()
+
+    def clear_all_cases(self):
+        """清空所有测试用例"""
+        self.beginResetModel()
+        self._names = []
+        self._search_keys = []
+        self._row_of = {}
+        self.revision += 1
+        self._checked = bytearray()
+        self._test_count = array("l")
+        self._fail_count = array("l")
+        self._progress = array("b")
+        self._result = array("b")
+        self._message = []
+        self.endResetModel()
+
+    def case_name(self, row):
+        """指定行的用例名"""
+        return self._names[row]
 
-        # 创建表格行
-        row_items = []
+    def row_of(self, case_name):
+        """用例所在行，不存在时返回 -1"""
+        return self._row_of.get(case_name, -1)
 
-        # 选择列 (复选框)
-        checkbox_item = QStandardItem()
-        checkbox_item.setCheckable(True)
-        checkbox_item.setEditable(False)
-        row_items.append(checkbox_item)
+    @property
+    def search_keys(self):
+        """按行排列的归一化用例名称（只读使用）"""
+        return self._search_keys
 
-        # 用例名称列
-        name_item = QStandardItem(case_name)
-        name_item.setEditable(False)
-        row_items.append(name_item)
+    def case_status(self, row):
+        """指定行的状态: 待测试 / 执行中 / 已完成"""
+        return self._status(row)
 
-        # 其他列
-        for _ in range(6):  # 状态、进度、执行次数、失败次数、最后结果、详细信息
-            item = QStandardItem("-")
-            item.setEditable(False)
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            row_items.append(item)
+    def case_result(self, row):
+        """指定行的最后结果: "" / Pass / Fail / Error"""
+        return RESULT_NAMES[self._result[row]]
 
-        self.appendRow(row_items)
+    def case_fail_count(self, row):
+        """指定行的失败次数"""
+        return self._fail_count[row]
+
+    # ========== 勾选 ==========
+
+    def is_case_checked(self, row):
+        """指定行是否勾选"""
+        return bool(self._checked[row])
+
+    def set_case_checked(self, row, checked):
+        """设置指定行的勾选状态"""
+        self.setData(
+            self.index(row, COL_CHECK),
+            Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked,
+            Qt.ItemDataRole.CheckStateRole,
+        )
+
+    def get_selected_cases(self):
+        """获取所有选中的测试用例"""
+        return list(compress(self._names, self._checked))
+
+    def selected_count(self):
+        """选中的用例数"""
+        return len(self._checked) - self._checked.count(0)
+
+    def set_rows_checked(self, checked, rows=None):
+        """
+        批量设置勾选状态，只发出一次 dataChanged
+
+        Args:
+            checked: 是否勾选
+            rows: 行号列表，None 表示全部行
+        """
+        value = 1 if checked else 0
+        if rows is None:
+            if not self._checked:
+                return
+            self._checked = bytearray([value]) * len(self._checked)
+            self._emit_checks_changed(0, len(self._checked) - 1)
+            return
+        if not rows:
+            return
+        bitmap = self._checked
+        for row in rows:
+            bitmap[row] = value
+        self._emit_checks_changed(min(rows), max(rows))
+
+    def invert_rows_checked(self, rows=None):
+        """批量反选，rows 为 None 表示全部行，只发出一次 dataChanged"""
+        if rows is None:
+            if not self._checked:
+                return
+            self._checked = bytearray(self._checked.translate(_INVERT_TABLE))
+            self._emit_checks_changed(0, len(self._checked) - 1)
+            return
+        if not rows:
+            return
+        bitmap = self._checked
+        for row in rows:
+            bitmap[row] ^= 1
+        self._emit_checks_changed(min(rows), max(rows))
+
+    def set_checked_cases(self, case_names):
+        """
+        按用例名勾选（其余用例取消勾选），用于应用保存的选择
+
+        Returns:
+            int: 实际勾选的用例数（模型中不存在的用例被忽略）
+        """
+        bitmap = bytearray(len(self._names))
+        applied = 0
+        for case_name in case_names:
+            row = self._row_of.get(case_name)
+            if row is not None and not bitmap[row]:
+                bitmap[row] = 1
+                applied += 1
+        self._checked = bitmap
+        if bitmap:
+            self._emit_checks_changed(0, len(bitmap) - 1)
+        return applied
+
+    def _emit_checks_changed(self, first, last):
+        """通知视图选择列在指定行范围内发生变化"""
+        index = self.index(first, COL_CHECK)
+        self.dataChanged.emit(
+            index, self.index(last, COL_CHECK), [Qt.ItemDataRole.CheckStateRole]
+        )
+
+    # ========== 用例结果 ==========
+
+    @property
+    def test_case_data(self):
+        """
+        各用例的统计数据 {case_name: {...}}
+
+        按需从数组生成，字段与 runner.report.new_case_data() 一致，供报告、断点等使用
+        """
+        return {name: self.get_case_data(name) for name in self._names}
+
+    def get_case_data(self, case_name):
+        """单个用例的统计数据，用例不存在时返回 None"""
+        row = self._row_of.get(case_name)
+        if row is None:
+            return None
+        return {
+            "test_count": self._test_count[row],
+            "fail_count": self._fail_count[row],
+            "result": RESULT_NAMES[self._result[row]],
+            "message": self._message[row],
+            "progress": self._progress[row],
+            "status": self._status(row),
+        }
 
     def update_case_result(self, case_name, result, message, round_num, total_rounds):
         """更新测试用例结果"""
-        if case_name not in self.test_case_data:
+        row = self._apply_result(case_name, result, message, round_num, total_rounds)
+        if row < 0:
             return
 
-        # 更新数据
-        data = self.test_case_data[case_name]
-        data["test_count"] += 1
-        if result != "Pass":
-            data["fail_count"] += 1
-        data["result"] = result
-        data["message"] = message
-        data["progress"] = int((round_num / total_rounds) * 100)
-
-        # 更新状态
-        if data["progress"] < 100:
-            data["status"] = "执行中"
-        else:
-            data["status"] = "已完成"
-
-        # 更新表格显示
-        self._update_table_row(case_name)
+        self._emit_rows_changed(row, row)
 
         # 发出信号
         self.case_updated.emit(case_name)
 
-    def _update_table_row(self, case_name):
-        """更新表格中指定用例的行数据"""
-        row_index = self._find_case_row(case_name)
-        if row_index == -1:
-            return
+    def update_case_results(self, results, total_rounds):
+        """
+        批量更新测试用例结果
 
-        data = self.test_case_data[case_name]
+        一批结果只发出一次覆盖受影响行范围的 dataChanged，且不逐条发出 case_updated 信号，
+        由调用方在批量处理后统一刷新统计信息。
 
-        # 更新状态列 - 添加颜色
-        status_item = self.item(row_index, 2)
-        status_item.setText(data["status"])
-        if data["status"] == "待测试":
-            status_item.setForeground(QColor("gray"))
-        elif data["status"] == "执行中":
-            status_item.setForeground(QColor("blue"))
-        else:
-            status_item.setForeground(QColor("green"))
-
-        # 更新进度列 - 添加背景色
-        progress_item = self.item(row_index, 3)
-        progress_item.setText(f"{data['progress']}%")
-        if data["progress"] == 100:
-            progress_item.setBackground(QColor(76, 175, 80, 50))  # 绿色背景
-        elif data["progress"] > 0:
-            progress_item.setBackground(QColor(255, 193, 7, 50))  # 黄色背景
-
-        # 更新执行次数
-        self.item(row_index, 4).setText(str(data["test_count"]))
-
-        # 更新失败次数 - 失败时高亮
-        fail_item = self.item(row_index, 5)
-        fail_item.setText(str(data["fail_count"]))
-        if data["fail_count"] > 0:
-            fail_item.setForeground(QColor("red"))
-            fail_item.setBackground(QColor(244, 67, 54, 30))  # 红色背景
-
-        # 更新最后结果 - 添加图标和颜色
-        result_item = self.item(row_index, 6)
-        if data["result"] == "Pass":
-            result_item.setText("✓ Pass")
-            result_item.setForeground(QColor("green"))
-        elif data["result"] == "Fail":
-            result_item.setText("✗ Fail")
-            result_item.setForeground(QColor("red"))
-        elif data["result"] == "Error":
-            result_item.setText("⚠ Error")
-            result_item.setForeground(QColor("orange"))
-        else:
-            result_item.setText("-")
-
-        # 更新详细信息 - 添加工具提示
-        info_item = self.item(row_index, 7)
-        message = data["message"]
-        if len(message) > 50:
-            message = message[:47] + "..."
-        info_item.setText(message)
-        info_item.setToolTip(data["message"])  # 完整信息作为工具提示
-
-    def _find_case_row(self, case_name):
-        """查找用例对应的行索引"""
-        for i in range(self.rowCount()):
-            name_item = self.item(i, 1)
-            if name_item and name_item.text() == case_name:
-                return i
-        return -1
+        Args:
+            results: [(case_name, result, message, round_num), ...]
+            total_rounds: 总轮数
+        """
+        first = last = -1
+        for case_name, result, message, round_num in results:
+            row = self._apply_result(case_name, result, message, round_num, total_rounds)
+            if row < 0:
+                continue
+            first = row if first < 0 else min(first, row)
+            last = max(last, row)
 
-    def get_selected_cases(self):
-        """获取所有选中的测试用例"""
-        selected_cases = []
-        for i in range(self.rowCount()):
-            checkbox_item = self.item(i, 0)
-            if checkbox_item and checkbox_item.checkState() == Qt.CheckState.Checked:
-                name_item = self.item(i, 1)
-                if name_item:
-                    selected_cases.append(name_item.text())
-        return selected_cases
+        if first >= 0:
+            self._emit_rows_changed(first, last)
 
-    def clear_all_cases(self):
-        """清空所有测试用例"""
-        # 只删除所有数据行，保留表头
-        self.removeRows(0, self.rowCount())
-        self.test_case_data.clear()
+    def _apply_result(self, case_name, result, message, round_num, total_rounds):
+        """更新用例统计数据（不通知视图），返回行号，用例不存在时返回 -1"""
+        row = self._row_of.get(case_name, -1)
+        if row < 0:
+            return -1
+
+        self._test_count[row] += 1
+        if result != "Pass":
+            self._fail_count[row] += 1
+        self._result[row] = RESULT_CODES.get(result, RESULT_CODES["Error"])
+        self._message[row] = message or ""
+        self._progress[row] = min(100, int((round_num / total_rounds) * 100))
+        return row
 
     def reset_all_case_data(self):
         """重置所有测试用例的数据"""
-        for case_name in self.test_case_data.keys():
-            self.test_case_data[case_name] = {
-                "test_count": 0,
-                "fail_count": 0,
-                "result": "",
-                "message": "",
-                "progress": 0,
-                "status": "待测试",
-            }
-            self._update_table_row(case_name)
+        count = len(self._names)
+        if not count:
+            return
+        self._test_count = array("l", bytes(self._test_count.itemsize * count))
+        self._fail_count = array("l", bytes(self._fail_count.itemsize * count))
+        self._progress = array("b", bytes(count))
+        self._result = array("b", bytes(count))
+        self._message = [""] * count
+        self._emit_rows_changed(0, count - 1)
+
+    def restore_case_data(self, case_data):
+        """
+        恢复用例统计数据（断点续测）
+
+        Args:
+            case_data: {case_name: 统计数据}，字段与 test_case_data 一致
+        """
+        first = last = -1
+        for case_name, data in case_data.items():
+            row = self._row_of.get(case_name, -1)
+            if row < 0:
+                continue
+            self._test_count[row] = int(data.get("test_count", 0))
+            self._fail_count[row] = int(data.get("fail_count", 0))
+            self._progress[row] = int(data.get("progress", 0))
+            self._result[row] = RESULT_CODES.get(data.get("result", ""), RESULT_CODES["Error"])
+            self._message[row] = data.get("message", "") or ""
+            first = row if first < 0 else min(first, row)
+            last = max(last, row)
+
+        if first >= 0:
+            self._emit_rows_changed(first, last)
+
+    def _emit_rows_changed(self, first, last):
+        """通知视图结果列（状态 ~ 详细信息）在指定行范围内发生变化"""
+        self.dataChanged.emit(
+            self.index(first, COL_STATUS), self.index(last, COL_MESSAGE)
+        )
+
+
+class TestCaseFilterProxyModel(QSortFilterProxyModel):
+    """
+    用例筛选代理模型
+
+    - 关键字筛选使用源模型中缓存的归一化名称，关键字变长（新关键字包含旧关键字）时
+      只在上一次的匹配结果中继续筛选，不再扫描全部用例
+    - 支持按状态、最后结果、是否有失败筛选，不修改源模型
+    - 源模型数据变化时自动重新判断（dynamicSortFilter）
+
+    Example:
+        proxy = TestCaseFilterProxyModel()
+        proxy.setSourceModel(test_case_model)
+        proxy.set_filter_text("lin")
+        proxy.set_filters(only_failed=True)
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDynamicSortFilter(True)
+        self._query = ""
+        self._matches = None  # 匹配关键字的源行号集合，None 表示不按关键字筛选
+        self._matches_revision = -1  # 匹配结果对应的源模型版本号
+        self._status = None
+        self._result = None
+        self._only_failed = False
+
+    def set_filter_text(self, text):
+        """设置关键字（不区分大小写的子串匹配）"""
+        query = (text or "").strip().casefold()
+        if query == self._query:
+            return
+
+        model = self.sourceModel()
+        if not query or model is None:
+            matches = None
+        elif (
+            self._matches is not None
+            and self._query
+            and self._query in query
+            and self._matches_revision == model.revision
+        ):
+            # 新关键字包含旧关键字：结果只会变少，在上次匹配结果中继续筛选
+            keys = model.search_keys
+            matches = {row for row in self._matches if query in keys[row]}
+        else:
+            matches = self._scan(model, query)
+
+        self._query = query
+        self._matches = matches
+        self._matches_revision = model.revision if model is not None else -1
+        self.invalidateFilter()
+
+    def set_filters(self, status=None, result=None, only_failed=False):
+        """
+        设置状态 / 结果筛选
+
+        Args:
+            status: 待测试 / 执行中 / 已完成，None 表示不限
+            result: Pass / Fail / Error，None 表示不限
+            only_failed: 只显示失败次数大于 0 的用例
+        """
+        if (status, result, only_failed) == (self._status, self._result, self._only_failed):
+            return
+        self._status = status
+        self._result = result
+        self._only_failed = only_failed
+        self.invalidateFilter()
+
+    @property
+    def is_filtering(self):
+        """是否有生效的筛选条件"""
+        return bool(
+            self._query or self._status is not None or self._result is not None or self._only_failed
+        )
+
+    def visible_source_rows(self):
+        """当前显示的用例在源模型中的行号（按显示顺序）"""
+        return [
+            self.mapToSource(self.index(row, 0)).row() for row in range(self.rowCount())
+        ]
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+
+        if self._query:
+            if self._matches_revision != model.revision:
+                # 源模型增删了用例，重新建立匹配结果
+                self._matches = self._scan(model, self._query)
+                self._matches_revision = model.revision
+            if source_row not in self._matches:
+                return False
+
+        if self._only_failed and model.case_fail_count(source_row) <= 0:
+            return False
+        if self._status is not None and model.case_status(source_row) != self._status:
+            return False
+        if self._result is not None and model.case_result(source_row) != self._result:
+            return False
+        return True
+
+    @staticmethod
+    def _scan(model, query):
+        """在全部用例中查找匹配关键字的行"""
+        return {row for row, key in enumerate(model.search_keys) if query in key}
@@ -0,0 +1,30 @@
+"""Allure 结果的 thread 标签是用例实际执行的线程，而不是执行器或调度线程"""
+
+import glob
+import json
+import os
+
+from case_script.case_base import CaseBase
+from runner import PlanEntry, engine
+from runner.allure_export import AllureResultWriter
+
+
+class QuickCase(CaseBase):
+    def run(self):
+        return True, "ok"
+
+
+def test_thread_label_is_case_thread(tmp_path):
+    writer = AllureResultWriter("demo", "套件", results_dir=str(tmp_path))
+    plan = [PlanEntry("快速用例", ["demo", "module", "QuickCase"], QuickCase, {}, ())]
+    engine.TestRunner(plan, {"rounds": 2, "delay": 0}, allure_writer=writer).run()
+    writer.close()
+
+    results = []
+    for path in glob.glob(os.path.join(tmp_path, "*-result.json")):
+        with open(path, encoding="utf-8") as f:
+            results.append(json.load(f))
+    assert len(results) == 2
+    for result in results:
+        threads = [label["value"] for label in result["labels"] if label["name"] == "thread"]
+        assert threads == ["case:快速用例"]
@@ -0,0 +1,49 @@
+"""执行计划中 LIN 用例的资源由用例的 LIN 配置生成，调度互斥与 env_init 使用同一通道"""
+
+import pytest
+
+from case_script.case_base import CaseBase
+from runner import case_plan
+from runner.case_plan import CasePlanError, build_plan_entry
+
+
+class DynamicResourcesCase(CaseBase):
+    """重写 get_resources 且未列出 LIN 资源"""
+
+    lin_channel = 1
+
+    @classmethod
+    def get_resources(cls, test_data=None):
+        return ("adb:emulator-5554",)
+
+
+class MismatchCase(CaseBase):
+    resources = ("lin:0:1",)
+
+
+def _build(monkeypatch, test_class):
+    monkeypatch.setattr(case_plan, "resolve_case_class", lambda details: test_class)
+    return build_plan_entry("用例", ["demo", "module", test_class.__name__])
+
+
+def test_lin_case_from_project_locks_its_channel():
+    entry = build_plan_entry("转速递增", ["chery_lin", "chery_lin_test.py", "CheryLinSpeedTest"])
+    assert entry.resources == ("lin:0:0",)
+    assert entry.create_instance().requires_lin()
+
+
+def test_overridden_get_resources_still_locks_lin_channel(monkeypatch):
+    entry = _build(monkeypatch, DynamicResourcesCase)
+    assert entry.resources == ("adb:emulator-5554", "lin:0:1")
+    assert entry.create_instance().requires_lin()
+
+
+def test_software_case_has_no_resources(monkeypatch):
+    entry = _build(monkeypatch, CaseBase)
+    assert entry.resources == ()
+    assert not entry.create_instance().requires_lin()
+
+
+def test_mismatched_lin_resource_is_rejected(monkeypatch):
+    with pytest.raises(CasePlanError):
+        _build(monkeypatch, MismatchCase)
@@ -0,0 +1,133 @@
+"""执行器通过设备池为 LIN 用例分配通道：设备在整个运行期间只打开一次"""
+
+import threading
+
+import pytest
+
+from case_script.case_base import CaseBase
+from runner import PlanEntry, engine
+from tools.can_tool import device_pool
+from tools.can_tool.zlgcan import ZCAN_STATUS_OK
+
+
+class FakeZCAN:
+    """记录调用次数的 ZCAN 替身"""
+
+    instances = []
+
+    def __init__(self):
+        self.calls = {"OpenDevice": 0, "InitLIN": 0, "StartLIN": 0, "ResetLIN": 0, "CloseDevice": 0}
+        FakeZCAN.instances.append(self)
+
+    def OpenDevice(self, device_type, device_index, reserved):
+        self.calls["OpenDevice"] += 1
+        return 100 + device_index
+
+    def InitLIN(self, device_handle, channel, lin_config):
+        self.calls["InitLIN"] += 1
+        return 200 + channel
+
+    def StartLIN(self, lin_handle):
+        self.calls["StartLIN"] += 1
+        return ZCAN_STATUS_OK
+
+    def ResetLIN(self, lin_handle):
+        self.calls["ResetLIN"] += 1
+        return ZCAN_STATUS_OK
+
+    def CloseDevice(self, device_handle):
+        self.calls["CloseDevice"] += 1
+        return ZCAN_STATUS_OK
+
+
+class LinCase(CaseBase):
+    uses_lin = True
+    seen = []
+
+    def run(self):
+        LinCase.seen.append((self.device_handle, self.lin_handle))
+        if self.lin_handle is None:
+            return False, "LIN 通道未初始化"
+        return True, "ok"
+
+
+class SoftwareCase(CaseBase):
+    def run(self):
+        return self.lin_handle is None, "无需设备"
+
+
+def _entry(name, test_class):
+    return PlanEntry(name, ["demo", "module", test_class.__name__], test_class, {}, test_class.get_resources())
+
+
+@pytest.fixture
+def fake_zcan(monkeypatch):
+    FakeZCAN.instances = []
+    LinCase.seen = []
+    monkeypatch.setattr(device_pool, "ZCAN", FakeZCAN)
+    return FakeZCAN
+
+
+def test_consecutive_lin_cases_reuse_one_device(fake_zcan):
+    results = []
+    plan = [_entry("LIN用例A", LinCase), _entry("软件用例", SoftwareCase), _entry("LIN用例B", LinCase)]
+    runner = engine.TestRunner(plan, {"rounds": 2, "delay": 0}, on_result=lambda *r: results.append(r))
+    runner.run()
+
+    assert [r[1] for r in results] == ["Pass"] * 6
+    assert LinCase.seen == [(100, 200)] * 4
+    # 只加载一次 DLL、打开一次设备、初始化一次通道
+    assert len(fake_zcan.instances) == 1
+    calls = fake_zcan.instances[0].calls
+    assert calls["OpenDevice"] == 1
+    assert calls["InitLIN"] == 1
+    # 每个用例结束时归还（复位后重新启动），运行结束时复位并关闭设备
+    assert calls["ResetLIN"] == 4 + 1
+    assert calls["StartLIN"] == 1 + 4
+    assert calls["CloseDevice"] == 1
+
+
+def test_lin_resource_follows_channel_config():
+    class Channel1Case(CaseBase):
+        lin_channel = 1
+
+    class LegacyCase(CaseBase):
+        resources = ("lin:0:0", "adb:emulator-5554")
+
+    class MismatchCase(CaseBase):
+        resources = ("lin:0:1",)
+
+    assert SoftwareCase.get_resources() == ()
+    assert LinCase.get_resources() == ("lin:0:0",)
+    assert Channel1Case.get_resources() == ("lin:0:1",)
+    assert LegacyCase.get_resources() == ("adb:emulator-5554", "lin:0:0")
+    with pytest.raises(ValueError):
+        MismatchCase.get_resources()
+
+
+def test_channel_in_use_is_not_shared(fake_zcan):
+    pool = device_pool.DevicePool()
+    first = pool.acquire_lin(0, 0, 0)
+    assert first is not None
+    assert pool.acquire_lin(0, 0, 0) is None
+    pool.release_lin(first)
+    assert pool.acquire_lin(0, 0, 0) is not None
+    pool.close_all()
+
+
+def test_concurrent_teardown_releases_channel_once(fake_zcan):
+    # 超时或停止时看门狗线程与用例线程会同时调用 teardown_test
+    with device_pool.device_pool_session():
+        case = LinCase()
+        assert case.env_init()
+        threads = [threading.Thread(target=case.teardown_test) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        case.teardown_test()
+        calls = fake_zcan.instances[0].calls
+        assert calls["ResetLIN"] == 1
+        assert calls["StartLIN"] == 1 + 1
+        assert case.lin_handle is None
+    assert calls["CloseDevice"] == 1
@@ -0,0 +1,39 @@
+"""按项目保存的 JSON 文件：写回时只修改本项目的数据，文件损坏时重新记录"""
+
+import json
+
+from runner.duration_history import DurationHistory
+from runner.project_store import ProjectJsonFile
+from runner.selections import SelectionStore
+
+
+def test_update_keeps_other_projects(tmp_path):
+    path = str(tmp_path / "store" / "data.json")
+    ProjectJsonFile(path, 1, "测试").update_project("A", lambda data: data.update({"x": 1}))
+    ProjectJsonFile(path, 2, "测试").update_project("B", lambda data: data.update({"y": 2}))
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data == {"version": 2, "projects": {"A": {"x": 1}, "B": {"y": 2}}}
+
+
+def test_corrupt_file_reads_as_empty(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("{broken", encoding="utf-8")
+    assert ProjectJsonFile(str(path), 1, "测试").load_project("A") == {}
+
+
+def test_stores_share_the_file_format(tmp_path):
+    selections_path = str(tmp_path / "selections.json")
+    store = SelectionStore("demo", selections_path)
+    store.save_selection("冒烟", ["用例A"])
+    SelectionStore("other", selections_path).save_selection("全部", ["用例B"])
+    store.delete("不存在")
+    assert SelectionStore("demo", selections_path).get("冒烟") == ["用例A"]
+    assert SelectionStore("other", selections_path).names() == ["全部"]
+
+    history_path = str(tmp_path / "history.json")
+    history = DurationHistory("demo", history_path)
+    history.record("用例A", 1.5)
+    history.save()
+    assert DurationHistory("demo", history_path).durations("用例A") == [1.5]
@@ -0,0 +1,182 @@
+"""断点续测：结果日志的续测截断、断点的保存与恢复、由日志合并生成的报告"""
+
+import json
+import os
+
+from case_script.case_base import CaseBase
+from runner import PlanEntry, engine
+from runner.checkpoint import RunCheckpoint
+from runner.journal import ResultJournal, iter_journal_results, read_journal
+from runner.report import write_report_from_journal
+
+SETTINGS = {"rounds": 3, "stop_on_fail": False, "delay": 0, "parallel": False, "max_workers": 4}
+CASES = ["用例A", "用例B", "用例C"]
+
+
+def _journal(tmp_path):
+    journal = ResultJournal(str(tmp_path / "执行日志_demo_套件_20261017_000000.jsonl"))
+    journal.start("demo", "套件", SETTINGS, CASES, total_tests=9)
+    return journal
+
+
+def _results(journal):
+    return [record["message"] for record in iter_journal_results(journal.path)]
+
+
+def test_resume_drops_results_written_after_checkpoint(tmp_path):
+    journal = _journal(tmp_path)
+    for message in ("r1", "r2", "r3", "r4", "r5"):
+        journal.append_result("用例A", "Pass", message, 1)
+    # 断点记录了 3 条结果，之后写入的 r4、r5 对应的用例会重新执行
+    journal.resume(3, 1)
+    for message in ("a4", "a5"):
+        journal.append_result("用例A", "Pass", message, 1)
+    journal.resume(4, 1)
+    for message in ("b5", "b6"):
+        journal.append_result("用例A", "Pass", message, 1)
+    journal.close()
+
+    assert _results(journal) == ["r1", "r2", "r3", "a4", "b5", "b6"]
+
+
+def test_later_resume_can_cut_into_earlier_segments(tmp_path):
+    journal = _journal(tmp_path)
+    for message in ("r1", "r2", "r3", "r4"):
+        journal.append_result("用例A", "Pass", message, 1)
+    journal.resume(3, 1)
+    journal.append_result("用例A", "Pass", "a4", 1)
+    # 后一次续测的断点条数更小：前一段中已返回位置之后的结果同样无效
+    journal.resume(2, 1)
+    journal.append_result("用例A", "Pass", "b3", 1)
+    journal.close()
+
+    assert _results(journal) == ["r1", "r2", "b3"]
+
+
+def test_incomplete_last_line_is_ignored(tmp_path):
+    journal = _journal(tmp_path)
+    journal.append_result("用例A", "Pass", "r1", 1)
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "result", "case": "用例B", "res')
+
+    header, results, end = read_journal(journal.path)
+    assert header["cases"] == CASES
+    assert [record["message"] for record in results] == ["r1"]
+    assert end["status"] == "completed"
+
+
+def test_checkpoint_restores_round_position(tmp_path):
+    path = str(tmp_path / "checkpoint" / "断点_demo_套件.json")
+    checkpoint = RunCheckpoint(path, "demo", "套件", SETTINGS, CASES, 9, "journal.jsonl", interval=3600)
+    for case_name in CASES:
+        checkpoint.record(case_name, "Pass", "ok", 1)
+    checkpoint.finish_round(1)
+    checkpoint.record("用例A", "Fail", "转速超限", 2)
+    checkpoint.record("用例B", "Pass", "ok", 2)
+    checkpoint.save()
+
+    loaded = RunCheckpoint.load(path)
+    assert loaded.current_round == 2
+    assert loaded.done_in_round == {"用例A", "用例B"}
+    assert loaded.round_failed
+    assert loaded.results_count == 5
+    assert (loaded.tracker.passed, loaded.tracker.failed) == (4, 1)
+    assert loaded.tracker.case_data["用例A"]["test_count"] == 2
+    assert loaded.tracker.case_data["用例A"]["result"] == "Fail"
+    assert loaded.tracker.case_data["用例C"]["test_count"] == 1
+    assert not loaded.finished_all_rounds
+
+
+def test_report_merges_results_before_and_after_resume(tmp_path):
+    journal = _journal(tmp_path)
+    for case_name in CASES:
+        journal.append_result(case_name, "Pass", "ok", 1, duration=1.0)
+    journal.mark_round(1)
+    journal.append_result("用例A", "Pass", "ok", 2, duration=1.0)
+    # 崩溃前写入、断点中没有的结果
+    journal.append_result("用例B", "Pass", "崩溃前", 2, duration=1.0)
+    journal.resume(4, 2)
+    journal.append_result("用例B", "Fail", "续测后", 2, duration=2.0)
+    journal.append_result("用例C", "Pass", "ok", 2, duration=1.0)
+    journal.mark_round(2)
+    journal.close("stopped")
+
+    report_path, report_data = write_report_from_journal(journal.path, str(tmp_path / "reports"))
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+
+    assert report["测试统计"]["总测试数"] == 9
+    assert (report["测试统计"]["成功数"], report["测试统计"]["失败数"]) == (5, 1)
+    assert report["报告信息"]["结果日志"] == os.path.abspath(journal.path)
+    assert [item["轮次"] for item in report["轮次结果"]] == [1, 2]
+    round_2 = report["轮次结果"][1]
+    assert [(r["用例名称"], r["详细信息"]) for r in round_2["用例结果"]] == [
+        ("用例A", "ok"),
+        ("用例B", "续测后"),
+        ("用例C", "ok"),
+    ]
+    assert (round_2["成功数"], round_2["失败数"], round_2["耗时(秒)"]) == (2, 1, 4.0)
+    rows = {row["用例名称"]: row for row in report["测试用例详情"]}
+    assert rows["用例B"]["执行次数"] == "2"
+    assert rows["用例B"]["最长耗时(秒)"] == 2.0
+    assert report_data["测试统计"] == report["测试统计"]
+    assert not [name for name in os.listdir(tmp_path / "reports") if name.endswith(".tmp")]
+
+
+class StoppingCase(CaseBase):
+    """第 2 轮执行到用例B时请求停止"""
+
+    runner = None
+    calls = 0
+
+    def run(self):
+        StoppingCase.calls += 1
+        if StoppingCase.calls == 2 and StoppingCase.runner is not None:
+            StoppingCase.runner.stop()
+        return True, "ok"
+
+
+class PassCase(CaseBase):
+    def run(self):
+        return True, "ok"
+
+
+def _plan():
+    return [
+        PlanEntry("用例A", ["demo", "module", "PassCase"], PassCase, {}, ()),
+        PlanEntry("用例B", ["demo", "module", "StoppingCase"], StoppingCase, {}, ()),
+        PlanEntry("用例C", ["demo", "module", "PassCase"], PassCase, {}, ()),
+    ]
+
+
+def test_stopped_run_resumes_to_a_complete_report(tmp_path):
+    StoppingCase.calls = 0
+    journal = _journal(tmp_path)
+    path = str(tmp_path / "checkpoint" / "断点_demo_套件.json")
+    checkpoint = RunCheckpoint(path, "demo", "套件", SETTINGS, CASES, 9, journal.path, interval=0)
+    runner = engine.TestRunner(_plan(), SETTINGS, journal=journal, checkpoint=checkpoint)
+    StoppingCase.runner = runner
+    runner.run()
+
+    # 停止时中断的用例B不记录，断点停在第 2 轮的用例A之后
+    stopped = RunCheckpoint.load(path)
+    assert (stopped.current_round, stopped.done_in_round, stopped.results_count) == (2, {"用例A"}, 4)
+    # 模拟断点之后、崩溃之前写入日志的结果
+    stray = {"type": "result", "case": "用例C", "result": "Pass", "message": "多余", "round": 2}
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(stray, ensure_ascii=False) + "\n")
+
+    StoppingCase.runner = None
+    resumed_journal = ResultJournal(stopped.journal_path)
+    resumed_journal.resume(stopped.results_count, stopped.current_round)
+    engine.TestRunner(_plan(), stopped.test_settings, journal=resumed_journal, checkpoint=stopped).run()
+
+    assert not os.path.exists(path)
+    results = list(iter_journal_results(journal.path))
+    assert [(r["round"], r["case"]) for r in results] == [
+        (round_num, case_name) for round_num in (1, 2, 3) for case_name in CASES
+    ]
+    assert "多余" not in [r["message"] for r in results]
+    report_path, report_data = write_report_from_journal(journal.path, str(tmp_path / "reports"))
+    assert report_data["测试统计"]["成功数"] == 9
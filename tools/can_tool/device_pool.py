@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+ZLG 设备会话池
+
+在一次测试运行内复用 CAN/LIN 设备与通道，避免每个用例都重复加载 DLL、打开设备、初始化通道：
+- 每个设备（设备类型 + 设备索引）只打开一次
+- 每个 LIN 通道只初始化、启动一次，用例结束时仅复位通道状态
+- 运行结束时统一复位通道并关闭设备
+
+使用示例：
+    from tools.can_tool.device_pool import device_pool_session, DevicePool
+
+    # 执行器在整个运行期间激活设备池
+    with device_pool_session():
+        ...  # 执行用例
+
+    # 用例中（CaseBase.env_init 已封装）
+    pool = DevicePool.get_active()
+    session = pool.acquire_lin(ZCAN_USBCANFD_200U, 0, 0)
+    ...
+    pool.release_lin(session)
+"""
+
+import threading
+from contextlib import contextmanager
+
+from tools.log_tool import get_logger
+from .zlgcan import (
+    ZCAN,
+    ZCAN_LIN_INIT_CONFIG,
+    ENHANCE_CHKSUM,
+    INVALID_DEVICE_HANDLE,
+    ZCAN_STATUS_OK,
+)
+
+
+def _device_key(device_type, device_index):
+    """设备类型可能是 c_uint 包装，统一转换为可哈希的整数键"""
+    return (getattr(device_type, "value", device_type), int(device_index))
+
+
+class LinChannelSession:
+    """设备池分配给用例的 LIN 通道句柄"""
+
+    __slots__ = ("zcan", "device_handle", "lin_handle", "key")
+
+    def __init__(self, zcan, device_handle, lin_handle, key):
+        self.zcan = zcan
+        self.device_handle = device_handle
+        self.lin_handle = lin_handle
+        self.key = key  # (设备类型, 设备索引, 通道)
+
+
+class DevicePool:
+    """
+    运行级设备会话池（线程安全）
+
+    同一时刻只有一个激活的设备池，由执行器在运行开始时激活、结束时关闭。
+    """
+
+    _active = None
+    _active_lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = get_logger("DevicePool")
+        self._lock = threading.RLock()
+        self._zcan = None
+        self._devices = {}  # (设备类型, 设备索引) -> 设备句柄
+        self._lin_channels = {}  # (设备类型, 设备索引, 通道) -> LIN 通道句柄
+        self._lin_configs = {}  # (设备类型, 设备索引, 通道) -> ZCAN_LIN_INIT_CONFIG
+        self._in_use = set()
+
+    # ========== 激活管理 ==========
+
+    @classmethod
+    def activate(cls):
+        """创建并激活一个新的设备池"""
+        with cls._active_lock:
+            cls._active = cls()
+            return cls._active
+
+    @classmethod
+    def get_active(cls):
+        """获取当前激活的设备池，未激活时返回 None"""
+        return cls._active
+
+    @classmethod
+    def deactivate(cls):
+        """关闭并取消激活当前设备池"""
+        with cls._active_lock:
+            pool, cls._active = cls._active, None
+        if pool is not None:
+            pool.close_all()
+
+    # ========== 通道分配 ==========
+
+    def acquire_lin(
+        self,
+        device_type,
+        device_index=0,
+        channel=0,
+        lin_mode=1,
+        lin_baud=19200,
+        chk_sum_mode=ENHANCE_CHKSUM,
+        max_length=8,
+    ):
+        """
+        获取已初始化并启动的 LIN 通道，首次使用时打开设备并初始化通道
+
+        Args:
+            device_type: 设备类型，如 ZCAN_USBCANFD_200U
+            device_index: 设备索引
+            channel: LIN 通道号
+            lin_mode: 1=Master, 0=Slave
+            lin_baud: LIN 波特率
+            chk_sum_mode: 校验方式
+            max_length: 最大数据长度
+
+        Returns:
+            LinChannelSession: 通道句柄，失败或通道已被其他用例占用时返回 None
+        """
+        with self._lock:
+            key = _device_key(device_type, device_index) + (int(channel),)
+            if key in self._in_use:
+                # 两个用例同时驱动同一物理通道会互相干扰报文，拒绝分配
+                self.logger.error(f"LIN 通道 {key} 已被其他用例占用，请检查用例的 LIN 配置")
+                return None
+
+            device_handle = self._open_device(device_type, device_index)
+            if device_handle == INVALID_DEVICE_HANDLE:
+                return None
+
+            lin_handle = self._lin_channels.get(key)
+            if lin_handle is None:
+                lin_config = ZCAN_LIN_INIT_CONFIG()
+                lin_config.linMode = lin_mode
+                lin_config.linBaud = lin_baud
+                lin_config.chkSumMode = chk_sum_mode
+                lin_config.maxLength = max_length
+
+                lin_handle = self._start_lin(device_handle, channel, lin_config)
+                if lin_handle is None:
+                    return None
+                self._lin_channels[key] = lin_handle
+                self._lin_configs[key] = lin_config
+                self.logger.info(f"LIN 通道 {key} 初始化完成并加入设备池")
+
+            self._in_use.add(key)
+            return LinChannelSession(self._zcan, device_handle, lin_handle, key)
+
+    def release_lin(self, session):
+        """
+        归还 LIN 通道，复位通道状态（清除发布表与缓冲数据）后重新启动，供下一个用例使用
+        """
+        if session is None:
+            return
+        with self._lock:
+            self._in_use.discard(session.key)
+            lin_handle = self._lin_channels.get(session.key)
+            if lin_handle is None:
+                return
+            try:
+                self._zcan.ResetLIN(lin_handle)
+                if self._zcan.StartLIN(lin_handle) == ZCAN_STATUS_OK:
+                    return
+                # 复位后无法直接启动，重新初始化通道
+                self.logger.warning(f"LIN 通道 {session.key} 重启失败，重新初始化")
+                device_handle = self._devices.get(session.key[:2], INVALID_DEVICE_HANDLE)
+                new_handle = self._start_lin(
+                    device_handle, session.key[2], self._lin_configs[session.key]
+                )
+                if new_handle is None:
+                    del self._lin_channels[session.key]
+                else:
+                    self._lin_channels[session.key] = new_handle
+            except Exception as e:
+                self.logger.warning(f"复位 LIN 通道 {session.key} 时出错: {str(e)}")
+                self._lin_channels.pop(session.key, None)
+
+    def close_all(self):
+        """复位所有通道并关闭所有设备"""
+        with self._lock:
+            for key, lin_handle in self._lin_channels.items():
+                try:
+                    self._zcan.ResetLIN(lin_handle)
+                except Exception as e:
+                    self.logger.warning(f"关闭 LIN 通道 {key} 时出错: {str(e)}")
+            self._lin_channels.clear()
+            self._lin_configs.clear()
+            self._in_use.clear()
+
+            for key, device_handle in self._devices.items():
+                try:
+                    self._zcan.CloseDevice(device_handle)
+                    self.logger.info(f"设备 {key} 已关闭")
+                except Exception as e:
+                    self.logger.warning(f"关闭设备 {key} 时出错: {str(e)}")
+            self._devices.clear()
+
+    # ========== 内部方法 ==========
+
+    def _open_device(self, device_type, device_index):
+        """打开设备（已打开则直接返回句柄）"""
+        key = _device_key(device_type, device_index)
+        device_handle = self._devices.get(key)
+        if device_handle is not None:
+            return device_handle
+
+        if self._zcan is None:
+            # 整个运行只加载一次 DLL
+            self._zcan = ZCAN()
+
+        device_handle = self._zcan.OpenDevice(device_type, device_index, 0)
+        if device_handle == INVALID_DEVICE_HANDLE:
+            self.logger.error(f"打开设备 {key} 失败")
+            return INVALID_DEVICE_HANDLE
+
+        self._devices[key] = device_handle
+        self.logger.info(f"设备 {key} 打开成功，句柄: {device_handle}")
+        return device_handle
+
+    def _start_lin(self, device_handle, channel, lin_config):
+        """初始化并启动 LIN 通道，失败返回 None"""
+        lin_handle = self._zcan.InitLIN(device_handle, channel, lin_config)
+        if lin_handle == 0:
+            self.logger.error(f"初始化 LIN 通道 {channel} 失败")
+            return None
+        if self._zcan.StartLIN(lin_handle) != ZCAN_STATUS_OK:
+            self.logger.error(f"启动 LIN 通道 {channel} 失败")
+            self._zcan.ResetLIN(lin_handle)
+            return None
+        return lin_handle
+
+
+@contextmanager
+def device_pool_session():
+    """在 with 块内激活设备池，退出时关闭全部设备"""
+    pool = DevicePool.activate()
+    try:
+        yield pool
+    finally:
+        DevicePool.deactivate()
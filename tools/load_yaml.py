@@ -1,13 +1,60 @@
+"""
+YAML 配置加载
+
+解析结果按文件路径缓存，文件的修改时间或大小变化时重新解析，
+项目树切换、重复加载测试套件时不再重复解析同一个文件。
+安装了 libyaml 时使用 C 实现的 CSafeLoader，否则回退到纯 Python 的 SafeLoader。
+
+缓存中的对象不直接返回，每次返回深拷贝，调用方修改返回值不会影响缓存。
+"""
+
+import copy
+import os
+import threading
+
 import yaml
 
+# libyaml 可用时使用 C 加载器，解析速度快一个数量级
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_cache = {}  # 绝对路径 -> (mtime_ns, size, 配置内容)
+_cache_lock = threading.Lock()
+
 
-def load_yaml_config(file_path):
+def load_yaml_config(file_path, use_cache=True):
     """
     加载 YAML 配置文件并返回配置内容。
 
     :param file_path: 配置文件路径
-    :return: 配置内容（dict）
+    :param use_cache: 是否使用解析缓存（文件修改后自动失效）
+    :return: 配置内容（dict），调用方可自由修改
+    :raises FileNotFoundError: 文件不存在
+    :raises yaml.YAMLError: YAML 语法错误
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    if use_cache:
+        with _cache_lock:
+            cached = _cache.get(path)
+        if cached is not None and cached[:2] == key:
+            return copy.deepcopy(cached[2])
+
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=SafeLoader)
+
+    if use_cache:
+        with _cache_lock:
+            _cache[path] = (key[0], key[1], config)
+        return copy.deepcopy(config)
     return config
+
+
+def clear_yaml_cache(file_path=None):
+    """清除解析缓存，file_path 为 None 时清除全部"""
+    with _cache_lock:
+        if file_path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(file_path), None)
@@ -7,10 +7,15 @@
 3. 日志轮转和压缩
 4. 彩色控制台输出
 5. 不同模块的独立日志记录器
+6. 队列异步写入（enqueue），调用线程只负责入队，格式化与文件 I/O 在后台线程完成
+7. 按执行生成的独立日志目录（RunLog），每个用例一个日志文件
 """
 
 import sys
 import os
+import datetime
+import re
+import threading
 from pathlib import Path
 from typing import Optional
 from loguru import logger
@@ -50,12 +55,64 @@ class LogConfig:
     # 编码
     ENCODING = "utf-8"
 
+    # 日志先放入队列，由 loguru 后台线程格式化并写入，测试线程不被文件 I/O 阻塞
+    ENQUEUE = True
+    # 异常日志中显示变量值（开销大，且可能把敏感数据写入日志），排查问题时再打开
+    DIAGNOSE = False
+
+    # 单次执行日志目录（位于日志目录下）
+    RUN_LOG_SUBDIR = "runs"
+
 
 class Logger:
     """日志管理器"""
     
     _initialized = False
     _logger_cache = {}
+    _log_dir = LogConfig.LOG_DIR
+    _enqueue = LogConfig.ENQUEUE
+    _diagnose = LogConfig.DIAGNOSE
+    _sink_levels = {}  # sink id -> 最低级别编号，用于判断某级别的日志是否会被输出
+    _min_level_no = None  # 全部 sink 中的最低级别编号，没有 sink 时为 None
+    _level_nos = {}  # 级别名称 -> 编号缓存
+
+    @classmethod
+    def add_sink(cls, sink, level, **kwargs):
+        """添加 sink 并登记其级别（模块内统一通过此方法添加）"""
+        sink_id = logger.add(sink, level=level, **kwargs)
+        cls._sink_levels[sink_id] = cls.level_no(level)
+        cls._update_min_level()
+        return sink_id
+
+    @classmethod
+    def remove_sink(cls, sink_id):
+        """移除 sink（enqueue 模式下会先写完队列中的日志）"""
+        cls._sink_levels.pop(sink_id, None)
+        cls._update_min_level()
+        logger.remove(sink_id)
+
+    @classmethod
+    def _update_min_level(cls):
+        levels = cls._sink_levels.values()
+        cls._min_level_no = min(levels) if levels else None
+
+    @classmethod
+    def level_no(cls, level) -> int:
+        """级别名称（或编号）对应的编号"""
+        if isinstance(level, int):
+            return level
+        no = cls._level_nos.get(level)
+        if no is None:
+            no = cls._level_nos[level] = logger.level(level.upper()).no
+        return no
+
+    @classmethod
+    def is_level_enabled(cls, level) -> bool:
+        """是否有 sink 会输出该级别的日志，没有时调用方可跳过消息格式化"""
+        if not cls._initialized:
+            cls.setup_logger()
+        min_level_no = cls._min_level_no
+        return min_level_no is not None and cls.level_no(level) >= min_level_no
     
     @classmethod
     def setup_logger(
@@ -66,6 +123,8 @@ class Logger:
         rotation: str = LogConfig.ROTATION,
         retention: str = LogConfig.RETENTION,
         compression: str = LogConfig.COMPRESSION,
+        enqueue: bool = LogConfig.ENQUEUE,
+        diagnose: bool = LogConfig.DIAGNOSE,
     ):
         """
         设置全局日志配置
@@ -77,6 +136,8 @@ class Logger:
             rotation: 日志轮转策略
             retention: 日志保留时间
             compression: 日志压缩格式
+            enqueue: 是否经队列异步写入
+            diagnose: 异常日志中是否显示变量值
         """
         if cls._initialized:
             logger.warning("Logger already initialized, skipping setup")
@@ -84,15 +145,18 @@ class Logger:
         
         # 移除默认的 handler
         logger.remove()
+        cls._sink_levels.clear()
+        cls._min_level_no = None
         
         # 添加控制台输出
-        logger.add(
+        cls.add_sink(
             sys.stderr,
             format=LogConfig.CONSOLE_FORMAT,
             level=console_level,
             colorize=True,
             backtrace=True,
-            diagnose=True,
+            diagnose=diagnose,
+            enqueue=enqueue,
         )
         
         # 设置日志目录
@@ -105,7 +169,7 @@ class Logger:
         log_dir.mkdir(parents=True, exist_ok=True)
         
         # 添加通用日志文件
-        logger.add(
+        cls.add_sink(
             log_dir / "app_{time:YYYY-MM-DD}.log",
             format=LogConfig.FILE_FORMAT,
             level=file_level,
@@ -114,11 +178,12 @@ class Logger:
             compression=compression,
             encoding=LogConfig.ENCODING,
             backtrace=True,
-            diagnose=True,
+            diagnose=diagnose,
+            enqueue=enqueue,
         )
         
         # 添加错误日志文件（单独记录 ERROR 及以上级别）
-        logger.add(
+        cls.add_sink(
             log_dir / "error_{time:YYYY-MM-DD}.log",
             format=LogConfig.FILE_FORMAT,
             level="ERROR",
@@ -127,9 +192,13 @@ class Logger:
             compression=compression,
             encoding=LogConfig.ENCODING,
             backtrace=True,
-            diagnose=True,
+            diagnose=diagnose,
+            enqueue=enqueue,
         )
         
+        cls._log_dir = log_dir
+        cls._enqueue = enqueue
+        cls._diagnose = diagnose
         cls._initialized = True
         logger.info("Logger initialized successfully")
     
@@ -163,6 +232,160 @@ class Logger:
         return custom_logger
 
 
+# RunLog.attempt_context 写入日志 extra 的键
+ATTEMPT_KEY = "run_attempt"
+
+
+class RunLog:
+    """
+    单次执行的日志目录
+
+    执行期间的全部日志写入 run.log，绑定名称（get_logger 的 name）属于本次执行用例的日志
+    另外写入 cases/<名称>.log，查看单个用例的日志无需在按天轮转的大文件中搜索。
+    两个 sink 与全局 sink 一样经队列异步写入。
+
+    在 attempt_context(key) 中记录的用例日志会登记其在用例日志文件中的位置，
+    之后可通过 read_attempt(key) 取出该次执行（如某一轮）的日志片段。
+
+    Example:
+        run_log = RunLog.create("demo_project_基础功能测试", ["SimpleTestCase"])
+        ...
+        run_log.close()   # 等待队列中的日志写完后关闭文件
+    """
+
+    def __init__(self, run_dir, case_names=(), level: str = LogConfig.FILE_LEVEL):
+        self.run_dir = Path(run_dir)
+        self.case_names = frozenset(case_names)
+        self.level = level
+        self._case_files = {}  # 名称 -> 文件对象，只在 loguru 写入线程中访问
+        self._sink_ids = []
+        self._lock = threading.Lock()
+        # 执行标识 -> (用例日志文件, 起始位置, 结束位置)
+        self._attempt_spans = {}
+        self._spans_lock = threading.Lock()
+
+    @classmethod
+    def create(cls, run_name: str, case_names=(), log_dir: Optional[str] = None):
+        """在日志目录下创建 runs/<执行名>_<时间> 目录并开始记录"""
+        Logger.get_logger()  # 确保全局日志已初始化
+        base_dir = Path(log_dir) if log_dir else Path(Logger._log_dir) / LogConfig.RUN_LOG_SUBDIR
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_dir = base_dir / f"{_safe_file_name(run_name)}_{timestamp}"
+        index = 1
+        while run_dir.exists():
+            run_dir = base_dir / f"{_safe_file_name(run_name)}_{timestamp}_{index}"
+            index += 1
+        run_log = cls(run_dir, case_names)
+        run_log.start()
+        return run_log
+
+    @property
+    def run_file(self) -> Path:
+        return self.run_dir / "run.log"
+
+    def case_file(self, name: str) -> Path:
+        """用例日志文件路径"""
+        return self.run_dir / "cases" / f"{_safe_file_name(name)}.log"
+
+    def start(self) -> None:
+        """添加本次执行的 sink"""
+        (self.run_dir / "cases").mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._sink_ids.append(
+                Logger.add_sink(
+                    self.run_file,
+                    format=LogConfig.FILE_FORMAT,
+                    level=self.level,
+                    encoding=LogConfig.ENCODING,
+                    backtrace=True,
+                    diagnose=Logger._diagnose,
+                    enqueue=Logger._enqueue,
+                )
+            )
+            if self.case_names:
+                self._sink_ids.append(
+                    Logger.add_sink(
+                        self._write_case,
+                        format=LogConfig.FILE_FORMAT,
+                        level=self.level,
+                        filter=lambda record: record["extra"].get("name") in self.case_names,
+                        backtrace=True,
+                        diagnose=Logger._diagnose,
+                        enqueue=Logger._enqueue,
+                    )
+                )
+
+    def _write_case(self, message) -> None:
+        """按绑定名称分发到用例日志文件"""
+        name = message.record["extra"]["name"]
+        file = self._case_files.get(name)
+        if file is None:
+            file = open(self.case_file(name), "a", encoding=LogConfig.ENCODING)
+            self._case_files[name] = file
+        start = file.tell()
+        file.write(message)
+        file.flush()
+        attempt = message.record["extra"].get(ATTEMPT_KEY)
+        if attempt is not None:
+            end = file.tell()
+            with self._spans_lock:
+                span = self._attempt_spans.get(attempt)
+                if span is None or span[0] != name:
+                    self._attempt_spans[attempt] = (name, start, end)
+                else:
+                    self._attempt_spans[attempt] = (name, span[1], end)
+
+    @staticmethod
+    def attempt_context(key):
+        """
+        在 with 块内（当前线程）记录的日志标记为执行 key
+
+        Example:
+            with run_log.attempt_context(("用例A", 2)):
+                case.run()
+            text = run_log.read_attempt(("用例A", 2))
+        """
+        return logger.contextualize(**{ATTEMPT_KEY: key})
+
+    def read_attempt(self, key) -> str:
+        """
+        取出执行 key 记录的用例日志（等待队列中的日志写完），读取后不再保留其位置
+
+        Returns:
+            str: 日志文本，没有日志时为空字符串
+        """
+        logger.complete()
+        with self._spans_lock:
+            span = self._attempt_spans.pop(key, None)
+        if span is None:
+            return ""
+        name, start, end = span
+        try:
+            with open(self.case_file(name), "rb") as f:
+                f.seek(start)
+                return f.read(end - start).decode(LogConfig.ENCODING, errors="replace")
+        except OSError:
+            return ""
+
+    def close(self) -> None:
+        """移除 sink（队列中尚未写入的日志会先写完）并关闭用例日志文件，重复调用无效果"""
+        with self._lock:
+            sink_ids, self._sink_ids = self._sink_ids, []
+        for sink_id in sink_ids:
+            try:
+                Logger.remove_sink(sink_id)
+            except ValueError:
+                pass
+        for file in self._case_files.values():
+            file.close()
+        self._case_files.clear()
+
+
+def _safe_file_name(name: str) -> str:
+    """替换文件名中不允许的字符"""
+    return re.sub(r'[\\/:*?"<>|]', "_", str(name)).strip() or "unnamed"
+
+
 # 便捷函数
 def setup_logger(
     log_dir: Optional[str] = None,
@@ -171,6 +394,8 @@ def setup_logger(
     rotation: str = LogConfig.ROTATION,
     retention: str = LogConfig.RETENTION,
     compression: str = LogConfig.COMPRESSION,
+    enqueue: bool = LogConfig.ENQUEUE,
+    diagnose: bool = LogConfig.DIAGNOSE,
 ):
     """
     设置全局日志配置
@@ -182,6 +407,8 @@ def setup_logger(
         rotation: 日志轮转策略
         retention: 日志保留时间
         compression: 日志压缩格式
+        enqueue: 是否经队列异步写入（测试线程只负责入队）
+        diagnose: 异常日志中是否显示变量值
     
     Example:
         >>> from tools.log_tool import setup_logger
@@ -194,9 +421,22 @@ def setup_logger(
         rotation=rotation,
         retention=retention,
         compression=compression,
+        enqueue=enqueue,
+        diagnose=diagnose,
     )
 
 
+def is_level_enabled(level) -> bool:
+    """
+    指定级别的日志是否会被任一 sink 输出
+
+    Example:
+        >>> if is_level_enabled("DEBUG"):
+        ...     logger.debug(build_expensive_dump())
+    """
+    return Logger.is_level_enabled(level)
+
+
 def get_logger(name: Optional[str] = None):
     """
     获取日志记录器
@@ -3,7 +3,7 @@ import os
 import time
 from datetime import datetime, timedelta
 
-import yaml
+from tools.load_yaml import load_yaml_config
 
 
 def find_parent_directory_with_child(start_path, target_child):
@@ -114,9 +114,7 @@ def get_config(path):
         yaml.YAMLError: 如果YAML文件存在语法错误。
 
     """
-    with open(path, encoding='utf-8') as f:
-        cfgs = yaml.safe_load(f)
-    return cfgs
+    return load_yaml_config(path)
 
 
 def download_image(response, save_path, chunk_size=1024):